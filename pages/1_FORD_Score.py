@@ -1,4 +0,0 @@
-from scores.ford import config, prediction
-from shared.ui import render_score_page
-
-render_score_page(config, prediction)
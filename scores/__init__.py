@@ -0,0 +1,20 @@
+"""
+Clinical score engines. Each subpackage holds a ``config.py`` describing the
+score and a ``prediction.py`` engine.
+"""
+
+import functools
+import os
+
+SCORES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=None)
+def available_scores():
+    """Return the names of all score packages that have a prediction engine."""
+    names = (
+        entry
+        for entry in os.listdir(SCORES_DIR)
+        if os.path.exists(os.path.join(SCORES_DIR, entry, "prediction.py"))
+    )
+    return tuple(sorted(names))
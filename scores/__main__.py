@@ -0,0 +1,5 @@
+import sys
+
+from scores.cli import main
+
+sys.exit(main())
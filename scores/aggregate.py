@@ -0,0 +1,245 @@
+"""
+Streaming, mergeable cohort summaries.
+
+A CohortSummary folds chunks of component bitmasks (or raw input chunks)
+into constant-size running statistics: a score histogram, per-component met
+counts and an online mean/variance of the raw score. Risk-level counts and
+the mean outcome percentage follow exactly from the score histogram, since
+both depend on the score alone. Summaries from parallel workers combine
+with ``merge``, so a 100M-row run is summarized in kilobytes.
+
+Usage::
+
+    python -m scores.aggregate rams cohort.parquet --workers 4 -o summary.json
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scores import available_scores
+from scores.ingest import DEFAULT_CHUNKSIZE, read_inputs
+
+
+class CohortSummary:
+    """
+    Running summary of one score over any number of chunks.
+
+    Args:
+        name: score package name (``ford``, ``rams``, ``prime_icu``).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        engine = importlib.import_module(f"scores.{name}.prediction")
+        model = engine.MODEL
+        self.score_counts = [0] * (model.max_score + 1)
+        self.component_counts = [0] * len(model.components)
+        # Raw score: count, mean and sum of squared deviations (Welford/Chan)
+        self.raw_mean = 0.0
+        self.raw_m2 = 0.0
+        self.raw_min = math.inf
+        self.raw_max = -math.inf
+        # Outcome percentage by score, filled in as scores are first seen
+        config = importlib.import_module(f"scores.{name}.config")
+        self.outcome_key = config.SCORE_META["outcome_key"]
+        self.outcomes = {}
+
+    @property
+    def _engine(self):
+        return importlib.import_module(f"scores.{self.name}.prediction")
+
+    def update(self, mask):
+        """Fold in an array of component bitmasks (``MODEL.mask_batch`` output)."""
+        mask = np.asarray(mask, dtype=np.int64)
+        n = len(mask)
+        if not n:
+            return self
+        engine = self._engine
+        model = engine.MODEL
+        raw, score = model.resolve_batch(mask)
+
+        counts = np.bincount(score, minlength=len(self.score_counts))
+        for s in np.flatnonzero(counts).tolist():
+            self.score_counts[s] += int(counts[s])
+            if s not in self.outcomes:
+                first = int(mask[np.argmax(score == s)])
+                result = engine.result_from_mask(first, explain=False)
+                self.outcomes[s] = result[self.outcome_key]
+
+        for bit in range(len(self.component_counts)):
+            self.component_counts[bit] += int(np.count_nonzero((mask >> bit) & 1))
+
+        raw = raw.astype(float)
+        self._merge_moments(n, float(raw.mean()), float(((raw - raw.mean()) ** 2).sum()))
+        self.raw_min = min(self.raw_min, float(raw.min()))
+        self.raw_max = max(self.raw_max, float(raw.max()))
+        return self
+
+    def update_inputs(self, df):
+        """Score an input chunk (DataFrame or core.Columns) and fold it in."""
+        model = self._engine.MODEL
+        return self.update(model.mask_batch(model.parse_batch(df)))
+
+    def _merge_moments(self, n, mean, m2):
+        total = self.rows + n
+        delta = mean - self.raw_mean
+        self.raw_mean += delta * n / total
+        self.raw_m2 += m2 + delta * delta * self.rows * n / total
+        self.rows = total
+
+    def merge(self, other):
+        """Fold another summary of the same score into this one."""
+        if other.name != self.name:
+            raise ValueError(f"Cannot merge a {other.name!r} summary into {self.name!r}")
+        if not other.rows:
+            return self
+        self.score_counts = [a + b for a, b in zip(self.score_counts, other.score_counts)]
+        self.component_counts = [
+            a + b for a, b in zip(self.component_counts, other.component_counts)
+        ]
+        self._merge_moments(other.rows, other.raw_mean, other.raw_m2)
+        self.raw_min = min(self.raw_min, other.raw_min)
+        self.raw_max = max(self.raw_max, other.raw_max)
+        for s, outcome in other.outcomes.items():
+            self.outcomes.setdefault(s, outcome)
+        return self
+
+    def to_dict(self):
+        """Return the compact summary as a JSON-serializable dict."""
+        model = self._engine.MODEL
+        rows = self.rows
+        levels = {}
+        for s, count in enumerate(self.score_counts):
+            if s >= model.min_score:
+                label = model.levels_by_score[s - model.min_score]["label"]
+                levels[label] = levels.get(label, 0) + count
+
+        score_mean = sum(s * c for s, c in enumerate(self.score_counts)) / rows if rows else None
+        outcome_mean = outcome_std = None
+        if rows:
+            outcome_mean = sum(
+                self.outcomes[s] * c for s, c in enumerate(self.score_counts) if c
+            ) / rows
+            outcome_var = sum(
+                (self.outcomes[s] - outcome_mean) ** 2 * c
+                for s, c in enumerate(self.score_counts) if c
+            ) / rows
+            outcome_std = math.sqrt(outcome_var)
+
+        return {
+            "score": self.name,
+            "rows": rows,
+            "score_histogram": {
+                s: c for s, c in enumerate(self.score_counts) if s >= model.min_score
+            },
+            "score_mean": score_mean,
+            "risk_levels": levels,
+            "raw": {
+                "mean": self.raw_mean if rows else None,
+                "std": math.sqrt(self.raw_m2 / rows) if rows else None,
+                "min": self.raw_min if rows else None,
+                "max": self.raw_max if rows else None,
+            },
+            "outcome": {
+                "key": self.outcome_key,
+                "mean": outcome_mean,
+                "std": outcome_std,
+            },
+            "components": {
+                comp["label"]: {"count": count, "prevalence": count / rows if rows else None}
+                for comp, count in zip(model.components, self.component_counts)
+            },
+        }
+
+
+def summarize_chunks(name, chunks):
+    """Summarize an iterable of input chunks in this process."""
+    summary = CohortSummary(name)
+    for chunk in chunks:
+        summary.update_inputs(chunk)
+    return summary
+
+
+def _summarize_chunk(name, chunk):
+    return CohortSummary(name).update_inputs(chunk)
+
+
+def summarize_file(name, source, chunksize=DEFAULT_CHUNKSIZE, overrides=None, workers=1,
+                   fmt=None):
+    """
+    Summarize a CSV, Parquet or Arrow input file chunk by chunk.
+
+    With ``workers`` > 1 chunks are summarized in a process pool and the
+    partial summaries merged; at most twice ``workers`` chunks are in flight.
+    """
+    config = importlib.import_module(f"scores.{name}.config")
+    pairs = read_inputs(source, config.VARIABLES, overrides, keep=[], chunksize=chunksize,
+                        fmt=fmt)
+    chunks = (inputs for _, inputs in pairs)
+    if workers <= 1:
+        return summarize_chunks(name, chunks)
+
+    summary = CohortSummary(name)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(_summarize_chunk, name, chunk))
+            if len(pending) >= 2 * workers:
+                summary.merge(pending.pop(0).result())
+        for future in pending:
+            summary.merge(future.result())
+    return summary
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m scores.aggregate",
+        description="Summarize a score over a cohort file in one streaming pass.",
+    )
+    parser.add_argument("score", choices=available_scores(), help="score to compute")
+    parser.add_argument("input", help="input .csv/.parquet/.arrow path, or - for CSV on stdin")
+    parser.add_argument("-o", "--output", help="write the summary JSON here (default: stdout)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f"rows per chunk (default: {DEFAULT_CHUNKSIZE})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes summarizing chunks (default: 1)")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"],
+                        help="input format (default: from the extension)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        summary = summarize_file(args.score, args.input, args.chunksize,
+                                 workers=args.workers, fmt=args.format)
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    text = json.dumps(summary.to_dict(), indent=2)
+    try:
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text, flush=True)
+    except BrokenPipeError:
+        # The reader (e.g. ``head``) closed stdout early; exit quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+Reproducible performance benchmarks for the score engines.
+
+Measures, for each score:
+
+- latency: per-call compute_prediction percentiles (with and without the
+  component breakdown)
+- throughput: compute_batch rows per second over 10^3 to 10^7 rows
+- allocations: tracemalloc peak and retained bytes per compute_prediction call
+- file: end-to-end score_file rows per second for CSV and Parquet input
+
+Inputs are synthetic rows from scores.cohort, drawn from each config's
+VARIABLES with a fixed seed, so runs are comparable. Results are written as JSON; a previous
+results file can be given as a baseline, and any metric worse than it by
+more than the tolerance fails the run.
+
+Usage::
+
+    python -m scores.bench -o bench.json
+    python -m scores.bench --sizes 1e3 1e7 --baseline bench.json --tolerance 0.15
+    python -m scores.bench --quick rams
+"""
+
+import argparse
+import datetime
+import gc
+import importlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from scores import available_scores
+from scores.cohort import generate
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_TOLERANCE = 0.10
+# Larger batches are generated and scored in slices of this many rows
+BATCH_SLICE = 1_000_000
+SEED = 20240101
+
+
+def synthetic_frames(name, n, seed=SEED, chunksize=BATCH_SLICE):
+    """
+    Yield ``n`` synthetic rows for score ``name`` in DataFrames of at most
+    ``chunksize`` rows, from ``scores.cohort.generate``.
+
+    Continuous variables are drawn uniformly over their declared range
+    (snapped to ``step``), categoricals uniformly over their options.
+    """
+    config = importlib.import_module(f"scores.{name}.config")
+    marginals = {
+        var["name"]: {"dist": "uniform"}
+        for var in config.VARIABLES if var["type"] == "continuous"
+    }
+    return generate(name, n, seed, chunksize, marginals)
+
+
+def synthetic_frame(name, n, seed=SEED):
+    """``n`` synthetic rows for score ``name`` as one DataFrame."""
+    return next(synthetic_frames(name, n, seed, chunksize=max(n, 1)))
+
+
+def _rows(name, n, seed=SEED):
+    frame = synthetic_frame(name, n, seed)
+    return [
+        {k: v.item() if hasattr(v, "item") else v for k, v in row.items()}
+        for row in frame.to_dict("records")
+    ]
+
+
+def _percentiles(samples_ns):
+    samples = np.asarray(samples_ns, dtype=float) / 1000
+    p50, p90, p99, p999 = np.percentile(samples, [50, 90, 99, 99.9])
+    return {
+        "mean_us": float(samples.mean()),
+        "p50_us": float(p50),
+        "p90_us": float(p90),
+        "p99_us": float(p99),
+        "p999_us": float(p999),
+    }
+
+
+def bench_latency(name, calls=20_000, rounds=3):
+    """
+    Time compute_prediction call by call, with and without the breakdown.
+
+    The calls are timed ``rounds`` times and each percentile keeps its best
+    round, which steadies the tail against unrelated system noise.
+    """
+    engine = importlib.import_module(f"scores.{name}.prediction")
+    rows = _rows(name, calls)
+    clock = time.perf_counter_ns
+    metrics = {}
+    for explain in (True, False):
+        compute = engine.compute_prediction
+        for inputs in rows[:1000]:  # warm up
+            compute(inputs, explain)
+        best = {}
+        for _ in range(rounds):
+            samples = []
+            gc.disable()
+            try:
+                for inputs in rows:
+                    start = clock()
+                    compute(inputs, explain)
+                    samples.append(clock() - start)
+            finally:
+                gc.enable()
+            for key, value in _percentiles(samples).items():
+                best[key] = min(value, best.get(key, value))
+        label = "explain" if explain else "lazy"
+        for key, value in best.items():
+            metrics[f"latency.{name}.{label}.{key}"] = value
+    return metrics
+
+
+def bench_throughput(name, sizes=DEFAULT_SIZES, min_seconds=0.2):
+    """
+    Rows per second through compute_batch at each size.
+
+    Sizes that score in under ``min_seconds`` are repeated until that long
+    has passed and the fastest repeat is kept, so small batches are not
+    dominated by timer noise.
+    """
+    engine = importlib.import_module(f"scores.{name}.prediction")
+    engine.compute_batch(synthetic_frame(name, 1_000))  # warm up
+    metrics = {}
+    for size in sizes:
+        elapsed = 0.0
+        for frame in synthetic_frames(name, size):
+            best = None
+            spent = 0.0
+            while best is None or (size <= BATCH_SLICE and spent < min_seconds):
+                start = time.perf_counter()
+                engine.compute_batch(frame)
+                took = time.perf_counter() - start
+                spent += took
+                best = took if best is None else min(best, took)
+            elapsed += best
+            del frame
+        metrics[f"throughput.{name}.{size}.rows_per_s"] = size / elapsed
+    return metrics
+
+
+def bench_allocations(name, calls=2_000):
+    """tracemalloc peak and retained bytes per compute_prediction call."""
+    engine = importlib.import_module(f"scores.{name}.prediction")
+    rows = _rows(name, calls)
+    metrics = {}
+    for explain in (True, False):
+        compute = engine.compute_prediction
+        compute(rows[0], explain)
+        label = "explain" if explain else "lazy"
+        tracemalloc.start()
+        try:
+            peaks = []
+            for inputs in rows:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                result = compute(inputs, explain)
+                peaks.append(tracemalloc.get_traced_memory()[1] - base)
+                del result
+            before = tracemalloc.get_traced_memory()[0]
+            kept = [compute(inputs, explain) for inputs in rows]
+            retained = (tracemalloc.get_traced_memory()[0] - before) / len(rows)
+            del kept
+        finally:
+            tracemalloc.stop()
+        metrics[f"allocations.{name}.{label}.peak_bytes"] = float(np.median(peaks))
+        metrics[f"allocations.{name}.{label}.retained_bytes"] = retained
+    return metrics
+
+
+def bench_file(name, rows=100_000):
+    """End-to-end score_file rows per second for CSV and Parquet input (best of two)."""
+    from scores.cli import score_file
+
+    frame = synthetic_frame(name, rows)
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"csv": os.path.join(tmp, "in.csv")}
+        frame.to_csv(paths["csv"], index=False)
+        try:
+            paths["parquet"] = os.path.join(tmp, "in.parquet")
+            frame.to_parquet(paths["parquet"], index=False)
+        except ImportError:
+            del paths["parquet"]
+        for fmt, path in paths.items():
+            best = None
+            for _ in range(2):
+                start = time.perf_counter()
+                score_file(name, path, io.StringIO())
+                took = time.perf_counter() - start
+                best = took if best is None else min(best, took)
+            metrics[f"file.{name}.{fmt}.rows_per_s"] = rows / best
+    return metrics
+
+
+def run(names=None, sizes=DEFAULT_SIZES, calls=20_000, file_rows=100_000):
+    """Run every benchmark for ``names`` and return the results document."""
+    metrics = {}
+    for name in names or available_scores():
+        metrics.update(bench_latency(name, calls))
+        metrics.update(bench_throughput(name, sizes))
+        metrics.update(bench_allocations(name, max(1, min(calls, 2_000))))
+        if file_rows:
+            metrics.update(bench_file(name, file_rows))
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": SEED,
+        },
+        "metrics": metrics,
+    }
+
+
+def higher_is_better(metric):
+    """Whether a larger value of ``metric`` is an improvement."""
+    return metric.endswith("_per_s")
+
+
+def compare(results, baseline):
+    """
+    Compare two results documents metric by metric.
+
+    Returns:
+        list of ``(metric, baseline, current, change)`` for every metric in
+        both, where ``change`` is the relative change oriented so that
+        positive is worse.
+    """
+    rows = []
+    for metric, current in results["metrics"].items():
+        old = baseline["metrics"].get(metric)
+        if old is None or old == 0:
+            continue
+        change = (current - old) / old
+        if higher_is_better(metric):
+            change = -change
+        rows.append((metric, old, current, change))
+    return rows
+
+
+def format_comparison(rows, tolerance=DEFAULT_TOLERANCE):
+    width = max([len("metric")] + [len(row[0]) for row in rows])
+    lines = [f"{'metric':<{width}}  {'baseline':>12}  {'current':>12}  {'worse by':>8}"]
+    for metric, old, current, change in rows:
+        flag = "  REGRESSION" if change > tolerance else ""
+        lines.append(f"{metric:<{width}}  {old:>12.4g}  {current:>12.4g}  {change:>+8.1%}{flag}")
+    return "\n".join(lines)
+
+
+def _size(text):
+    return int(float(text))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m scores.bench",
+        description="Benchmark the score engines and compare against a baseline.",
+    )
+    parser.add_argument("scores", nargs="*",
+                        help=f"scores to benchmark: {', '.join(available_scores())} (default: all)")
+    parser.add_argument("-o", "--output", help="write the results JSON here")
+    parser.add_argument("--sizes", nargs="+", type=_size, default=list(DEFAULT_SIZES),
+                        help="compute_batch row counts, e.g. 1e3 1e7 (default: 1e3..1e6)")
+    parser.add_argument("--calls", type=int, default=20_000,
+                        help="compute_prediction calls timed per score (default: 20000)")
+    parser.add_argument("--file-rows", type=_size, default=100_000,
+                        help="rows in the end-to-end file benchmark; 0 skips it")
+    parser.add_argument("--quick", action="store_true",
+                        help="small run for smoke checks (1e3/1e4 rows, 2000 calls)")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="relative slowdown allowed before failing (default: 0.10)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = set(args.scores) - set(available_scores())
+    if unknown:
+        parser.error(f"unknown score(s): {', '.join(sorted(unknown))}")
+    if args.quick:
+        args.sizes, args.calls = [1_000, 10_000], 2_000
+        args.file_rows = min(args.file_rows, 10_000)
+
+    results = run(args.scores or None, args.sizes, args.calls, args.file_rows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if not args.baseline:
+        width = max(len(metric) for metric in results["metrics"])
+        for metric, value in results["metrics"].items():
+            print(f"{metric:<{width}}  {value:>12.4g}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline)
+    print(format_comparison(rows, args.tolerance))
+    regressed = [row for row in rows if row[3] > args.tolerance]
+    if regressed:
+        print(f"{len(regressed)} metric(s) regressed by more than {args.tolerance:.0%}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
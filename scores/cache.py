@@ -0,0 +1,116 @@
+"""
+Band-signature memoization for compute_prediction.
+
+A score's output depends only on which side of each threshold its inputs
+fall, so inputs are canonicalized to their band signature (the band code of
+each compared variable, ``ScoreModel.band_signature``) and results are
+served from a bounded LRU keyed on it. A hit skips evaluating the
+components as well as building the result. Raw inputs rarely repeat, but
+signatures do: FORD has a few thousand feasible ones and real traffic
+concentrates on a few hundred.
+"""
+
+import collections
+import importlib
+import threading
+
+DEFAULT_MAXSIZE = 4096
+
+
+class BandCache:
+    """
+    compute_prediction for one engine, memoized on the band signature.
+
+    Thread-safe. Each call returns a fresh result dict, so callers may
+    modify it without affecting the cache.
+
+    Args:
+        engine: a ``scores.<name>.prediction`` module.
+        maxsize: signatures kept before the least recently used is evicted.
+    """
+
+    def __init__(self, engine, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.engine = engine
+        self.maxsize = maxsize
+        self._model = engine.MODEL
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def signature(self, inputs):
+        """Return the band signature of raw ``inputs`` (None if it has none)."""
+        return self._model.band_signature(inputs)
+
+    def __call__(self, inputs, explain=True):
+        """Same contract as the engine's ``compute_prediction(inputs, explain)``."""
+        model = self._model
+        key = model.band_signature(inputs)
+        if key is None:
+            # A NaN input belongs to no band: evaluate it directly
+            return self.engine.result_from_mask(model.mask(model.parse(inputs)), explain)
+        entries = self._entries
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+        if entry is None:
+            # Cache the mask and the numeric fields; the breakdown is rebuilt
+            # per call
+            mask = model.mask(model.parse(inputs))
+            entry = (mask, dict(self.engine.result_from_mask(mask, explain=False)))
+            with self._lock:
+                self.misses += 1
+                entries[key] = entry
+                if len(entries) > self.maxsize:
+                    entries.popitem(last=False)
+                    self.evictions += 1
+        mask, fields = entry
+        return model.with_components(dict(fields), mask, explain)
+
+    def stats(self):
+        """Return hit/miss/eviction counters, current size and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name, maxsize=DEFAULT_MAXSIZE):
+    """
+    Return the process-wide BandCache for score ``name``.
+
+    ``maxsize`` applies when the cache is first created; later calls return
+    the same cache whatever they pass.
+    """
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                engine = importlib.import_module(f"scores.{name}.prediction")
+                cache = _caches[name] = BandCache(engine, maxsize)
+    return cache
+
+
+def cached_prediction(name, inputs, explain=True):
+    """compute_prediction for score ``name`` through its process-wide cache."""
+    return get_cache(name)(inputs, explain)
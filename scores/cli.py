@@ -0,0 +1,299 @@
+"""
+Command-line batch scoring: ``python -m scores <score> <input>``.
+
+Reads the input (CSV, Parquet or Arrow IPC) in fixed-size chunks, scores
+each chunk with the engine's compute_batch and appends the scored rows to
+the output as CSV, so memory use does not grow with the file size. An
+output file is only opened (and truncated) once the first chunk is scored.
+"""
+
+import argparse
+import collections
+import importlib
+import os
+import sys
+
+import pandas as pd
+
+from scores import available_scores
+from scores.ingest import DEFAULT_CHUNKSIZE, FORMATS, read_inputs, split_chunks
+from scores.parallel import score_shard, iter_scored_shards
+from scores.validation import ValidationError, batch_validator
+
+
+def score_pairs(name, pairs, workers=1, timings=None):
+    """
+    Score ``(kept, inputs)`` chunks from scores.ingest, yielding scored frames.
+
+    Args:
+        name: score package name (``ford``, ``rams``, ``prime_icu``).
+        pairs: iterable of ``(kept, inputs)`` as produced by scores.ingest.
+        workers: with more than one, chunks are scored in a process pool
+            (see scores.parallel) and still yielded in input order.
+        timings: optional list that receives one timing dict per chunk.
+
+    Yields:
+        DataFrames with the kept input columns followed by the result columns.
+    """
+    kept_frames = collections.deque()
+
+    def inputs_only():
+        for kept, inputs in pairs:
+            kept_frames.append(kept)
+            yield inputs
+
+    if workers > 1:
+        scored_chunks = iter_scored_shards(name, inputs_only(), workers)
+    else:
+        scored_chunks = (
+            score_shard(name, i, inputs) for i, inputs in enumerate(inputs_only())
+        )
+
+    for scored, timing in scored_chunks:
+        kept = kept_frames.popleft()
+        clashes = [col for col in scored.columns if col in kept.columns]
+        if clashes:
+            raise ValueError(
+                f"Input columns clash with result columns: {', '.join(clashes)}; "
+                "use --keep to choose which input columns to carry through"
+            )
+        if timings is not None:
+            timings.append(timing)
+        yield pd.concat([kept, scored.set_axis(kept.index)], axis=1)
+
+
+def score_chunks(name, chunks, overrides=None, keep=None, workers=1, timings=None):
+    """
+    Score an iterable of input DataFrames, yielding one scored frame each.
+
+    Args:
+        name: score package name.
+        chunks: iterable of DataFrames sharing the same columns.
+        overrides: optional dict mapping variable name to input column.
+        keep: input columns to carry through to the output (default: all).
+        workers: worker processes used to score chunks (1 = in-process).
+        timings: optional list that receives one timing dict per chunk.
+    """
+    config = importlib.import_module(f"scores.{name}.config")
+    pairs = split_chunks(chunks, config.VARIABLES, overrides, keep)
+    return score_pairs(name, pairs, workers, timings)
+
+
+def validate_pairs(name, pairs, invalid="drop", rejected=None):
+    """
+    Validate ``(kept, inputs)`` chunks column-wise before scoring.
+
+    Args:
+        name: score package name.
+        pairs: iterable of ``(kept, inputs)`` as produced by scores.ingest.
+        invalid: ``"drop"`` leaves out rows with an invalid cell; ``"fail"``
+            raises ValidationError (with the row number) at the first one.
+        rejected: optional dict that receives the number of dropped rows
+            under ``"rows"``, and under ``"cells"`` the invalid cell counts
+            by variable and message (as ``BatchValidation.summary``).
+
+    Yields:
+        ``(kept, inputs)`` with the inputs replaced by the validated, engine
+        ready columns.
+    """
+    validator = batch_validator(name)
+    offset = 0
+    for kept, inputs in pairs:
+        checked = validator.validate(inputs)
+        valid = checked.valid
+        if not valid.all():
+            first = int(valid.argmin())
+            if invalid == "fail":
+                raise ValidationError([
+                    dict(error, row=offset + first) for error in checked.messages(first)
+                ])
+            if rejected is not None:
+                rejected["rows"] = rejected.get("rows", 0) + int((~valid).sum())
+                for field, counts in checked.summary().items():
+                    totals = rejected.setdefault("cells", {}).setdefault(field, {})
+                    for message, count in counts.items():
+                        totals[message] = totals.get(message, 0) + count
+            kept, clean = kept[valid], checked.clean[valid]
+        else:
+            clean = checked.clean
+        offset += len(valid)
+        yield kept, clean
+
+
+def score_file(name, source, output, chunksize=DEFAULT_CHUNKSIZE, overrides=None,
+               keep=None, sep=",", workers=1, timings=None, fmt=None, invalid="score",
+               rejected=None):
+    """
+    Score a CSV, Parquet or Arrow file chunk by chunk and write CSV rows.
+
+    Args:
+        name: score package name.
+        source: input path, file object, or ``"-"`` for CSV on stdin.
+        output: writable text file object.
+        chunksize: rows read and scored at a time.
+        overrides: optional dict mapping variable name to input column.
+        keep: input columns to carry through to the output (default: all
+            for CSV, none for Parquet/Arrow).
+        sep: CSV field delimiter.
+        workers: worker processes used to score chunks (1 = in-process).
+        timings: optional list that receives one timing dict per chunk.
+        fmt: ``csv``, ``parquet`` or ``arrow`` (default: from the extension).
+        invalid: ``"score"`` scores every row as the engine coerces it;
+            ``"drop"`` or ``"fail"`` validate first (see validate_pairs).
+        rejected: with ``"drop"``, optional dict receiving what was dropped.
+
+    Returns:
+        Number of rows scored.
+    """
+    config = importlib.import_module(f"scores.{name}.config")
+    pairs = read_inputs(source, config.VARIABLES, overrides, keep, chunksize, sep, fmt)
+    if invalid != "score":
+        pairs = validate_pairs(name, pairs, invalid, rejected)
+    rows = 0
+    for scored in score_pairs(name, pairs, workers, timings):
+        scored.to_csv(output, header=rows == 0, index=False)
+        output.flush()
+        rows += len(scored)
+    return rows
+
+
+class _DeferredFile:
+    """
+    Output file opened on the first write, so a run that fails before it
+    scores anything (a missing input, a bad column) leaves the file as it was.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def open(self):
+        if self.file is None:
+            self.file = open(self.path, "w", newline="")
+        return self.file
+
+    def write(self, text):
+        return self.open().write(text)
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+def _parse_mapping(pairs):
+    """Turn ``["gcs=GCS_TOTAL", ...]`` into ``{"gcs": "GCS_TOTAL", ...}``."""
+    overrides = {}
+    for pair in pairs:
+        name, sep, col = pair.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected VARIABLE=COLUMN, got {pair!r}")
+        overrides[name.strip()] = col.strip()
+    return overrides
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m scores",
+        description="Score a CSV, Parquet or Arrow file with one of the clinical scores.",
+    )
+    parser.add_argument("score", choices=available_scores(), help="score to compute")
+    parser.add_argument("input", help="input path, or - for CSV on stdin")
+    parser.add_argument(
+        "-o", "--output", default="-", help="output CSV path (default: stdout)"
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help=f"rows read and scored at a time (default: {DEFAULT_CHUNKSIZE})",
+    )
+    parser.add_argument(
+        "--map",
+        action="append",
+        default=[],
+        metavar="VARIABLE=COLUMN",
+        help="read a variable from a differently named column (repeatable)",
+    )
+    parser.add_argument(
+        "--keep",
+        action="append",
+        metavar="COLUMN",
+        help="input column to carry through to the output (repeatable; "
+        "default: all for CSV, none for Parquet/Arrow)",
+    )
+    parser.add_argument("--sep", default=",", help="CSV field delimiter")
+    parser.add_argument(
+        "--format",
+        choices=sorted(set(FORMATS.values())),
+        help="input format (default: from the file extension, else csv)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes scoring chunks in parallel (default: 1, in-process)",
+    )
+    parser.add_argument(
+        "--invalid",
+        choices=["score", "drop", "fail"],
+        default="score",
+        help="rows with out-of-range or unknown values: score them as coerced "
+        "(default), drop them, or stop with an error",
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="report per-chunk scoring time on stderr",
+    )
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        overrides = _parse_mapping(args.map)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    timings = []
+    rejected = {}
+    options = (
+        args.chunksize, overrides, args.keep, args.sep, args.workers, timings, args.format,
+        args.invalid, rejected,
+    )
+    try:
+        if args.output == "-":
+            rows = score_file(args.score, args.input, sys.stdout, *options)
+        else:
+            output = _DeferredFile(args.output)
+            try:
+                rows = score_file(args.score, args.input, output, *options)
+                output.open()  # an input with no rows still gets an (empty) output
+            finally:
+                output.close()
+    except BrokenPipeError:
+        # The reader (e.g. ``head``) closed stdout early; exit quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (ImportError, OSError, ValueError) as exc:
+        parser.exit(1, f"{parser.prog}: error: {exc}\n")
+
+    if args.timing:
+        for timing in timings:
+            print(
+                f"chunk {timing['shard']}: {timing['rows']} rows in "
+                f"{timing['seconds'] * 1000:.1f} ms (pid {timing['pid']})",
+                file=sys.stderr,
+            )
+    if rejected:
+        print(f"Dropped {rejected['rows']} invalid rows:", file=sys.stderr)
+        for field, counts in rejected["cells"].items():
+            for message, count in counts.items():
+                print(f"  {field}: {message} ({count} rows)", file=sys.stderr)
+    print(f"Scored {rows} rows with {args.score}", file=sys.stderr)
+    return 0
@@ -0,0 +1,339 @@
+"""
+Seeded synthetic patient cohorts drawn from the scores' VARIABLES.
+
+Rows are generated in fixed blocks, each from its own seeded generator, and
+re-cut into chunks of the requested size, so a cohort is identical for a
+given seed whatever the chunk size and never has to fit in memory.
+
+Each variable follows a marginal distribution (by default a normal around
+its ``default``, clipped to ``min``/``max`` and snapped to ``step``, or
+uniform over the options). A share of rows can be pushed onto the
+thresholds the score's components test, on either side of each cut (GCS
+8/9, SBP 89/90, ...), to exercise the band boundaries.
+
+Usage::
+
+    python -m scores.cohort rams -n 50e6 -o cohort.parquet --edge-rate 0.2
+    python -m scores.cohort ford -n 1000 --marginal age=normal:70:12 \\
+        --marginal sex=Male:0.4,Female:0.6
+"""
+
+import argparse
+import importlib
+import sys
+
+import numpy as np
+import pandas as pd
+
+from scores import available_scores
+from scores.core import ScoreModel, step_decimals
+
+DEFAULT_CHUNKSIZE = 1_000_000
+# Rows per independently seeded block; fixes the stream regardless of chunksize
+BLOCK_ROWS = 65_536
+
+
+def cohort_variables(names):
+    """
+    Merged VARIABLES of the ``names`` scores.
+
+    A variable several scores declare is drawn over all of its declarations:
+    the widest ``min``/``max`` and finest ``step`` of a continuous one, the
+    union of a categorical one's options (so every score's option-specific
+    components can fire). Rows may therefore hold values outside one
+    score's own declaration, as real cohorts do.
+
+    Raises:
+        ValueError: when declarations cannot be merged (a different type, or
+            an option label mapped to different values).
+    """
+    variables = {}
+    for name in names:
+        config = importlib.import_module(f"scores.{name}.config")
+        for var in config.VARIABLES:
+            seen = variables.get(var["name"])
+            variables[var["name"]] = var if seen is None else _merge_variable(seen, var, name)
+    return list(variables.values())
+
+
+def _merge_variable(seen, var, score):
+    if seen["type"] != var["type"]:
+        raise ValueError(f"{score!r} declares {var['name']!r} as {var['type']}, "
+                         f"another score as {seen['type']}")
+    if var["type"] == "continuous":
+        merged = dict(seen, min=min(seen["min"], var["min"]), max=max(seen["max"], var["max"]))
+        merged["step"] = min(seen.get("step", 1), var.get("step", 1))
+        return merged
+    a, b = seen["options"], var["options"]
+    if isinstance(a, dict) != isinstance(b, dict):
+        raise ValueError(f"{score!r} declares the options of {var['name']!r} differently "
+                         "from another score (mapped vs. plain)")
+    if isinstance(a, dict):
+        clash = [label for label in a.keys() & b.keys() if a[label] != b[label]]
+        if clash:
+            raise ValueError(f"{score!r} maps option(s) {', '.join(map(repr, sorted(clash)))} "
+                             f"of {var['name']!r} to different values from another score")
+        return dict(seen, options={**a, **b})
+    return dict(seen, options=list(dict.fromkeys(list(a) + list(b))))
+
+
+def threshold_edges(names):
+    """
+    Return, per continuous variable, the values either side of each threshold.
+
+    An inclusive cut at ``t`` (``x >= t``, ``x < t``) yields ``t - step`` and
+    ``t``; an exclusive one (``x > t``, ``x <= t``) yields ``t`` and
+    ``t + step``.
+    """
+    continuous = {
+        var["name"]: var for var in cohort_variables(names) if var["type"] == "continuous"
+    }
+    edges = {}
+    for name in names:
+        model = ScoreModel(importlib.import_module(f"scores.{name}.config"))
+        for var, index in model.bands.items():
+            if var not in continuous:
+                continue
+            step = continuous[var].get("step", 1)
+            values = edges.setdefault(var, set())
+            for value, inclusive in index.bounds:
+                values.update((value - step, value) if inclusive else (value, value + step))
+    return {
+        var: sorted(set(_snap(np.array(sorted(values)), continuous[var]).tolist()))
+        for var, values in edges.items()
+    }
+
+
+def _snap(values, var):
+    step = var.get("step", 1)
+    values = np.clip(values, var["min"], var["max"])
+    return np.round(np.round(values / step) * step, step_decimals(step))
+
+
+def _choices(var):
+    options = var["options"]
+    return list(options.values()) if isinstance(options, dict) else list(options)
+
+
+def _draw(var, spec, rng, n):
+    """Draw ``n`` values of one variable from its marginal ``spec``."""
+    if var["type"] != "continuous":
+        choices = _choices(var)
+        if spec is None:
+            picks = rng.integers(0, len(choices), n)
+        else:
+            options = var["options"]
+            labels = list(options) if isinstance(options, dict) else choices
+            unknown = set(spec) - set(labels)
+            if unknown:
+                raise ValueError(f"Unknown option(s) for {var['name']!r}: "
+                                 f"{', '.join(map(repr, sorted(unknown)))}")
+            weights = np.array([float(spec.get(label, 0.0)) for label in labels])
+            if weights.sum() <= 0:
+                raise ValueError(f"Weights for {var['name']!r} must name at least one option")
+            picks = rng.choice(len(choices), n, p=weights / weights.sum())
+        return np.array(choices, dtype=object)[picks]
+
+    spec = spec or {"dist": "normal"}
+    low, high = var["min"], var["max"]
+    dist = spec.get("dist")
+    if dist == "normal":
+        values = rng.normal(spec.get("mean", var["default"]), spec.get("sd", (high - low) / 8), n)
+    elif dist == "uniform":
+        values = rng.uniform(spec.get("low", low), spec.get("high", high), n)
+    elif dist == "triangular":
+        values = rng.triangular(spec.get("low", low), spec.get("mode", var["default"]),
+                                spec.get("high", high), n)
+    elif dist == "constant":
+        values = np.full(n, float(spec.get("value", var["default"])))
+    else:
+        raise ValueError(f"Unknown distribution {dist!r} for {var['name']!r}")
+    return _snap(values, var)
+
+
+def _blocks(variables, marginals, edges, edge_rate, seed):
+    """Yield successive BLOCK_ROWS-row dicts of column arrays, forever."""
+    block = 0
+    while True:
+        rng = np.random.default_rng([seed, block])
+        columns = {}
+        for var in variables:
+            name = var["name"]
+            values = _draw(var, marginals.get(name), rng, BLOCK_ROWS)
+            if edge_rate and name in edges:
+                hit = rng.random(BLOCK_ROWS) < edge_rate
+                values[hit] = rng.choice(edges[name], int(hit.sum()))
+            columns[name] = values
+        yield columns
+        block += 1
+
+
+def generate(names, n, seed=0, chunksize=DEFAULT_CHUNKSIZE, marginals=None, edge_rate=0.0):
+    """
+    Generate a synthetic cohort as DataFrame chunks.
+
+    Args:
+        names: a score name or a list of them; the cohort has one column per
+            variable any of them declares.
+        n: total rows.
+        seed: the cohort is a pure function of ``seed`` and the other
+            arguments except ``chunksize``.
+        chunksize: rows per yielded DataFrame.
+        marginals: optional dict mapping variable name to its distribution.
+            Continuous: ``{"dist": "normal", "mean": ..., "sd": ...}``,
+            ``{"dist": "uniform", "low": ..., "high": ...}``,
+            ``{"dist": "triangular", "low": ..., "mode": ..., "high": ...}``
+            or ``{"dist": "constant", "value": ...}`` (omitted parameters
+            come from the variable's min/max/default). Categorical: a dict
+            of relative weights by option label.
+        edge_rate: share of each thresholded variable's values replaced by
+            a value on either side of one of its thresholds.
+
+    Yields:
+        DataFrames of at most ``chunksize`` rows, with engine-ready values
+        (mapped values for dict options).
+    """
+    names = [names] if isinstance(names, str) else list(names)
+    variables = cohort_variables(names)
+    marginals = dict(marginals or {})
+    unknown = set(marginals) - {var["name"] for var in variables}
+    if unknown:
+        raise ValueError(f"Unknown variable(s) in marginals: {', '.join(sorted(unknown))}")
+    if not 0 <= edge_rate <= 1:
+        raise ValueError("edge_rate must be between 0 and 1")
+    edges = threshold_edges(names) if edge_rate else {}
+
+    blocks = _blocks(variables, marginals, edges, edge_rate, seed)
+    pending = []
+    pending_rows = 0
+    remaining = n
+    while remaining > 0:
+        size = min(chunksize, remaining)
+        while pending_rows < size:
+            block = next(blocks)
+            pending.append(block)
+            pending_rows += BLOCK_ROWS
+        joined = {
+            var["name"]: np.concatenate([block[var["name"]] for block in pending])
+            for var in variables
+        }
+        columns = {name: values[:size] for name, values in joined.items()}
+        # Keep the unused tail of the last block for the next chunk
+        pending_rows -= size
+        pending = [{name: values[size:] for name, values in joined.items()}] if pending_rows else []
+        remaining -= size
+        yield pd.DataFrame(columns)
+
+
+def write_csv(chunks, output):
+    """Stream DataFrame chunks to a CSV path or text file object; returns rows."""
+    close = isinstance(output, str)
+    f = open(output, "w", newline="") if close else output
+    rows = 0
+    try:
+        for chunk in chunks:
+            chunk.to_csv(f, header=rows == 0, index=False)
+            rows += len(chunk)
+    finally:
+        if close:
+            f.close()
+    return rows
+
+
+def write_parquet(chunks, path):
+    """Stream DataFrame chunks into one Parquet file, a row group per chunk."""
+    from scores.ingest import _pyarrow
+
+    pa = _pyarrow()
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def parse_marginal(text):
+    """
+    Parse a ``--marginal`` option.
+
+    ``age=normal:70:12``, ``age=uniform:18:90``, ``age=triangular:18:65:90``,
+    ``gcs=constant:15`` or ``sex=Male:0.4,Female:0.6``.
+    """
+    name, sep, spec = text.partition("=")
+    if not sep or not spec:
+        raise argparse.ArgumentTypeError(f"Expected VARIABLE=SPEC, got {text!r}")
+    dist, _, rest = spec.partition(":")
+    params = [float(p) for p in rest.split(":")] if rest and dist in (
+        "normal", "uniform", "triangular", "constant") else []
+    if dist == "normal":
+        return name, dict(zip(("mean", "sd"), params), dist=dist)
+    if dist == "uniform":
+        return name, dict(zip(("low", "high"), params), dist=dist)
+    if dist == "triangular":
+        return name, dict(zip(("low", "mode", "high"), params), dist=dist)
+    if dist == "constant":
+        return name, dict(zip(("value",), params), dist=dist)
+    weights = {}
+    for item in spec.split(","):
+        label, sep, weight = item.rpartition(":")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected OPTION:WEIGHT, got {item!r}")
+        weights[label] = float(weight)
+    return name, weights
+
+
+def _count(text):
+    return int(float(text))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m scores.cohort",
+        description="Generate a seeded synthetic cohort from the scores' VARIABLES.",
+    )
+    parser.add_argument("scores", nargs="+",
+                        help=f"scores whose variables to generate: {', '.join(available_scores())}")
+    parser.add_argument("-n", "--rows", type=_count, required=True, help="rows, e.g. 50e6")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output .csv or .parquet path (default: CSV on stdout)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--chunksize", type=_count, default=DEFAULT_CHUNKSIZE,
+                        help=f"rows generated at a time (default: {DEFAULT_CHUNKSIZE})")
+    parser.add_argument("--marginal", action="append", type=parse_marginal, default=[],
+                        metavar="VAR=SPEC", help="distribution for one variable (repeatable)")
+    parser.add_argument("--edge-rate", type=float, default=0.0,
+                        help="share of thresholded values placed at a threshold edge")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = set(args.scores) - set(available_scores())
+    if unknown:
+        parser.error(f"unknown score(s): {', '.join(sorted(unknown))}")
+    try:
+        chunks = generate(args.scores, args.rows, args.seed, args.chunksize,
+                          dict(args.marginal), args.edge_rate)
+        if args.output.endswith((".parquet", ".pq")):
+            write_parquet(chunks, args.output)
+        else:
+            write_csv(chunks, sys.stdout if args.output == "-" else args.output)
+    except BrokenPipeError:
+        return 0
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
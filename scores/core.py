@@ -0,0 +1,909 @@
+"""
+Shared component evaluator for all clinical scoring tools.
+
+Each score declares its components in ``config.COMPONENTS`` and its scoring
+rule in ``config.SCORING``. ``ScoreModel`` compiles those tables once at
+import and evaluates them for a single patient (a dict of inputs) or for a
+whole batch (a DataFrame of columns).
+"""
+
+import abc
+import ast
+import bisect
+import math
+import operator
+from typing import NamedTuple
+
+# NumPy is imported inside the batch functions only, so that importing a
+# score engine for scalar use pulls in nothing beyond the standard library.
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "in": lambda value, options: value in options,
+}
+
+
+def _batch_in(column, options):
+    import numpy as np
+
+    return np.logical_or.reduce([column == o for o in options])
+
+
+BATCH_OPERATORS = dict(OPERATORS, **{"in": _batch_in})
+
+# Scores with at most this many components resolve through a single table
+FULL_TABLE_BITS = 16
+# Otherwise components are resolved in chunks of at most this many bits
+CHUNK_BITS = 8
+# Variables with more breakpoints than this are banded by binary search
+SEARCH_EDGES = 16
+
+# Derived variables that component clauses may reference like an input.
+DERIVED = {
+    "bmi": (
+        ("height_in", "weight_lb"),
+        lambda height_in, weight_lb: (weight_lb / (height_in ** 2)) * 703,
+    ),
+}
+
+
+def _coercion(var):
+    """Return the callable that converts a raw input value for ``var``."""
+    if var["type"] == "continuous":
+        return float
+    if isinstance(var["options"], dict):
+        return int
+    return None
+
+
+class Columns:
+    """
+    Minimal column table: 1-D arrays by name plus a row count.
+
+    The batch evaluators accept this anywhere they accept a DataFrame, so
+    columnar sources (e.g. Arrow record batches) can be scored without first
+    building a pandas frame. Missing cells are NaN in numeric columns and
+    None in categorical ones.
+
+    Args:
+        arrays: dict mapping column name to a 1-D array.
+        num_rows: row count (default: length of the first array).
+    """
+
+    __slots__ = ("arrays", "num_rows")
+
+    index = None
+
+    def __init__(self, arrays, num_rows=None):
+        self.arrays = arrays
+        if num_rows is None:
+            num_rows = len(next(iter(arrays.values()))) if arrays else 0
+        self.num_rows = num_rows
+
+    def __contains__(self, name):
+        return name in self.arrays
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __len__(self):
+        return self.num_rows
+
+
+def column(df, name, default, dtype=float):
+    """Return column ``name`` of ``df`` as an array, filling gaps with ``default``."""
+    import numpy as np
+
+    if name not in df:
+        return np.full(len(df), default, dtype=dtype)
+    values = df[name]
+    if hasattr(values, "fillna"):
+        return values.fillna(default).to_numpy(dtype=dtype)
+    if dtype is object:
+        values = np.asarray(values, dtype=object)
+        missing = np.equal(values, None)
+    else:
+        values = np.asarray(values, dtype=dtype)
+        missing = np.isnan(values)
+    if missing.any():
+        values = np.where(missing, default, values).astype(dtype)
+    return values
+
+
+def parse_column(df, name, default, coerce):
+    """Return column ``name`` of ``df`` coerced the way ``parse`` coerces scalars."""
+    import numpy as np
+
+    if coerce is None:
+        return column(df, name, default, object)
+    if coerce is int:
+        return column(df, name, default).astype(np.int64)
+    return column(df, name, default)
+
+
+def _literal(value):
+    """Return source for a clause constant, which must round-trip through repr."""
+    source = repr(value)
+    if ast.literal_eval(source) != value:
+        raise ValueError(f"Clause value {value!r} is not a plain literal")
+    return source
+
+
+def _compile(source, name, namespace):
+    """Compile generated ``source`` and return the function called ``name``."""
+    exec(compile(source, f"<scores.core:{name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _compile_parse(inputs, derived):
+    """Generate a straight-line ``parse(inputs)`` for one score."""
+    namespace = {}
+    lines = ["def parse(inputs):", "    get = inputs.get"]
+    local = {}
+    for i, (name, default, coerce) in enumerate(inputs):
+        namespace[f"_default{i}"] = default
+        expr = f"get({name!r}, _default{i})"
+        if coerce is not None:
+            namespace[f"_coerce{i}"] = coerce
+            expr = f"_coerce{i}({expr})"
+        local[name] = f"v{i}"
+        lines.append(f"    v{i} = {expr}")
+    for i, (name, args, derive) in enumerate(derived):
+        namespace[f"_derive{i}"] = derive
+        local[name] = f"d{i}"
+        lines.append(f"    d{i} = _derive{i}({', '.join(local[a] for a in args)})")
+    items = ", ".join(f"{name!r}: {var}" for name, var in local.items())
+    lines.append(f"    return {{{items}}}")
+    return _compile("\n".join(lines), "parse", namespace)
+
+
+def _compile_mask(clauses, predicates):
+    """Generate a straight-line ``mask(values)`` with one test per component."""
+    names = sorted({name for name, _, _ in clauses})
+    local = {name: f"x{i}" for i, name in enumerate(names)}
+    lines = ["def mask(values):"]
+    lines += [f"    {local[name]} = values[{name!r}]" for name in names]
+    lines.append("    mask = 0")
+    for bit, match_any, clause_ids in predicates:
+        tests = []
+        for i in clause_ids:
+            name, op, value = clauses[i]
+            tests.append(f"{local[name]} {op} {_literal(value)}")
+        joiner = " or " if match_any else " and "
+        lines.append(f"    if {joiner.join(tests)}:")
+        lines.append(f"        mask |= {bit}")
+    lines.append("    return mask")
+    return _compile("\n".join(lines), "mask", {})
+
+
+def _compile_signature(inputs, derived, bands):
+    """
+    Generate a straight-line ``signature(inputs)``: the band code of each
+    compared variable, read from raw inputs coerced as ``parse`` coerces
+    them (without building the parsed dict).
+
+    Returns None when a numeric value is NaN, which fails every comparison
+    and so belongs to no band.
+    """
+    namespace = {"bisect_right": bisect.bisect_right}
+    lines = ["def signature(inputs):", "    get = inputs.get"]
+    needed = set(bands)
+    for name, args, _ in derived:
+        if name in bands:
+            needed.update(args)
+    local = {}
+    for i, (name, default, coerce) in enumerate(inputs):
+        if name not in needed:
+            continue
+        namespace[f"_default{i}"] = default
+        expr = f"get({name!r}, _default{i})"
+        if coerce is not None:
+            namespace[f"_coerce{i}"] = coerce
+            expr = f"_coerce{i}({expr})"
+        local[name] = f"v{i}"
+        lines.append(f"    v{i} = {expr}")
+    for i, (name, args, derive) in enumerate(derived):
+        if name in bands:
+            namespace[f"_derive{i}"] = derive
+            local[name] = f"d{i}"
+            lines.append(f"    d{i} = _derive{i}({', '.join(local[a] for a in args)})")
+    numeric = []
+    codes = []
+    for i, (name, index) in enumerate(bands.items()):
+        x = local[name]
+        if index.numeric:
+            namespace[f"_edges{i}"] = index.edges
+            numeric.append(f"{x} != {x}")
+            codes.append(f"bisect_right(_edges{i}, {x})")
+        else:
+            namespace[f"_codes{i}"] = {edge: j + 1 for j, edge in enumerate(index.edges)}
+            codes.append(f"_codes{i}.get({x}, 0)")
+    if numeric:
+        lines.append(f"    if {' or '.join(numeric)}:")
+        lines.append("        return None")
+    lines.append(f"    return ({', '.join(codes)},)")
+    return _compile("\n".join(lines), "signature", namespace)
+
+
+def _chunk_layout(variable_sets):
+    """
+    Split component bits into contiguous ``(start, width)`` lookup chunks.
+
+    Scores with up to FULL_TABLE_BITS components get one table over every
+    combination. Larger scores are split into chunks of at most CHUNK_BITS,
+    keeping adjacent components that read the same variables together.
+    """
+    limit = len(variable_sets) if len(variable_sets) <= FULL_TABLE_BITS else CHUNK_BITS
+    groups = []
+    for i, names in enumerate(variable_sets):
+        if groups and names & groups[-1][1]:
+            groups[-1][0].append(i)
+            groups[-1][1].update(names)
+        else:
+            groups.append(([i], set(names)))
+    chunks = []
+    for members, _ in groups:
+        if chunks and chunks[-1][1] + len(members) <= limit:
+            chunks[-1][1] += len(members)
+        else:
+            chunks.append([members[0], len(members)])
+    return [tuple(chunk) for chunk in chunks]
+
+
+def round_half_even(values, ndigits):
+    """Round like ``round(x, ndigits)`` on each element (NumPy rounding can differ)."""
+    import numpy as np
+
+    uniques, inverse = np.unique(values, return_inverse=True)
+    return np.array([round(v, ndigits) for v in uniques.tolist()])[inverse]
+
+
+def step_decimals(step):
+    """Decimal places that values on an input's ``step`` grid are rounded to."""
+    return max(0, -math.floor(math.log10(step))) if step < 1 else 0
+
+
+def step_grid(low, high, step):
+    """Return the values ``low + k * step`` up to ``high`` as an array."""
+    import numpy as np
+
+    count = int(math.floor((high - low) / step + 1e-9)) + 1
+    return np.round(low + step * np.arange(count), step_decimals(step))
+
+
+# Operators whose threshold starts the upper band at the value itself
+# (``x >= t`` / ``x < t``) rather than just above it (``x > t`` / ``x <= t``)
+_INCLUSIVE = {"<": True, ">=": True, "<=": False, ">": False}
+
+
+class _Other:
+    """Stand-in for every categorical value no clause names (band 0)."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<other>"
+
+
+class BandIndex:
+    """
+    Sorted threshold breakpoints for one variable.
+
+    The thresholds a score's clauses compare a variable against split its
+    range into bands, numbered from 0, within which every clause on that
+    variable has the same outcome.
+
+    Numeric variables are cut at ``bounds``: sorted ``(value, inclusive)``
+    pairs, where ``inclusive`` means the band above starts at ``value``
+    itself (``x >= value``) rather than just above it (``x > value``).
+    Categorical variables get one band per value named in a clause, after
+    band 0 for everything else.
+
+    Attributes:
+        name: variable name.
+        numeric: whether the variable is numeric (else categorical).
+        bounds: ``(value, inclusive)`` breakpoints (numeric only).
+        edges: sorted search keys: each bound's value, or the next float
+            above it when not inclusive, so ``x`` is in band
+            ``bisect_right(edges, x)``; for categoricals, the sorted values.
+        values: a representative value for each band.
+    """
+
+    __slots__ = ("name", "numeric", "bounds", "edges", "values")
+
+    def __init__(self, name, clauses, numeric):
+        self.name = name
+        self.numeric = numeric
+        if numeric:
+            bounds = set()
+            for op, value in clauses:
+                if op in _INCLUSIVE:
+                    bounds.add((value, _INCLUSIVE[op]))
+                else:
+                    # Equality cuts both sides of each value it names
+                    for v in (value if op == "in" else (value,)):
+                        bounds.update({(v, True), (v, False)})
+            self.bounds = tuple(sorted(bounds, key=lambda b: (b[0], not b[1])))
+            self.edges = tuple(
+                float(v) if inclusive else math.nextafter(v, math.inf)
+                for v, inclusive in self.bounds
+            )
+            self.values = (-math.inf,) + self.edges
+        else:
+            named = set()
+            for op, value in clauses:
+                if op == "==":
+                    named.add(value)
+                elif op == "in":
+                    named.update(value)
+                else:
+                    raise ValueError(f"Operator {op!r} is not supported on categorical {name!r}")
+            self.bounds = ()
+            self.edges = tuple(sorted(named))
+            self.values = (_Other(),) + self.edges
+
+    def __len__(self):
+        """Number of bands."""
+        return len(self.values)
+
+    def code(self, value):
+        """Return the band code of a single parsed value."""
+        if self.numeric:
+            return bisect.bisect_right(self.edges, value)
+        try:
+            i = bisect.bisect_left(self.edges, value)
+        except TypeError:
+            return 0
+        return i + 1 if i < len(self.edges) and self.edges[i] == value else 0
+
+    def codes(self, column):
+        """Return the band codes of a parsed column as a small unsigned-int array."""
+        import numpy as np
+
+        if len(self.edges) > SEARCH_EDGES:
+            if self.numeric:
+                return np.searchsorted(self.edges, column, side="right").astype(np.uint16)
+            return np.array([self.code(v) for v in column.tolist()], dtype=np.uint16)
+        # Counting the edges at or below each value equals searchsorted's
+        # result, and for a handful of edges costs a fraction of it
+        codes = np.zeros(len(column), dtype=np.uint8)
+        for i, edge in enumerate(self.edges):
+            if self.numeric:
+                codes += column >= edge
+            else:
+                codes[column == edge] = i + 1
+        return codes
+
+    def __repr__(self):
+        return f"BandIndex({self.name!r}, bands={len(self)})"
+
+
+class LazyResult(dict):
+    """
+    Engine result whose ``"components"`` breakdown is built on first access.
+
+    Until ``result["components"]`` is read, the key is absent, so ``in``,
+    ``get`` and iteration only see the numeric fields.
+    """
+
+    __slots__ = ("_model", "_mask")
+
+    @property
+    def mask(self):
+        """The bitmask of met components the breakdown is built from."""
+        return self._mask
+
+    def __missing__(self, key):
+        if key != "components":
+            raise KeyError(key)
+        components = self["components"] = self._model.breakdown(self._mask)
+        return components
+
+
+class ComponentSpec(NamedTuple):
+    """Static description of one component, shared by every result."""
+
+    label: str
+    condition: str
+    points: float
+    contribution: float
+
+
+class CompactResult(abc.ABC):
+    """
+    Memory-lean engine result: the bitmask of met components and the score.
+
+    Everything else is read from tables shared by every result on demand:
+    the risk level from the score, and the components from the model's
+    ``component_specs`` plus the ``met``/``values`` vectors decoded from the
+    mask. ``to_dict()`` rebuilds the full ``compute_prediction`` dict.
+
+    Each engine defines a subclass setting ``model`` (as a class attribute)
+    and ``to_dict``.
+    """
+
+    __slots__ = ("mask", "score")
+
+    def __init__(self, mask, score):
+        self.mask = mask
+        self.score = score
+
+    @classmethod
+    def from_mask(cls, mask):
+        """Build the result for a bitmask of met components."""
+        return cls(mask, cls.model.resolve(mask)[1])
+
+    @property
+    @abc.abstractmethod
+    def model(self):
+        """The engine's ScoreModel."""
+
+    @abc.abstractmethod
+    def to_dict(self, explain=True):
+        """Return the engine's ``compute_prediction`` dict for this result."""
+
+    @property
+    def raw(self):
+        """The pre-rounding/pre-clipping score."""
+        return self.model.resolve(self.mask)[0]
+
+    @property
+    def level(self):
+        """The RISK_LEVELS entry the score falls into."""
+        return self.model.risk_level(self.score)
+
+    @property
+    def risk_label(self):
+        return self.model.risk_level(self.score)["label"]
+
+    @property
+    def risk_color(self):
+        return self.model.risk_level(self.score)["color"]
+
+    @property
+    def met(self):
+        """Whether each component is met, in COMPONENTS order."""
+        mask = self.mask
+        return tuple(bool(mask >> i & 1) for i in range(len(self.model.component_specs)))
+
+    @property
+    def values(self):
+        """Points each component contributes (0 when unmet), in COMPONENTS order."""
+        mask = self.mask
+        return tuple(
+            spec.points if mask >> i & 1 else 0
+            for i, spec in enumerate(self.model.component_specs)
+        )
+
+    def met_components(self):
+        """The ComponentSpec of every met component."""
+        mask = self.mask
+        return [spec for i, spec in enumerate(self.model.component_specs) if mask >> i & 1]
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.mask == other.mask
+
+    def __hash__(self):
+        return hash((type(self), self.mask))
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(score={self.score}, "
+                f"risk_label={self.risk_label!r}, mask={self.mask:#x})")
+
+
+class ScoreModel:
+    """
+    Compiled form of one score's ``config`` tables.
+
+    Args:
+        config: a ``scores.<name>.config`` module defining VARIABLES,
+            COMPONENTS, SCORING and RISK_LEVELS.
+    """
+
+    def __init__(self, config):
+        self.variables = config.VARIABLES
+        self.components = config.COMPONENTS
+        self.scoring = config.SCORING
+        self.risk_levels = config.RISK_LEVELS
+
+        self.method = self.scoring["method"]
+        self.points_key = self.scoring["points_key"]
+        self.offset = self.scoring["offset"]
+        self.min_score = self.scoring["min_score"]
+        self.max_score = self.scoring["max_score"]
+        if self.method not in ("points", "log"):
+            raise ValueError(f"Unknown scoring method: {self.method!r}")
+        if self.risk_levels[-1]["max_score"] < self.max_score:
+            raise ValueError("RISK_LEVELS do not cover the full score range")
+
+        # (name, default, coerce) for every declared input
+        self.inputs = [
+            (var["name"], var["default"], _coercion(var)) for var in self.variables
+        ]
+        known = {var["name"] for var in self.variables}
+
+        # Distinct clauses, evaluated once per call and shared by components
+        self.clauses = []
+        index = {}
+        # (bit, match any, clause indexes) per component
+        self.predicates = []
+        contributions = []
+        variable_sets = []
+        for bit, comp in enumerate(self.components):
+            match_any = "when_any" in comp
+            clause_ids = []
+            names = set()
+            for clause in comp["when_any"] if match_any else comp["when"]:
+                name, op, value = clause
+                if op not in OPERATORS:
+                    raise ValueError(f"Unknown operator {op!r} in {comp['label']!r}")
+                if name not in known and name not in DERIVED:
+                    raise ValueError(f"Unknown variable {name!r} in {comp['label']!r}")
+                names.add(name)
+                key = (name, op, value)
+                if key not in index:
+                    index[key] = len(self.clauses)
+                    self.clauses.append(key)
+                clause_ids.append(index[key])
+            points = comp[self.points_key]
+            if self.method == "log":
+                contributions.append(math.log(1 + (points / 100)))
+            else:
+                contributions.append(points)
+            self.predicates.append((1 << bit, match_any, tuple(clause_ids)))
+            variable_sets.append(names)
+
+        # Band index per compared variable, and per band the components it
+        # meets on its own; components that need several variables at once
+        # are kept in ``joint`` as (bit, ((name, truth per band), ...))
+        by_variable = {}
+        for name, op, value in self.clauses:
+            by_variable.setdefault(name, []).append((op, value))
+        coercions = {name: coerce for name, _, coerce in self.inputs}
+        self.bands = {
+            name: BandIndex(name, ops, coercions.get(name, float) is not None)
+            for name, ops in by_variable.items()
+        }
+        tables = {name: [0] * len(index) for name, index in self.bands.items()}
+        self.joint = []
+        for bit, match_any, clause_ids in self.predicates:
+            truth = {}
+            for i in clause_ids:
+                name, op, value = self.clauses[i]
+                test = OPERATORS[op]
+                met = [test(rep, value) for rep in self.bands[name].values]
+                prev = truth.get(name)
+                if prev is not None:
+                    combine = operator.or_ if match_any else operator.and_
+                    met = [combine(a, b) for a, b in zip(prev, met)]
+                truth[name] = met
+            if match_any or len(truth) == 1:
+                for name, met in truth.items():
+                    for code, hit in enumerate(met):
+                        if hit:
+                            tables[name][code] |= bit
+            else:
+                self.joint.append((bit, tuple((n, tuple(m)) for n, m in truth.items())))
+        self.band_tables = [(name, tuple(table)) for name, table in tables.items()]
+
+        referenced = set().union(*variable_sets)
+        self.derived = [
+            (name,) + DERIVED[name] for name in DERIVED if name in referenced
+        ]
+
+        # Dependency graph: the inputs each component reads (a derived
+        # variable stands for its arguments), and per input the bitmask of
+        # the components that read it
+        order = [name for name, _, _ in self.inputs]
+        self.reads = tuple(
+            tuple(sorted(
+                {arg for name in names for arg in DERIVED.get(name, ((name,),))[0]},
+                key=order.index,
+            ))
+            for names in variable_sets
+        )
+        self.dependents = {name: 0 for name in order}
+        for bit, names in enumerate(self.reads):
+            for name in names:
+                self.dependents[name] |= 1 << bit
+
+        # Straight-line scalar evaluators generated from the tables above
+        self._parse = _compile_parse(self.inputs, self.derived)
+        self._mask = _compile_mask(self.clauses, self.predicates)
+        self._signature = _compile_signature(self.inputs, self.derived, self.bands)
+
+        # Static (unmet, met) breakdown entries, copied per call
+        self.templates = []
+        for comp, contribution in zip(self.components, contributions):
+            pair = []
+            for met in (False, True):
+                entry = {
+                    "label": comp["label"],
+                    "condition": comp["condition"],
+                    "met": met,
+                    self.points_key: comp[self.points_key],
+                    "value": comp[self.points_key] if met else 0,
+                }
+                if self.method == "log":
+                    entry["log_contribution"] = contribution if met else 0.0
+                pair.append(entry)
+            self.templates.append(tuple(pair))
+        self.component_specs = tuple(
+            ComponentSpec(comp["label"], comp["condition"], comp[self.points_key], contribution)
+            for comp, contribution in zip(self.components, contributions)
+        )
+
+        # Partial-sum lookup tables over contiguous runs of component bits
+        self.chunks = []
+        for start, width in _chunk_layout(variable_sets):
+            table = []
+            for sub in range(1 << width):
+                met = [contributions[start + j] for j in range(width) if sub >> j & 1]
+                table.append(sum(met))
+            self.chunks.append((start, (1 << width) - 1, table))
+
+        self.levels_by_score = [
+            next(lv for lv in self.risk_levels if score <= lv["max_score"])
+            for score in range(self.min_score, self.max_score + 1)
+        ]
+
+    # --- Single patient ---
+
+    def parse(self, inputs):
+        """Coerce raw inputs (filling defaults) and add derived variables."""
+        return self._parse(inputs)
+
+    def mask(self, values):
+        """Return the bitmask of met components (bit i = COMPONENTS[i])."""
+        return self._mask(values)
+
+    def resolve(self, mask):
+        """Return ``(raw, score)`` for a component bitmask via the lookup tables."""
+        raw = 0
+        for start, width, table in self.chunks:
+            raw += table[(mask >> start) & width]
+        raw = raw + self.offset
+        if self.method == "log":
+            score = max(self.min_score, min(self.max_score, round(raw)))
+        else:
+            score = max(self.min_score, min(self.max_score, raw))
+        return raw, score
+
+    def breakdown(self, mask):
+        """Materialize the per-component contribution dicts for a bitmask."""
+        return [dict(pair[(mask >> i) & 1]) for i, pair in enumerate(self.templates)]
+
+    def with_components(self, result, mask, explain=True):
+        """
+        Attach the component breakdown for ``mask`` to an engine result.
+
+        With ``explain=False`` the breakdown is deferred: the result is
+        returned as a LazyResult that builds it on first access.
+        """
+        if explain:
+            result["components"] = self.breakdown(mask)
+            return result
+        lazy = LazyResult(result)
+        lazy._model = self
+        lazy._mask = mask
+        return lazy
+
+    def risk_level(self, score):
+        """Return the RISK_LEVELS entry that ``score`` falls into."""
+        return self.levels_by_score[score - self.min_score]
+
+    def dependencies(self):
+        """Return the input variables each component reads, by component label."""
+        return {comp["label"]: reads for comp, reads in zip(self.components, self.reads)}
+
+    # --- Batch ---
+
+    def parse_batch(self, df):
+        """Column-wise equivalent of ``parse`` for a DataFrame."""
+        values = {}
+        for name, default, coerce in self.inputs:
+            values[name] = parse_column(df, name, default, coerce)
+        for name, args, derive in self.derived:
+            values[name] = derive(*(values[a] for a in args))
+        return values
+
+    def band_signature(self, inputs):
+        """
+        Return the band code of each compared variable for raw ``inputs``.
+
+        Inputs with the same signature meet the same components. Returns
+        None when a compared value is NaN, which no band represents.
+        """
+        try:
+            return self._signature(inputs)
+        except TypeError:
+            # An unhashable categorical value: no clause names it (band 0)
+            values = self.parse(inputs)
+            if any(values[name] != values[name] for name, index in self.bands.items()
+                   if index.numeric):
+                return None
+            return tuple(index.code(values[name]) for name, index in self.bands.items())
+
+    def band_codes(self, values):
+        """Column-wise ``band_signature``: a dict of band-code arrays by variable."""
+        return {name: index.codes(values[name]) for name, index in self.bands.items()}
+
+    def mask_from_codes(self, codes):
+        """Return the int64 component bitmasks for a dict of band-code arrays."""
+        import numpy as np
+
+        mask = None
+        for name, table in self.band_tables:
+            bits = np.take(np.asarray(table, dtype=np.int64), codes[name])
+            mask = bits if mask is None else mask | bits
+        for bit, parts in self.joint:
+            met = np.logical_and.reduce(
+                [np.take(table, codes[name]) for name, table in parts]
+            )
+            mask |= np.where(met, bit, 0).astype(np.int64)
+        return mask
+
+    def mask_batch(self, values, truth=None):
+        """
+        Column-wise equivalent of ``mask``; returns an int64 array.
+
+        Each compared variable is discretized to band codes with one
+        ``searchsorted`` and mapped to its components with one table lookup.
+
+        ``truth`` may supply precomputed boolean columns aligned with
+        ``self.clauses``, in which case ``values`` is not read.
+        """
+        import numpy as np
+
+        if truth is None:
+            columns = [values[name] for name in self.bands]
+            # NaN fails every comparison, which no band reproduces
+            if not any(
+                col.dtype.kind == "f" and np.isnan(col).any() for col in columns
+            ):
+                return self.mask_from_codes(self.band_codes(values))
+            truth = [
+                BATCH_OPERATORS[op](values[name], value)
+                for name, op, value in self.clauses
+            ]
+        mask = None
+        for bit, match_any, clause_ids in self.predicates:
+            reduce = np.logical_or if match_any else np.logical_and
+            met = reduce.reduce([truth[i] for i in clause_ids])
+            bits = np.where(met, bit, 0).astype(np.int64)
+            mask = bits if mask is None else mask | bits
+        return mask
+
+    def resolve_batch(self, mask):
+        """Column-wise equivalent of ``resolve``; returns ``(raw, score)`` arrays."""
+        import numpy as np
+
+        raw = np.zeros(len(mask), dtype=float if self.method == "log" else np.int64)
+        for start, width, table in self.chunks:
+            raw += np.asarray(table)[(mask >> start) & width]
+        raw = raw + self.offset
+        if self.method == "log":
+            score = np.clip(np.rint(raw), self.min_score, self.max_score).astype(np.int64)
+        else:
+            score = np.clip(raw, self.min_score, self.max_score)
+        return raw, score
+
+    def level_batch(self, score):
+        """Column-wise equivalent of ``risk_level``; returns RISK_LEVELS indexes."""
+        import numpy as np
+
+        return np.searchsorted([lv["max_score"] for lv in self.risk_levels], score)
+
+    def risk_column(self, level, key):
+        """Map an array of RISK_LEVELS indexes to the values of ``key``."""
+        import numpy as np
+
+        values = [lv[key] for lv in self.risk_levels]
+        dtype = object if isinstance(values[0], str) else None
+        return np.array(values, dtype=dtype)[level]
+
+
+class ScorePanel:
+    """
+    Several ScoreModels evaluated together in a single pass.
+
+    Inputs that the models declare identically (same name, default and
+    coercion) are parsed once, derived variables such as BMI are computed
+    once, and clauses shared by several models (``gcs <= 8``, ``rr > 20``)
+    are tested once.
+
+    Args:
+        models: sequence of ScoreModel instances.
+    """
+
+    def __init__(self, models):
+        self.models = list(models)
+
+        # Distinct inputs, derived variables and clauses across all models
+        self.inputs = []
+        self.derived = []
+        self.clauses = []
+        input_index = {}
+        derived_index = {}
+        clause_index = {}
+        # Per model: clause indexes into self.clauses, aligned with model.clauses
+        self.clause_maps = []
+        for model in self.models:
+            operands = {}
+            for spec in model.inputs:
+                if spec not in input_index:
+                    input_index[spec] = len(self.inputs)
+                    self.inputs.append(spec)
+                operands[spec[0]] = ("v", input_index[spec])
+            for name, args, derive in model.derived:
+                key = (name, tuple(operands[a] for a in args))
+                if key not in derived_index:
+                    derived_index[key] = len(self.derived)
+                    self.derived.append((key[1], derive))
+                operands[name] = ("d", derived_index[key])
+            clause_map = []
+            for name, op, value in model.clauses:
+                key = (operands[name], op, value)
+                if key not in clause_index:
+                    clause_index[key] = len(self.clauses)
+                    self.clauses.append(key)
+                clause_map.append(clause_index[key])
+            self.clause_maps.append(clause_map)
+
+        self._masks = self._compile()
+
+    def _compile(self):
+        """Generate a straight-line ``masks(inputs)`` for the whole panel."""
+        namespace = {}
+        lines = ["def masks(inputs):", "    get = inputs.get"]
+        for i, (name, default, coerce) in enumerate(self.inputs):
+            namespace[f"_default{i}"] = default
+            expr = f"get({name!r}, _default{i})"
+            if coerce is not None:
+                namespace[f"_coerce{i}"] = coerce
+                expr = f"_coerce{i}({expr})"
+            lines.append(f"    v{i} = {expr}")
+        for i, (args, derive) in enumerate(self.derived):
+            namespace[f"_derive{i}"] = derive
+            lines.append(f"    d{i} = _derive{i}({', '.join(f'{k}{j}' for k, j in args)})")
+        for i, ((kind, j), op, value) in enumerate(self.clauses):
+            lines.append(f"    c{i} = {kind}{j} {op} {_literal(value)}")
+        for m, (model, clause_map) in enumerate(zip(self.models, self.clause_maps)):
+            lines.append(f"    m{m} = 0")
+            for bit, match_any, clause_ids in model.predicates:
+                joiner = " or " if match_any else " and "
+                tests = joiner.join(f"c{clause_map[i]}" for i in clause_ids)
+                lines.append(f"    if {tests}:")
+                lines.append(f"        m{m} |= {bit}")
+        lines.append(f"    return ({''.join(f'm{m}, ' for m in range(len(self.models)))})")
+        return _compile("\n".join(lines), "masks", namespace)
+
+    def masks(self, inputs):
+        """Return one component bitmask per model for a single patient."""
+        return self._masks(inputs)
+
+    def masks_batch(self, df):
+        """Column-wise equivalent of ``masks``; returns one int64 array per model."""
+        columns = {
+            "v": [
+                parse_column(df, name, default, coerce)
+                for name, default, coerce in self.inputs
+            ],
+        }
+        columns["d"] = []
+        for args, derive in self.derived:
+            columns["d"].append(derive(*(columns[k][j] for k, j in args)))
+        truth = [
+            BATCH_OPERATORS[op](columns[kind][j], value)
+            for (kind, j), op, value in self.clauses
+        ]
+        return [
+            model.mask_batch(None, [truth[i] for i in clause_map])
+            for model, clause_map in zip(self.models, self.clause_maps)
+        ]
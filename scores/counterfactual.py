@@ -0,0 +1,619 @@
+"""
+Minimal-change counterfactuals: the cheapest changes to modifiable inputs
+that would move a patient down a risk level.
+
+A score is a sum of component contributions, and each component depends
+only on the bands its variables fall in, so the search runs over bands, not
+input values. The modifiable variables are grouped into independent units
+(variables that share a component, such as SBP and HR in RAMS's "SBP < 90
+or HR < 60", form one unit). Each unit lists the few band moves open to it,
+with the change in raw score and the cost of each. A branch-and-bound over
+the units then finds the cheapest combination that brings the score down to
+the target level. It prunes any branch whose best possible reduction falls
+short, or whose cost already exceeds the best combination found.
+
+The cost of a change is the number of inputs changed (weighted per input
+with ``costs``). Ties go to the change whose values move least, measured as
+a share of each variable's range; a categorical change counts as the whole
+range. Each new value is the one nearest the patient's own on the
+variable's ``step`` grid.
+
+Usage::
+
+    python -m scores.counterfactual rams cohort.csv --modifiable sbp o2_sat auto_transport
+    python -m scores.counterfactual ford cohort.parquet --modifiable sbp rr \\
+        --target Low-Moderate --cost sbp=2 --keep patient_id -o changes.csv
+
+Kept input columns come first in each output row, then the result columns.
+"""
+
+import argparse
+import bisect
+import functools
+import importlib
+import itertools
+import math
+import sys
+
+import numpy as np
+
+from scores import available_scores
+from scores.core import step_decimals, step_grid
+from scores.ingest import DEFAULT_CHUNKSIZE, read_inputs
+
+# Slack on the raw-score bound, for float sums taken in a different order
+EPS = 1e-9
+
+# Unit move tables kept per search before the memo is cleared
+MEMO_SIZE = 100_000
+
+FRAME_COLUMNS = [
+    "score", "risk_label", "target_label", "feasible", "n_changes", "changes",
+    "new_score", "new_risk_label", "cost",
+]
+
+
+def _format(value):
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+class CounterfactualSearch:
+    """
+    Counterfactual search for one score and set of modifiable inputs.
+
+    Args:
+        name: score package name (``ford``, ``rams``, ``prime_icu``).
+        modifiable: input variables the search may change.
+        costs: optional dict of the cost of changing each modifiable input
+            (default 1 each, so the cheapest change is the fewest inputs).
+    """
+
+    def __init__(self, name, modifiable, costs=None):
+        model = importlib.import_module(f"scores.{name}.prediction").MODEL
+        self.name = name
+        self.model = model
+        self.variables = {var["name"]: var for var in model.variables}
+        modifiable = list(dict.fromkeys(modifiable))
+        unknown = [v for v in modifiable if v not in self.variables]
+        if unknown:
+            raise ValueError(f"Unknown variable(s) for {name}: {', '.join(unknown)}")
+        costs = dict(costs or {})
+        extra = set(costs) - set(modifiable)
+        if extra:
+            raise ValueError(f"Costs given for inputs that are not modifiable: "
+                             f"{', '.join(sorted(extra))}")
+        if any(cost <= 0 for cost in costs.values()):
+            raise ValueError("Costs must be positive")
+        self.costs = {v: float(costs.get(v, 1)) for v in modifiable}
+        self._grids = {}
+
+        # Inputs behind each compared variable: itself, or a derived one's arguments
+        self.derived = {d: (args, derive) for d, args, derive in model.derived}
+        self.sources = {
+            v: self.derived[v][0] if v in self.derived else (v,) for v in model.bands
+        }
+        movable = [v for v in model.bands if any(a in self.costs for a in self.sources[v])]
+        self.key_inputs = [
+            name for name, _, _ in model.inputs
+            if any(name in self.sources[v] for v in movable)
+        ]
+
+        self.levels = [level["max_score"] for level in model.risk_levels]
+        self.contributions = [spec.contribution for spec in model.component_specs]
+        reads = [
+            {model.clauses[i][0] for i in clause_ids}
+            for _, _, clause_ids in model.predicates
+        ]
+
+        # Movable variables that share a component or an input form one unit
+        parent = {v: v for v in movable}
+
+        def find(v):
+            while parent[v] != v:
+                v = parent[v]
+            return v
+
+        links = [[v for v in names if v in parent] for names in reads]
+        for source in self.costs:
+            links.append([v for v in movable if source in self.sources[v]])
+        for names in links:
+            for other in names[1:]:
+                parent[find(other)] = find(names[0])
+        groups = {}
+        for v in movable:
+            groups.setdefault(find(v), []).append(v)
+        # Per unit: its variables, the bits of the components that read any
+        # of them, and what its moves depend on: the bands of every variable
+        # those components read, and the values of the unit's inputs
+        self.units = []
+        for names in groups.values():
+            bits = 0
+            context = set()
+            for bit, read in enumerate(reads):
+                if read.intersection(names):
+                    bits |= 1 << bit
+                    context |= read
+            inputs = dict.fromkeys(a for v in names for a in self.sources[v])
+            self.units.append((tuple(names), bits, tuple(sorted(context)), tuple(inputs)))
+        self._memo = {}
+
+    # --- Building blocks ---
+
+    def _mask(self, codes):
+        """Component bitmask for a band code per compared variable."""
+        mask = 0
+        for name, table in self.model.band_tables:
+            mask |= table[codes[name]]
+        for bit, parts in self.model.joint:
+            if all(table[codes[name]] for name, table in parts):
+                mask |= bit
+        return mask
+
+    def _contribution(self, mask):
+        total = 0
+        for bit, contribution in enumerate(self.contributions):
+            if mask >> bit & 1:
+                total += contribution
+        return total
+
+    def _nearest(self, var, x, low, high):
+        """Grid value of ``var`` in ``[low, high)`` nearest ``x``, if any."""
+        step = var.get("step", 1)
+        start = var["min"]
+        last = int(math.floor((var["max"] - start) / step + 1e-9))
+        decimals = step_decimals(step)
+
+        def at(k):
+            return round(start + k * step, decimals)
+
+        if x < low:
+            k = max(0, math.ceil((low - start) / step - 1e-9))
+            while k <= last and at(k) < low:
+                k += 1
+        else:
+            k = min(last, math.floor((high - start) / step + 1e-9))
+            while k >= 0 and at(k) >= high:
+                k -= 1
+        return at(k) if 0 <= k <= last else None
+
+    def _candidates(self, v, source, values):
+        """Yield ``(band, value, distance)`` for changes of ``source`` that move ``v``."""
+        index = self.model.bands[v]
+        var = self.variables[source]
+        x = values[source]
+        if var["type"] != "continuous":
+            options = var["options"]
+            for value in (options.values() if isinstance(options, dict) else options):
+                if value != x:
+                    yield self._band(v, source, value, values), value, 1.0
+            return
+
+        span = var["max"] - var["min"]
+        if v == source:
+            lows = (-math.inf,) + index.edges
+            highs = index.edges + (math.inf,)
+            for band, (low, high) in enumerate(zip(lows, highs)):
+                if low <= x < high:
+                    continue
+                value = self._nearest(var, x, low, high)
+                if value is not None and index.code(value) == band:
+                    yield band, value, abs(value - x) / span
+            return
+
+        # A derived variable has no thresholds on its input's scale; band
+        # the input's whole grid at once and keep the nearest value per band
+        grid = self._grid(source)
+        args, derive = self.derived[v]
+        codes = index.codes(derive(*(grid if a == source else values[a] for a in args)))
+        distance = np.abs(grid - x)
+        for band in np.unique(codes).tolist():
+            k = int(np.argmin(np.where(codes == band, distance, np.inf)))
+            yield band, grid[k].item(), distance[k].item() / span
+
+    def _grid(self, source):
+        grid = self._grids.get(source)
+        if grid is None:
+            var = self.variables[source]
+            grid = self._grids[source] = step_grid(var["min"], var["max"], var.get("step", 1))
+        return grid
+
+    def _band(self, v, source, value, values):
+        if v == source:
+            return self.model.bands[v].code(value)
+        args, derive = self.derived[v]
+        return self.model.bands[v].code(
+            derive(*(value if a == source else values[a] for a in args))
+        )
+
+    def _moves(self, v, code, values):
+        """Cheapest ``(weight, distance, changes)`` into each other band of ``v``."""
+        best = {}
+        for source in self.sources[v]:
+            weight = self.costs.get(source)
+            if weight is None:
+                continue
+            for band, value, distance in self._candidates(v, source, values):
+                if band == code:
+                    continue
+                move = (weight, distance, ((source, value),))
+                if band not in best or move[:2] < best[band][:2]:
+                    best[band] = move
+        return best
+
+    def _options(self, unit, codes, values, mask):
+        """
+        Useful moves for one unit, cheapest first.
+
+        Each is ``(weight, distance, delta, bits, changes)``: ``delta`` is
+        the change in raw score and ``bits`` the unit's components met
+        afterwards. Only moves that lower the score more than every cheaper
+        move are kept.
+        """
+        names, unit_bits, context, inputs = unit
+        key = (names, tuple(codes[v] for v in context), tuple(values[a] for a in inputs))
+        options = self._memo.get(key)
+        if options is not None:
+            return options
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+
+        current = self._contribution(mask & unit_bits)
+        choices = []
+        for v in names:
+            moves = self._moves(v, codes[v], values)
+            choices.append([None] + [(v, band, move) for band, move in moves.items()])
+
+        options = []
+        for combo in itertools.product(*choices):
+            picked = [c for c in combo if c is not None]
+            changes = {}
+            for _, _, (_, distance, pairs) in picked:
+                for source, value in pairs:
+                    changes.setdefault(source, []).append((value, distance))
+            # Two variables of a unit may not set one input to different values
+            if not picked or any(len({v for v, _ in c}) > 1 for c in changes.values()):
+                continue
+            new_codes = dict(codes)
+            for v, band, _ in picked:
+                new_codes[v] = band
+            bits = self._mask(new_codes) & unit_bits
+            delta = self._contribution(bits) - current
+            if delta >= 0:
+                continue
+            weight = sum(self.costs[source] for source in changes)
+            distance = sum(c[0][1] for c in changes.values())
+            options.append((weight, distance, delta, bits,
+                            {source: c[0][0] for source, c in changes.items()}))
+
+        options.sort(key=lambda option: option[:3])
+        frontier = []
+        for option in options:
+            if not frontier or option[2] < frontier[-1][2]:
+                frontier.append(option)
+        self._memo[key] = frontier
+        return frontier
+
+    # --- Search ---
+
+    def _search(self, codes, values, mask, target, missing=()):
+        """
+        Cheapest unit moves that bring the score to level ``target`` or below.
+
+        Units that read a variable in ``missing`` (NaN, so it fails every
+        comparison and has no band code) are left as they are.
+
+        Returns:
+            ``(weight, distance, new_mask, changes)``, or None when no
+            combination of the modifiable inputs gets there.
+        """
+        model = self.model
+        limit = self.levels[target]
+        goal = limit + 0.5 if model.method == "log" else limit
+        raw = model.resolve(mask)[0]
+
+        units = []
+        for unit in self.units:
+            if missing and missing.intersection(unit[0] + unit[2]):
+                continue
+            options = self._options(unit, codes, values, mask)
+            if options:
+                units.append((unit[1], options))
+        units.sort(key=lambda unit: unit[1][-1][2])
+        # Largest reduction still available from unit i onwards
+        reach = [0] * (len(units) + 1)
+        for i in range(len(units) - 1, -1, -1):
+            reach[i] = reach[i + 1] + units[i][1][-1][2]
+
+        best = None
+        chosen = []
+
+        def visit(i, weight, distance, delta):
+            nonlocal best
+            if best is not None and (weight, distance) >= best[:2]:
+                return
+            if raw + delta <= goal + EPS:
+                new_mask = mask
+                for unit_bits, option in chosen:
+                    new_mask = (new_mask & ~unit_bits) | option[3]
+                if model.resolve(new_mask)[1] <= limit:
+                    changes = {}
+                    for _, option in chosen:
+                        changes.update(option[4])
+                    best = (weight, distance, new_mask, changes)
+                    return
+            if i == len(units) or raw + delta + reach[i] > goal + EPS:
+                return
+            unit_bits, options = units[i]
+            for option in options:
+                cost = (weight + option[0], distance + option[1])
+                if best is not None and cost >= best[:2]:
+                    break
+                chosen.append((unit_bits, option))
+                visit(i + 1, cost[0], cost[1], delta + option[2])
+                chosen.pop()
+            visit(i + 1, weight, distance, delta)
+
+        visit(0, 0.0, 0.0, 0)
+        return best
+
+    def _target(self, level, target):
+        if target is None:
+            return max(level - 1, 0)
+        labels = [lv["label"] for lv in self.model.risk_levels]
+        if target not in labels:
+            raise ValueError(f"Unknown risk level {target!r}; expected one of "
+                             f"{', '.join(labels)}")
+        return labels.index(target)
+
+    def _label(self, source, value):
+        options = self.variables[source].get("options")
+        if isinstance(options, dict):
+            for label, mapped in options.items():
+                if mapped == value:
+                    return label
+        return value
+
+    def _result(self, mask, values, target, found):
+        model = self.model
+        score = model.resolve(mask)[1]
+        level = model.risk_level(score)
+        result = {
+            "score": score,
+            "risk_label": level["label"],
+            "target_label": model.risk_levels[target]["label"],
+            "feasible": found is not None,
+            "changes": [],
+            "new_score": None,
+            "new_risk_label": None,
+            "cost": None,
+            "components_off": [],
+            "components_on": [],
+        }
+        if found is None:
+            return result
+        weight, _, new_mask, changes = found
+        new_score = model.resolve(new_mask)[1]
+        order = list(self.variables)
+        result.update(
+            changes=[
+                {
+                    "variable": source,
+                    "from": self._label(source, values[source]),
+                    "to": self._label(source, value),
+                }
+                for source, value in sorted(changes.items(), key=lambda c: order.index(c[0]))
+            ],
+            new_score=new_score,
+            new_risk_label=model.risk_level(new_score)["label"],
+            cost=weight,
+            components_off=[
+                comp["label"] for bit, comp in enumerate(model.components)
+                if mask >> bit & 1 and not new_mask >> bit & 1
+            ],
+            components_on=[
+                comp["label"] for bit, comp in enumerate(model.components)
+                if new_mask >> bit & 1 and not mask >> bit & 1
+            ],
+        )
+        return result
+
+    def solve(self, inputs, target=None):
+        """
+        Find the cheapest change for one patient.
+
+        Args:
+            inputs: dict of raw inputs, as for compute_prediction.
+            target: risk level label to reach (default: the next level
+                down). A patient already at or below it needs no change.
+
+        Returns:
+            dict with the current ``score`` and ``risk_label``, the
+            ``target_label``, whether a change was ``feasible``, the
+            ``changes`` (dicts with ``variable``, ``from`` and ``to``; option
+            labels for mapped categoricals), the ``new_score`` and
+            ``new_risk_label``, its ``cost``, and the labels of the
+            components it turns off and on. A missing (NaN) compared
+            value meets none of its components; the search leaves the
+            components that read it as they are.
+        """
+        model = self.model
+        values = model.parse(inputs)
+        codes = {name: index.code(values[name]) for name, index in model.bands.items()}
+        missing = frozenset(name for name in model.bands if values[name] != values[name])
+        mask = model.mask(values)
+        level = bisect.bisect_left(self.levels, model.resolve(mask)[1])
+        target = self._target(level, target)
+        found = (0.0, 0.0, mask, {}) if level <= target else self._search(
+            codes, values, mask, target, missing)
+        return self._result(mask, values, target, found)
+
+    def solve_batch(self, df, target=None):
+        """
+        Column-wise ``solve`` over a DataFrame (or core.Columns) of inputs.
+
+        Rows are banded and scored in bulk. Only rows above their target
+        level are searched, and rows with the same bands and modifiable
+        values share one search. As in compute_batch, an empty (NaN) cell
+        is a missing input and takes its default.
+
+        Returns:
+            list of result dicts, one per row, as from ``solve``.
+        """
+        model = self.model
+        self._target(0, target)  # reject an unknown label before any work
+        values = model.parse_batch(df)
+        mask = model.mask_batch(values).tolist()
+        codes = {name: code.tolist() for name, code in model.band_codes(values).items()}
+        # Compared variables that are NaN, for the rows that have any
+        missing = {}
+        for name in model.bands:
+            column = values[name]
+            if column.dtype.kind == "f":
+                for i in np.flatnonzero(np.isnan(column)).tolist():
+                    missing[i] = missing.get(i, frozenset()) | {name}
+        keys = [values[name].tolist() for name in self.key_inputs]
+        bands = [codes[name] for name in model.bands]
+
+        results = []
+        cache = {}
+        for i, row_mask in enumerate(mask):
+            row_missing = missing.get(i, frozenset())
+            row_values = {name: column[i] for name, column in zip(self.key_inputs, keys)}
+            key = (tuple(column[i] for column in bands), tuple(row_values.values()), row_missing)
+            found = cache.get(key)
+            if found is None:
+                row_codes = {name: column[i] for name, column in zip(model.bands, bands)}
+                level = bisect.bisect_left(self.levels, model.resolve(row_mask)[1])
+                row_target = self._target(level, target)
+                found = cache[key] = (row_target, (0.0, 0.0, row_mask, {}) if level <= row_target
+                                      else self._search(row_codes, row_values, row_mask,
+                                                        row_target, row_missing))
+            results.append(self._result(row_mask, row_values, *found))
+        return results
+
+
+@functools.lru_cache(maxsize=32)
+def _searcher(name, modifiable, costs):
+    return CounterfactualSearch(name, modifiable, dict(costs))
+
+
+def searcher(name, modifiable, costs=None):
+    """Return a (cached) CounterfactualSearch for ``name`` and ``modifiable``."""
+    return _searcher(name, tuple(modifiable), tuple(sorted((costs or {}).items())))
+
+
+def counterfactual(name, inputs, modifiable, target=None, costs=None):
+    """
+    Cheapest change to ``modifiable`` inputs that lowers one patient's risk level.
+
+    See ``CounterfactualSearch.solve`` for the result.
+    """
+    return searcher(name, modifiable, costs).solve(inputs, target)
+
+
+def counterfactual_batch(name, df, modifiable, target=None, costs=None):
+    """
+    Counterfactuals for a cohort DataFrame, as a DataFrame aligned with it.
+
+    Columns: ``score``, ``risk_label``, ``target_label``, ``feasible``,
+    ``n_changes``, ``changes`` (``sbp: 85 -> 90; o2_sat: 90 -> 93``),
+    ``new_score``, ``new_risk_label`` and ``cost``.
+    """
+    results = searcher(name, modifiable, costs).solve_batch(df, target)
+    return frame_from_results(results, getattr(df, "index", None))
+
+
+def frame_from_results(results, index=None):
+    """Flatten ``solve_batch`` results into a DataFrame, one row per result."""
+    import pandas as pd
+
+    rows = []
+    for result in results:
+        feasible = result["feasible"]
+        rows.append({
+            "score": result["score"],
+            "risk_label": result["risk_label"],
+            "target_label": result["target_label"],
+            "feasible": feasible,
+            "n_changes": len(result["changes"]) if feasible else None,
+            "changes": "; ".join(
+                f"{c['variable']}: {_format(c['from'])} -> {_format(c['to'])}"
+                for c in result["changes"]
+            ),
+            "new_score": result["new_score"],
+            "new_risk_label": result["new_risk_label"],
+            "cost": result["cost"],
+        })
+    frame = pd.DataFrame(rows, columns=FRAME_COLUMNS, index=index)
+    return frame.astype({"score": "Int64", "n_changes": "Int64", "new_score": "Int64"})
+
+
+def _parse_cost(text):
+    name, sep, cost = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Expected VARIABLE=COST, got {text!r}")
+    return name, float(cost)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m scores.counterfactual",
+        description="Find the cheapest input changes that lower each patient's risk level.",
+    )
+    parser.add_argument("score", choices=available_scores(), help="score to compute")
+    parser.add_argument("input", help="input .csv/.parquet/.arrow path, or - for CSV on stdin")
+    parser.add_argument("--modifiable", nargs="+", required=True, metavar="VARIABLE",
+                        help="inputs the search may change")
+    parser.add_argument("--target", help="risk level to reach (default: the next one down)")
+    parser.add_argument("--cost", action="append", type=_parse_cost, default=[],
+                        metavar="VARIABLE=COST",
+                        help="cost of changing one input (repeatable; default: 1)")
+    parser.add_argument("-o", "--output", default="-", help="output CSV path (default: stdout)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f"rows read at a time (default: {DEFAULT_CHUNKSIZE})")
+    parser.add_argument("--keep", action="append", metavar="COLUMN",
+                        help="input column to carry through to the output (repeatable; "
+                        "default: all for CSV, none for Parquet/Arrow)")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"],
+                        help="input format (default: from the extension)")
+    return parser
+
+
+def main(argv=None):
+    import pandas as pd
+
+    args = build_parser().parse_args(argv)
+    config = importlib.import_module(f"scores.{args.score}.config")
+    try:
+        search = searcher(args.score, args.modifiable, dict(args.cost))
+        output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    rows = 0
+    try:
+        for kept, inputs in read_inputs(args.input, config.VARIABLES, keep=args.keep,
+                                        chunksize=args.chunksize, fmt=args.format):
+            frame = frame_from_results(search.solve_batch(inputs, args.target), kept.index)
+            clashes = [col for col in frame.columns if col in kept.columns]
+            if clashes:
+                raise ValueError(
+                    f"Input columns clash with result columns: {', '.join(clashes)}; "
+                    "use --keep to choose which input columns to carry through"
+                )
+            pd.concat([kept, frame], axis=1).to_csv(output, header=rows == 0, index=False)
+            rows += len(frame)
+    except BrokenPipeError:
+        return 0
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Searched {rows} rows with {args.score}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Asyncio micro-batching dispatcher for single-patient scoring requests.
+
+Concurrent ``await dispatcher.score(name, inputs)`` calls for the same score
+are queued and flushed together, either when ``max_batch_size`` requests are
+waiting or ``max_wait`` seconds after the first one arrived. Each flush is a
+single event-loop callback that scores the whole batch and resolves every
+caller's future with its own result (or its own exception), so callers keep
+per-request semantics while the loop wakes once per batch instead of once
+per request.
+
+Usage::
+
+    dispatcher = ScoreDispatcher(max_batch_size=64, max_wait=0.002)
+    result = await dispatcher.score("rams", {"age": 70, "gcs": 5})
+    dispatcher.stats()
+"""
+
+import asyncio
+import collections
+import importlib
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT = 0.002
+
+
+def score_rows(engine, rows, explain=False):
+    """
+    Score a list of input dicts with one engine.
+
+    Returns a list aligned with ``rows`` holding each result, or the
+    exception raised while scoring that row.
+    """
+    model = engine.MODEL
+    parse, mask, result_from_mask = model.parse, model.mask, engine.result_from_mask
+    out = []
+    for inputs in rows:
+        try:
+            out.append(result_from_mask(mask(parse(inputs)), explain))
+        except Exception as exc:
+            out.append(exc)
+    return out
+
+
+class _Queue:
+    """Pending requests for one (score, explain) pair."""
+
+    __slots__ = ("rows", "futures", "timer")
+
+    def __init__(self):
+        self.rows = []
+        self.futures = []
+        self.timer = None
+
+
+class ScoreDispatcher:
+    """
+    Collect concurrent requests into micro-batches per score.
+
+    Args:
+        max_batch_size: flush as soon as this many requests are queued.
+        max_wait: seconds the first queued request may wait for company.
+        loader: callable mapping a score name to its prediction module
+            (default: import ``scores.<name>.prediction``).
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT,
+                 loader=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait must not be negative")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._loader = loader or (lambda name: importlib.import_module(f"scores.{name}.prediction"))
+        self._engines = {}
+        self._queues = {}
+        self._batch_sizes = collections.Counter()
+        self._queue_depths = collections.Counter()
+        self._requests = 0
+
+    def _engine(self, name):
+        engine = self._engines.get(name)
+        if engine is None:
+            engine = self._engines[name] = self._loader(name)
+        return engine
+
+    def score(self, name, inputs, explain=False):
+        """
+        Queue one patient's inputs; return an awaitable for its result.
+
+        The result is exactly what ``compute_prediction(inputs, explain)``
+        returns for that score, and errors are raised to this caller only.
+        Unknown score names raise immediately.
+        """
+        engine = self._engine(name)
+        loop = asyncio.get_running_loop()
+        key = (name, explain)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = _Queue()
+
+        future = loop.create_future()
+        queue.rows.append(inputs)
+        queue.futures.append(future)
+        self._requests += 1
+        self._queue_depths[len(queue.rows)] += 1
+
+        if len(queue.rows) >= self.max_batch_size:
+            self._flush(engine, key, queue)
+        elif queue.timer is None:
+            queue.timer = loop.call_later(self.max_wait, self._flush, engine, key, queue)
+        return future
+
+    def _flush(self, engine, key, queue):
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+        rows, futures = queue.rows, queue.futures
+        queue.rows, queue.futures = [], []
+        if not rows:
+            return
+        self._batch_sizes[len(rows)] += 1
+
+        for future, result in zip(futures, score_rows(engine, rows, key[1])):
+            if future.done():  # cancelled by its caller
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def flush(self):
+        """Score everything queued now instead of waiting for ``max_wait``."""
+        for key, queue in list(self._queues.items()):
+            self._flush(self._engine(key[0]), key, queue)
+
+    def stats(self):
+        """
+        Return dispatcher counters.
+
+        ``batch_size`` and ``queue_depth`` are histograms as ``{value: count}``
+        dicts: the size of each flushed batch, and the queue length seen by
+        each request as it was enqueued.
+        """
+        batches = sum(self._batch_sizes.values())
+        return {
+            "requests": self._requests,
+            "batches": batches,
+            "mean_batch_size": self._requests / batches if batches else 0.0,
+            "pending": sum(len(queue.rows) for queue in self._queues.values()),
+            "batch_size": dict(sorted(self._batch_sizes.items())),
+            "queue_depth": dict(sorted(self._queue_depths.items())),
+        }
+
+    def reset_stats(self):
+        """Clear the counters and histograms."""
+        self._batch_sizes.clear()
+        self._queue_depths.clear()
+        self._requests = 0
@@ -42,6 +42,7 @@ VARIABLES = [
         "label": "Sex",
         "type": "categorical",
         "options": ["Male", "Female"],
+        "default": "Male",
         "group": "Patient Demographics",
     },
     {
@@ -111,6 +112,7 @@ VARIABLES = [
         "label": "Fracture Site",
         "type": "categorical",
         "options": ["Other", "Hip/Femur", "Axial (Spine/Rib/Pelvis)", "Both"],
+        "default": "Other",
         "group": "Injury Characteristics",
     },
     {
@@ -118,6 +120,7 @@ VARIABLES = [
         "label": "Mechanism of Injury",
         "type": "categorical",
         "options": ["Fall", "MVC", "Assault", "Other"],
+        "default": "Fall",
         "group": "Injury Characteristics",
     },
     # --- Prehospital & Insurance ---
@@ -126,6 +129,7 @@ VARIABLES = [
         "label": "Transport Mode",
         "type": "categorical",
         "options": ["Ambulance/Air", "Private Vehicle", "Walk-in", "Other"],
+        "default": "Ambulance/Air",
         "group": "Prehospital & Insurance",
     },
     {
@@ -133,10 +137,140 @@ VARIABLES = [
         "label": "Insurance",
         "type": "categorical",
         "options": ["Self-pay", "Medicare", "Medicaid", "Private", "Charity", "Other"],
+        "default": "Self-pay",
         "group": "Prehospital & Insurance",
     },
 ]
 
+# Each component is met when all of its "when" clauses hold (or any of its
+# "when_any" clauses). Clauses are (variable, operator, value); "bmi" is
+# derived from height_in and weight_lb.
+COMPONENTS = [
+    {
+        "label": "GCS Severe (\u2264 8)",
+        "condition": "GCS \u2264 8",
+        "when": [("gcs", "<=", 8)],
+        "points": 6,
+    },
+    {
+        "label": "Hip/Femur Fracture",
+        "condition": "Fracture site is Hip/Femur or Both",
+        "when": [("fracture_site", "in", ("Hip/Femur", "Both"))],
+        "points": 5,
+    },
+    {
+        "label": "Resp Rate Low (< 12)",
+        "condition": "RR < 12",
+        "when": [("rr", "<", 12)],
+        "points": 5,
+    },
+    {
+        "label": "Insurance: Medicare",
+        "condition": "Insurance = Medicare",
+        "when": [("insurance", "==", "Medicare")],
+        "points": 4,
+    },
+    {
+        "label": "SBP Hypotensive (< 90)",
+        "condition": "SBP < 90",
+        "when": [("sbp", "<", 90)],
+        "points": 4,
+    },
+    {
+        "label": "Insurance: Other",
+        "condition": "Insurance = Other",
+        "when": [("insurance", "==", "Other")],
+        "points": 4,
+    },
+    {
+        "label": "Age \u2265 75",
+        "condition": "Age \u2265 75",
+        "when": [("age", ">=", 75)],
+        "points": 3,
+    },
+    {
+        "label": "Axial Fracture (Spine/Rib/Pelvis)",
+        "condition": "Fracture site is Axial or Both",
+        "when": [("fracture_site", "in", ("Axial (Spine/Rib/Pelvis)", "Both"))],
+        "points": 3,
+    },
+    {
+        "label": "Insurance: Private",
+        "condition": "Insurance = Private",
+        "when": [("insurance", "==", "Private")],
+        "points": 3,
+    },
+    {
+        "label": "Insurance: Charity",
+        "condition": "Insurance = Charity",
+        "when": [("insurance", "==", "Charity")],
+        "points": 3,
+    },
+    {
+        "label": "GCS Moderate (9-12)",
+        "condition": "9 \u2264 GCS \u2264 12",
+        "when": [("gcs", ">=", 9), ("gcs", "<=", 12)],
+        "points": 3,
+    },
+    {
+        "label": "BMI \u2265 40 (Class III Obesity)",
+        "condition": "BMI \u2265 40",
+        "when": [("bmi", ">=", 40)],
+        "points": 2,
+    },
+    {
+        "label": "Age 65-74",
+        "condition": "65 \u2264 Age \u2264 74",
+        "when": [("age", ">=", 65), ("age", "<=", 74)],
+        "points": 1,
+    },
+    {
+        "label": "Female",
+        "condition": "Sex = Female",
+        "when": [("sex", "==", "Female")],
+        "points": 1,
+    },
+    {
+        "label": "Resp Rate High (> 20)",
+        "condition": "RR > 20",
+        "when": [("rr", ">", 20)],
+        "points": 1,
+    },
+    {
+        "label": "Heart Rate Tachycardic (\u2265 100)",
+        "condition": "HR \u2265 100",
+        "when": [("hr", ">=", 100)],
+        "points": 1,
+    },
+    {
+        "label": "Transport: Private Vehicle",
+        "condition": "Transport = Private Vehicle",
+        "when": [("transport", "==", "Private Vehicle")],
+        "points": -2,
+    },
+    {
+        "label": "Mechanism: Assault",
+        "condition": "Mechanism = Assault",
+        "when": [("mechanism", "==", "Assault")],
+        "points": -3,
+    },
+    {
+        "label": "Transport: Walk-in",
+        "condition": "Transport = Walk-in",
+        "when": [("transport", "==", "Walk-in")],
+        "points": -4,
+    },
+]
+
+# Score = sum of met points + offset, clipped to [min_score, max_score].
+SCORING = {
+    "method": "points",
+    "points_key": "points",
+    "offset": 0,
+    "min_score": 0,
+    "max_score": 10,
+}
+
 SCORE_META = {
     "name": "FORD Score",
     "tagline": "Fracture Orthopedic Risk of Discharge",
@@ -2,15 +2,29 @@
 FORD Score prediction engine.
 """
 
-from scores.ford.config import RISK_LEVELS, SCORE_RATES
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
 
-def compute_prediction(inputs: dict) -> dict:
+from scores.core import CompactResult, ScoreModel
+from scores.ford import config
+from scores.ford.config import SCORE_RATES
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+MODEL = ScoreModel(config)
+
+
+def compute_prediction(inputs: dict, explain: bool = True) -> dict:
     """
     Compute the FORD score (0-10 scale) from raw input values.
 
     Args:
         inputs: dict mapping variable name to its raw value.
+        explain: when False, skip building the component breakdown; it is
+            built on first ``result["components"]`` access instead.
 
     Returns:
         dict with keys:
@@ -22,161 +36,107 @@ def compute_prediction(inputs: dict) -> dict:
             - risk_nonhome_pct: group-level non-home discharge %
             - components: list of per-component contribution dicts
     """
-    age = float(inputs.get("age", 50))
-    sex = inputs.get("sex", "Male")
-    gcs = float(inputs.get("gcs", 15))
-    sbp = float(inputs.get("sbp", 120))
-    hr = float(inputs.get("hr", 75))
-    rr = float(inputs.get("rr", 16))
-    height_in = float(inputs.get("height_in", 68))
-    weight_lb = float(inputs.get("weight_lb", 170))
-    bmi = (weight_lb / (height_in ** 2)) * 703
-    fracture_site = inputs.get("fracture_site", "Other")
-    mechanism = inputs.get("mechanism", "Fall")
-    transport = inputs.get("transport", "Ambulance/Air")
-    insurance = inputs.get("insurance", "Self-pay")
-
-    components = [
-        {
-            "label": "GCS Severe (\u2264 8)",
-            "condition": "GCS \u2264 8",
-            "met": gcs <= 8,
-            "points": 6,
-        },
-        {
-            "label": "Hip/Femur Fracture",
-            "condition": "Fracture site is Hip/Femur or Both",
-            "met": fracture_site in ("Hip/Femur", "Both"),
-            "points": 5,
-        },
-        {
-            "label": "Resp Rate Low (< 12)",
-            "condition": "RR < 12",
-            "met": rr < 12,
-            "points": 5,
-        },
-        {
-            "label": "Insurance: Medicare",
-            "condition": "Insurance = Medicare",
-            "met": insurance == "Medicare",
-            "points": 4,
-        },
-        {
-            "label": "SBP Hypotensive (< 90)",
-            "condition": "SBP < 90",
-            "met": sbp < 90,
-            "points": 4,
-        },
-        {
-            "label": "Insurance: Other",
-            "condition": "Insurance = Other",
-            "met": insurance == "Other",
-            "points": 4,
-        },
-        {
-            "label": "Age \u2265 75",
-            "condition": "Age \u2265 75",
-            "met": age >= 75,
-            "points": 3,
-        },
-        {
-            "label": "Axial Fracture (Spine/Rib/Pelvis)",
-            "condition": "Fracture site is Axial or Both",
-            "met": fracture_site in ("Axial (Spine/Rib/Pelvis)", "Both"),
-            "points": 3,
-        },
-        {
-            "label": "Insurance: Private",
-            "condition": "Insurance = Private",
-            "met": insurance == "Private",
-            "points": 3,
-        },
-        {
-            "label": "Insurance: Charity",
-            "condition": "Insurance = Charity",
-            "met": insurance == "Charity",
-            "points": 3,
-        },
-        {
-            "label": "GCS Moderate (9-12)",
-            "condition": "9 \u2264 GCS \u2264 12",
-            "met": 9 <= gcs <= 12,
-            "points": 3,
-        },
-        {
-            "label": "BMI \u2265 40 (Class III Obesity)",
-            "condition": "BMI \u2265 40",
-            "met": bmi >= 40,
-            "points": 2,
-        },
-        {
-            "label": "Age 65-74",
-            "condition": "65 \u2264 Age \u2264 74",
-            "met": 65 <= age <= 74,
-            "points": 1,
-        },
-        {
-            "label": "Female",
-            "condition": "Sex = Female",
-            "met": sex == "Female",
-            "points": 1,
-        },
-        {
-            "label": "Resp Rate High (> 20)",
-            "condition": "RR > 20",
-            "met": rr > 20,
-            "points": 1,
-        },
-        {
-            "label": "Heart Rate Tachycardic (\u2265 100)",
-            "condition": "HR \u2265 100",
-            "met": hr >= 100,
-            "points": 1,
-        },
-        {
-            "label": "Transport: Private Vehicle",
-            "condition": "Transport = Private Vehicle",
-            "met": transport == "Private Vehicle",
-            "points": -2,
-        },
-        {
-            "label": "Mechanism: Assault",
-            "condition": "Mechanism = Assault",
-            "met": mechanism == "Assault",
-            "points": -3,
-        },
+    return result_from_mask(MODEL.mask(MODEL.parse(inputs)), explain)
+
+
+def result_from_mask(mask: int, explain: bool = True) -> dict:
+    """Build the compute_prediction result for a bitmask of met components."""
+    raw_score, score = MODEL.resolve(mask)
+    level = MODEL.risk_level(score)
+
+    result = {
+        "score": score,
+        "raw_score": raw_score,
+        "nonhome_pct": SCORE_RATES.get(score, 0.0),
+        "risk_label": level["label"],
+        "risk_color": level["color"],
+        "risk_nonhome_pct": level["nonhome_rate"],
+    }
+    return MODEL.with_components(result, mask, explain)
+
+
+def compute_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute FORD scores for every row of a DataFrame.
+
+    Each compared variable is cut into threshold bands with one vectorized
+    search, and the band codes are mapped to component bitmasks by table
+    lookup; the score is then summed from per-chunk partial-sum tables over
+    the mask, the same tables compute_prediction resolves through, so the
+    results match the scalar path exactly. Missing columns and empty cells
+    fall back to the same defaults as compute_prediction.
+
+    Args:
+        df: DataFrame (or core.Columns) with one column per variable name.
+
+    Returns:
+        DataFrame indexed like ``df`` with the scalar result keys as columns
+        (score, raw_score, nonhome_pct, risk_label, risk_color,
+        risk_nonhome_pct); the per-component breakdown is omitted.
+    """
+    return frame_from_mask(MODEL.mask_batch(MODEL.parse_batch(df)), df.index)
+
+
+def frame_from_mask(mask: np.ndarray, index=None) -> pd.DataFrame:
+    """Build the compute_batch result for an array of component bitmasks."""
+    import numpy as np
+    import pandas as pd
+
+    raw_score, score = MODEL.resolve_batch(mask)
+    level = MODEL.level_batch(score)
+    rates = np.array([SCORE_RATES.get(s, 0.0) for s in range(MODEL.max_score + 1)])
+
+    return pd.DataFrame(
         {
-            "label": "Transport: Walk-in",
-            "condition": "Transport = Walk-in",
-            "met": transport == "Walk-in",
-            "points": -4,
+            "score": score,
+            "raw_score": raw_score,
+            "nonhome_pct": rates[score],
+            "risk_label": MODEL.risk_column(level, "label"),
+            "risk_color": MODEL.risk_column(level, "color"),
+            "risk_nonhome_pct": MODEL.risk_column(level, "nonhome_rate"),
         },
-    ]
+        index=index,
+    )
 
-    for comp in components:
-        comp["value"] = comp["points"] if comp["met"] else 0
 
-    raw_score = sum(c["value"] for c in components)
-    score = max(0, min(10, raw_score))
+class FordResult(CompactResult):
+    """
+    Compact FORD result: the component bitmask and score, in two slots.
 
-    nonhome_pct = SCORE_RATES.get(score, 0.0)
+    ``to_dict()`` returns the same dict as compute_prediction.
+    """
 
-    risk_label = ""
-    risk_color = "green"
-    risk_nonhome_pct = 0.0
-    for level in RISK_LEVELS:
-        if score <= level["max_score"]:
-            risk_label = level["label"]
-            risk_color = level["color"]
-            risk_nonhome_pct = level["nonhome_rate"]
-            break
+    __slots__ = ()
+
+    model = MODEL
+
+    def to_dict(self, explain=True):
+        return result_from_mask(self.mask, explain)
+
+    @property
+    def nonhome_pct(self):
+        """Per-score non-home discharge %."""
+        return SCORE_RATES.get(self.score, 0.0)
+
+    @property
+    def risk_nonhome_pct(self):
+        """Group-level non-home discharge %."""
+        return self.level["nonhome_rate"]
+
+
+# The compact result type of this engine
+COMPACT_RESULT = FordResult
+
+
+def compute_compact(inputs: dict) -> FordResult:
+    """Compute the FORD score as a compact FordResult (see core.CompactResult)."""
+    mask = MODEL.mask(MODEL.parse(inputs))
+    return FordResult(mask, MODEL.resolve(mask)[1])
+
+
+def compact_batch(df: pd.DataFrame) -> list[FordResult]:
+    """Compute a FordResult for every row of a DataFrame, in row order."""
+    mask = MODEL.mask_batch(MODEL.parse_batch(df))
+    _, score = MODEL.resolve_batch(mask)
+    return list(map(FordResult, mask.tolist(), score.tolist()))
 
-    return {
-        "score": score,
-        "raw_score": raw_score,
-        "nonhome_pct": nonhome_pct,
-        "risk_label": risk_label,
-        "risk_color": risk_color,
-        "risk_nonhome_pct": risk_nonhome_pct,
-        "components": components,
-    }
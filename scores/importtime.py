@@ -0,0 +1,126 @@
+"""
+Cold-start import report for the score modules.
+
+Imports each module in a fresh interpreter under ``python -X importtime``
+and reports the cumulative import time, plus any third-party packages the
+import pulled in, so that a heavy dependency creeping back into the engine
+import path shows up immediately.
+
+Usage::
+
+    python -m scores.importtime
+    python -m scores.importtime --repeat 5 --budget-ms 50
+    python -m scores.importtime scores.rams.prediction --json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from scores import available_scores
+
+# Run in the child: report the top-level packages the import left behind
+_PROBE = (
+    "import sys; before = set(sys.modules); import {module}; "
+    "print(' '.join(sorted({{m.partition('.')[0] for m in set(sys.modules) - before}})))"
+)
+
+
+def default_modules():
+    """Return the modules a headless scoring process imports, config first."""
+    modules = ["scores.core"]
+    for name in available_scores():
+        modules += [f"scores.{name}.config", f"scores.{name}.prediction"]
+    return modules + ["scores.registry", "scores.panel"]
+
+
+def measure(module, python=None):
+    """
+    Import ``module`` once in a fresh interpreter.
+
+    Returns:
+        dict with ``module``, ``ms`` (cumulative import time of ``module``
+        as reported by ``-X importtime``) and ``third_party`` (sorted
+        top-level non-stdlib packages newly imported, ``scores`` excluded).
+    """
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr.strip()}")
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    micros = 0
+    for line in proc.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            micros = int(fields[1])
+    packages = proc.stdout.split()
+    third_party = sorted(
+        pkg for pkg in packages
+        if pkg not in sys.stdlib_module_names and pkg not in ("scores", "__future__")
+        and not pkg.startswith("_")
+    )
+    return {"module": module, "ms": micros / 1000, "third_party": third_party}
+
+
+def report(modules=None, repeat=3, python=None):
+    """Measure each module ``repeat`` times and keep its fastest run."""
+    results = []
+    for module in modules or default_modules():
+        runs = [measure(module, python) for _ in range(max(1, repeat))]
+        results.append(min(runs, key=lambda run: run["ms"]))
+    return results
+
+
+def format_report(results, budget_ms=None):
+    """Render ``report`` results as a fixed-width table."""
+    width = max([len("module")] + [len(r["module"]) for r in results])
+    lines = [f"{'module':<{width}}  {'cold ms':>8}  third-party imports"]
+    for r in results:
+        flag = " !" if budget_ms is not None and r["ms"] > budget_ms else ""
+        extra = ", ".join(r["third_party"]) or "-"
+        lines.append(f"{r['module']:<{width}}  {r['ms']:>8.1f}  {extra}{flag}")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m scores.importtime",
+        description="Report cold import time of the score modules.",
+    )
+    parser.add_argument(
+        "modules", nargs="*",
+        help="modules to measure (default: scores.core, every score's config "
+             "and prediction, scores.registry and scores.panel)",
+    )
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="fresh interpreters per module; the fastest is kept (default: 3)")
+    parser.add_argument("--budget-ms", type=float,
+                        help="exit with status 1 if any module takes longer than this")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        results = report(args.modules, args.repeat)
+    except RuntimeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_report(results, args.budget_ms))
+    if args.budget_ms is not None and any(r["ms"] > args.budget_ms for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
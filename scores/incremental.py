@@ -0,0 +1,215 @@
+"""
+Incremental re-scoring of one patient as individual inputs change.
+
+An IncrementalScorer keeps a patient's parsed values, the band code of
+each compared variable, the component bitmask and the partial sum of each
+lookup chunk. An update re-parses only the changed inputs (and the derived
+variables they feed), and when a band code moves re-evaluates only the
+components that read it, from the band tables of the variables those
+components compare, then refreshes only the chunks holding those bits.
+An update that leaves every band code in place costs a few dict lookups.
+
+Results are identical to a full recompute: values are coerced exactly as
+``ScoreModel.parse`` coerces them, and the partial sums are added in chunk
+order, as ``ScoreModel.resolve`` adds them.
+
+Usage::
+
+    scorer = IncrementalScorer("prime_icu", admission_inputs)
+    result = scorer.update(hr=128)          # a PrimeIcuResult
+    result.score, result.risk_label, result.to_dict()
+"""
+
+import functools
+import importlib
+
+
+class _Plan:
+    """Per-score lookups an IncrementalScorer needs, built once per model."""
+
+    def __init__(self, engine):
+        model = engine.MODEL
+        self.model = model
+        self.result_type = engine.COMPACT_RESULT
+        self.chunks = model.chunks
+        self.bands = model.bands
+
+        derived = {name: (args, derive) for name, args, derive in model.derived}
+        # Per input: its coercion and the compared variables it moves, each
+        # as (name, band coder, derived arguments and function or None)
+        self.inputs = {}
+        for name, _, coerce in model.inputs:
+            compared = [(name, model.bands[name].code, None)] if name in model.bands else []
+            compared += [
+                (d, model.bands[d].code, spec) for d, spec in derived.items() if name in spec[0]
+            ]
+            self.inputs[name] = (coerce, tuple(compared))
+
+        # Per input: the components reading it (the model's dependency
+        # graph), the band tables and joint components that decide them, and
+        # the chunks they sit in
+        self.affects = {
+            name: self._dependents(bits) for name, bits in model.dependents.items()
+        }
+
+    def _dependents(self, bits):
+        model = self.model
+        tables = tuple(
+            (name, table) for name, table in model.band_tables
+            if any(entry & bits for entry in table)
+        )
+        joint = tuple((bit, parts) for bit, parts in model.joint if bit & bits)
+        chunks = tuple(
+            i for i, (start, width, _) in enumerate(model.chunks) if (width << start) & bits
+        )
+        return bits, tables, joint, chunks
+
+    @functools.lru_cache(maxsize=256)
+    def combined(self, names):
+        """``affects`` for several inputs that moved together."""
+        bits = 0
+        for name in names:
+            bits |= self.affects[name][0]
+        return self._dependents(bits)
+
+
+@functools.lru_cache(maxsize=None)
+def _plan(name):
+    return _Plan(importlib.import_module(f"scores.{name}.prediction"))
+
+
+class IncrementalScorer:
+    """
+    Stateful scorer for one patient, updated one or a few inputs at a time.
+
+    Args:
+        name: score package name (``ford``, ``rams``, ``prime_icu``).
+        inputs: the patient's initial inputs (as for compute_prediction);
+            missing inputs take their defaults.
+    """
+
+    __slots__ = ("name", "inputs", "values", "codes", "mask", "partials", "raw", "score",
+                 "_plan", "_nan")
+
+    def __init__(self, name, inputs=None):
+        self.name = name
+        self._plan = _plan(name)
+        self.inputs = dict(inputs or {})
+        self.values = self._plan.model.parse(self.inputs)
+        self._recompute()
+
+    def _recompute(self):
+        """Full evaluation of the current values (also used while any is NaN)."""
+        plan = self._plan
+        values = self.values
+        # NaN fails every comparison, which no band reproduces: such
+        # variables get no code, so any real value later counts as a move
+        self._nan = {name for name in plan.bands if values[name] != values[name]}
+        self.codes = {
+            name: None if name in self._nan else index.code(values[name])
+            for name, index in plan.bands.items()
+        }
+        self.mask = mask = plan.model.mask(values)
+        self.partials = [table[(mask >> start) & width] for start, width, table in plan.chunks]
+        self._total()
+
+    def _total(self):
+        model = self._plan.model
+        raw = 0
+        for partial in self.partials:
+            raw += partial
+        self.raw = raw = raw + model.offset
+        if model.method == "log":
+            self.score = max(model.min_score, min(model.max_score, round(raw)))
+        else:
+            self.score = max(model.min_score, min(model.max_score, raw))
+
+    def update(self, changes=None, **more):
+        """
+        Apply changed inputs and return the new result.
+
+        Args:
+            changes: dict mapping variable name to its new raw value;
+                keyword arguments are merged in.
+
+        Returns:
+            the engine's CompactResult subclass (``to_dict()`` gives the
+            compute_prediction dict).
+
+        Raises:
+            ValueError: for a variable the score does not declare.
+        """
+        if more:
+            changes = dict(changes, **more) if changes else more
+        elif not changes:
+            return self.result
+        plan = self._plan
+        # Coerce everything first, so a bad value leaves the state untouched
+        parsed = []
+        for name, value in changes.items():
+            spec = plan.inputs.get(name)
+            if spec is None:
+                raise ValueError(f"Unknown variable {name!r} for {self.name!r}")
+            coerce, compared = spec
+            parsed.append((name, value if coerce is None else coerce(value), compared))
+        self.inputs.update(changes)
+
+        values = self.values
+        codes = self.codes
+        nan = self._nan
+        moved = []
+        for name, value, _ in parsed:
+            values[name] = value
+        for moving, _, compared in parsed:
+            for name, code, derived in compared:
+                if derived is not None:
+                    args, derive = derived
+                    values[name] = derive(*[values[a] for a in args])
+                value = values[name]
+                if value != value:
+                    nan.add(name)
+                    continue
+                new = code(value)
+                if new != codes[name]:
+                    codes[name] = new
+                    moved.append(moving)
+                nan.discard(name)
+        if nan:
+            self._recompute()
+        elif moved:
+            self._apply(moved)
+        return self._plan.result_type(self.mask, self.score)
+
+    def _apply(self, moved):
+        plan = self._plan
+        if len(moved) == 1:
+            bits, tables, joint, chunks = plan.affects[moved[0]]
+        else:
+            bits, tables, joint, chunks = plan.combined(tuple(sorted(set(moved))))
+        codes = self.codes
+        met = 0
+        for name, table in tables:
+            met |= table[codes[name]]
+        for bit, parts in joint:
+            if all(table[codes[name]] for name, table in parts):
+                met |= bit
+        mask = (self.mask & ~bits) | (met & bits)
+        if mask == self.mask:
+            return
+        self.mask = mask
+        for i in chunks:
+            start, width, table = plan.chunks[i]
+            self.partials[i] = table[(mask >> start) & width]
+        self._total()
+
+    @property
+    def result(self):
+        """The current result as the engine's CompactResult subclass."""
+        return self._plan.result_type(self.mask, self.score)
+
+    def to_dict(self, explain=True):
+        """The current result as the compute_prediction dict."""
+        return self.result.to_dict(explain)
+
+    def __repr__(self):
+        return f"IncrementalScorer({self.name!r}, score={self.score!r})"
@@ -0,0 +1,231 @@
+"""
+Chunked input readers for headless batch scoring.
+
+CSV is read with pandas in fixed-size chunks. Parquet and Arrow IPC are read
+with pyarrow, memory-mapped, projected down to the columns a score declares
+in its VARIABLES, and handed to the engines as core.Columns record batches
+without building a pandas frame.
+"""
+
+import os
+
+import pandas as pd
+
+from scores.core import Columns
+
+DEFAULT_CHUNKSIZE = 100_000
+
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".arrows": "arrow",
+}
+
+
+def _normalize(text):
+    """Lower-case ``text`` and drop everything but letters and digits."""
+    return "".join(ch for ch in str(text).lower() if ch.isalnum())
+
+
+def map_columns(columns, variables, overrides=None):
+    """
+    Match input columns to the variable names in a config's VARIABLES.
+
+    A variable matches a column with exactly its name, otherwise a column
+    whose name equals the variable's name or label ignoring case and
+    punctuation (``"GCS"`` for ``gcs``, ``"Age (years)"`` for ``age``).
+
+    Args:
+        columns: column names available in the input.
+        variables: the score's ``config.VARIABLES`` list.
+        overrides: optional dict mapping variable name to input column,
+            taking precedence over automatic matching.
+
+    Returns:
+        dict mapping variable name to input column. Variables without a
+        matching column are left out, so the engine applies its default.
+    """
+    columns = list(columns)
+    names = {var["name"] for var in variables}
+    overrides = dict(overrides or {})
+    for name, col in overrides.items():
+        if name not in names:
+            raise ValueError(f"Unknown variable {name!r}")
+        if col not in columns:
+            raise ValueError(f"Column {col!r} (mapped to {name!r}) not found in input")
+
+    normalized = {}
+    for col in columns:
+        normalized.setdefault(_normalize(col), col)
+
+    mapping = {}
+    for var in variables:
+        name = var["name"]
+        if name in overrides:
+            mapping[name] = overrides[name]
+        elif name in columns:
+            mapping[name] = name
+        elif _normalize(name) in normalized:
+            mapping[name] = normalized[_normalize(name)]
+        elif _normalize(var["label"]) in normalized:
+            mapping[name] = normalized[_normalize(var["label"])]
+    return mapping
+
+
+def _check_kept(keep, columns):
+    missing = [col for col in keep if col not in columns]
+    if missing:
+        raise ValueError(f"Columns not found in input: {', '.join(missing)}")
+
+
+def detect_format(source):
+    """Guess the input format (``csv``, ``parquet``, ``arrow``) from its extension."""
+    if not isinstance(source, str) or source == "-":
+        return "csv"
+    return FORMATS.get(os.path.splitext(source)[1].lower(), "csv")
+
+
+def read_csv_chunks(source, chunksize=DEFAULT_CHUNKSIZE, sep=","):
+    """
+    Iterate over a CSV file as DataFrames of at most ``chunksize`` rows.
+
+    Args:
+        source: file path, open file object, or ``"-"`` for stdin.
+        chunksize: rows per chunk.
+        sep: field delimiter.
+    """
+    if source == "-":
+        import sys
+
+        source = sys.stdin
+    return pd.read_csv(source, chunksize=chunksize, sep=sep)
+
+
+def split_chunks(chunks, variables, overrides=None, keep=None):
+    """
+    Split DataFrame chunks into kept output columns and engine inputs.
+
+    Args:
+        chunks: iterable of DataFrames sharing the same columns.
+        variables: the score's ``config.VARIABLES`` list.
+        overrides: optional dict mapping variable name to input column.
+        keep: input columns to carry through (default: all).
+
+    Yields:
+        ``(kept, inputs)`` per chunk: the kept columns as a DataFrame and the
+        mapped variable columns renamed to the variable names.
+    """
+    mapping = None
+    for chunk in chunks:
+        if mapping is None:
+            mapping = map_columns(chunk.columns, variables, overrides)
+            kept = list(chunk.columns) if keep is None else list(keep)
+            _check_kept(kept, chunk.columns)
+        inputs = chunk[list(mapping.values())].set_axis(list(mapping), axis=1)
+        yield chunk[kept], inputs
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError(
+            "Reading Parquet or Arrow input requires pyarrow (pip install pyarrow)"
+        ) from exc
+    return pyarrow
+
+
+def _arrow_batches(path, chunksize):
+    """Yield record batches from a memory-mapped Arrow IPC file or stream."""
+    pa = _pyarrow()
+    source = pa.memory_map(path)
+    try:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        schema = reader.schema
+    except pa.ArrowInvalid:
+        source.seek(0)
+        reader = pa.ipc.open_stream(source)
+        batches = iter(reader)
+        schema = reader.schema
+
+    def sliced():
+        for batch in batches:
+            # Zero-copy slices keep chunks no larger than requested
+            for offset in range(0, batch.num_rows, chunksize):
+                yield batch.slice(offset, chunksize)
+
+    return schema, sliced()
+
+
+def read_columnar(path, variables, overrides=None, keep=(), chunksize=DEFAULT_CHUNKSIZE,
+                  fmt=None):
+    """
+    Stream a Parquet or Arrow IPC file, reading only the columns a score needs.
+
+    Only the mapped variable columns and the ``keep`` columns are read (Parquet
+    column projection, or selection on the memory-mapped IPC batches).
+
+    Args:
+        path: Parquet or Arrow IPC (file or stream format) path.
+        variables: the score's ``config.VARIABLES`` list.
+        overrides: optional dict mapping variable name to input column.
+        keep: input columns to carry through to the output (default: none).
+        chunksize: maximum rows per record batch.
+        fmt: ``parquet`` or ``arrow`` (default: from the file extension).
+
+    Yields:
+        ``(kept, inputs)`` per record batch: the kept columns as a DataFrame
+        and the mapped variable columns as a core.Columns.
+    """
+    fmt = fmt or detect_format(path)
+    pa = _pyarrow()
+    if fmt == "parquet":
+        parquet = pa.parquet.ParquetFile(path, memory_map=True)
+        names = parquet.schema_arrow.names
+    elif fmt == "arrow":
+        schema, batches = _arrow_batches(path, chunksize)
+        names = schema.names
+    else:
+        raise ValueError(f"Unsupported columnar format: {fmt!r}")
+
+    keep = list(keep or ())
+    _check_kept(keep, names)
+    mapping = map_columns(names, variables, overrides)
+    projected = list(dict.fromkeys(list(mapping.values()) + keep))
+
+    if fmt == "parquet":
+        batches = parquet.iter_batches(batch_size=chunksize, columns=projected)
+    for batch in batches:
+        if fmt == "arrow":
+            batch = batch.select(projected)
+        inputs = Columns(
+            {
+                name: batch.column(col).to_numpy(zero_copy_only=False)
+                for name, col in mapping.items()
+            },
+            batch.num_rows,
+        )
+        kept = batch.select(keep).to_pandas() if keep else pd.DataFrame(index=range(batch.num_rows))
+        yield kept, inputs
+
+
+def read_inputs(source, variables, overrides=None, keep=None, chunksize=DEFAULT_CHUNKSIZE,
+                sep=",", fmt=None):
+    """
+    Read any supported input as ``(kept, inputs)`` chunks for scoring.
+
+    ``keep`` defaults to every column for CSV (which is parsed whole anyway)
+    and to none for Parquet/Arrow, so only the score's columns are read.
+    """
+    fmt = fmt or detect_format(source)
+    if fmt == "csv":
+        chunks = read_csv_chunks(source, chunksize, sep=sep)
+        return split_chunks(chunks, variables, overrides, keep)
+    return read_columnar(source, variables, overrides, keep, chunksize, fmt)
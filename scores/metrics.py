@@ -0,0 +1,282 @@
+"""
+Opt-in scoring metrics in Prometheus text format.
+
+Disabled by default: the engines' compute_prediction functions are left
+untouched, so there is no cost on the hot path. ``enable()`` replaces each
+engine's module-level ``compute_prediction`` with an instrumented version
+that records
+
+- calls, errors and a latency histogram per score
+- how often each component is met (``GCS Severe (<= 8)`` and so on)
+- the distribution of risk levels
+
+and ``observe_submit`` times the Streamlit page's submit path. Callers
+must look the function up on the module (``engine.compute_prediction``),
+as the registry, the UI and the service do; a reference taken with
+``from ... import compute_prediction`` before ``enable()`` stays
+uninstrumented.
+
+Only compute_prediction is counted. Paths that build results from the
+model directly are not: batch scoring (compute_batch, the CLI and
+scores.aggregate), the band cache, the asyncio dispatcher, the score
+panel, the incremental and streaming scorers, what-if sweeps and the
+counterfactual search.
+
+Metrics are exposed with ``render()``, written with ``dump(path)`` or
+served at ``/metrics`` by ``serve(port)``. Setting the environment
+variable ``SCORES_METRICS=1`` enables collection when this module is first
+imported; ``SCORES_METRICS_PORT`` also starts the endpoint and
+``SCORES_METRICS_FILE`` dumps the metrics there at exit.
+"""
+
+import atexit
+import bisect
+import functools
+import importlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scores import available_scores
+from scores.core import LazyResult
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (
+    2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 5e-3, 0.025, 0.1,
+)
+# Buckets for the Streamlit submit path, which includes page rendering
+SUBMIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_lock = threading.Lock()
+_scores = {}
+_submits = {}
+_originals = {}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style (not thread-safe)."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            yield f"{name}_bucket{_labels(labels, le=le)} {cumulative}"
+        yield f"{name}_sum{_labels(labels)} {self.sum!r}"
+        yield f"{name}_count{_labels(labels)} {self.count}"
+
+
+class _ScoreStats:
+    """Counters for one engine."""
+
+    __slots__ = ("components", "levels", "met", "risk", "latency", "errors")
+
+    def __init__(self, model):
+        self.components = [comp["label"] for comp in model.components]
+        self.levels = list(dict.fromkeys(level["label"] for level in model.risk_levels))
+        self.clear()
+
+    def clear(self):
+        self.met = [0] * len(self.components)
+        self.risk = dict.fromkeys(self.levels, 0)
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.errors = 0
+
+    def observe(self, seconds, mask, level):
+        met = self.met
+        with _lock:
+            self.latency.observe(seconds)
+            self.risk[level] += 1
+            while mask:
+                low = mask & -mask
+                met[low.bit_length() - 1] += 1
+                mask ^= low
+
+
+def _mask(result):
+    """The component bitmask of an engine result, without building a breakdown."""
+    if isinstance(result, LazyResult):
+        return result.mask
+    mask = 0
+    for bit, component in enumerate(result["components"]):
+        if component["met"]:
+            mask |= 1 << bit
+    return mask
+
+
+def _instrument(name, engine):
+    """Build the instrumented compute_prediction for one engine."""
+    original = engine.compute_prediction
+    stats = _scores.get(name)
+    if stats is None:
+        stats = _scores[name] = _ScoreStats(engine.MODEL)
+    clock = time.perf_counter
+
+    @functools.wraps(original)
+    def compute_prediction(inputs, explain=True):
+        start = clock()
+        try:
+            result = original(inputs, explain)
+        except Exception:
+            with _lock:
+                stats.errors += 1
+            raise
+        stats.observe(clock() - start, _mask(result), result["risk_label"])
+        return result
+
+    return compute_prediction
+
+
+def enabled():
+    """Whether metrics are being collected."""
+    return bool(_originals)
+
+
+def enable(names=None):
+    """
+    Start collecting metrics for ``names`` (default: every score).
+
+    Re-enabling a score keeps its counts.
+    """
+    for name in names or available_scores():
+        if name in _originals:
+            continue
+        engine = importlib.import_module(f"scores.{name}.prediction")
+        _originals[name] = engine.compute_prediction
+        engine.compute_prediction = _instrument(name, engine)
+
+
+def disable():
+    """Restore the uninstrumented engines; collected counts are kept."""
+    for name, original in _originals.items():
+        importlib.import_module(f"scores.{name}.prediction").compute_prediction = original
+    _originals.clear()
+
+
+def reset():
+    """Zero every counter."""
+    with _lock:
+        for stats in _scores.values():
+            stats.clear()
+        _submits.clear()
+
+
+def observe_submit(name, seconds):
+    """Record one Streamlit submit of score ``name`` (a no-op when disabled)."""
+    if not _originals:
+        return
+    with _lock:
+        histogram = _submits.get(name)
+        if histogram is None:
+            histogram = _submits[name] = Histogram(SUBMIT_BUCKETS)
+        histogram.observe(seconds)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, **extra):
+    pairs = dict(labels, **extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs.items()) + "}"
+
+
+def render():
+    """Return every metric in the Prometheus text exposition format."""
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+
+    with _lock:
+        scores = list(_scores.items())
+        family("scores_compute_calls_total", "counter", "Successful compute_prediction calls.", [
+            f"scores_compute_calls_total{_labels({'score': name})} {stats.latency.count}"
+            for name, stats in scores
+        ])
+        family("scores_compute_errors_total", "counter", "compute_prediction calls that raised.", [
+            f"scores_compute_errors_total{_labels({'score': name})} {stats.errors}"
+            for name, stats in scores
+        ])
+        family("scores_compute_latency_seconds", "histogram",
+               "compute_prediction latency in seconds.", [
+                   line for name, stats in scores
+                   for line in stats.latency.lines("scores_compute_latency_seconds",
+                                                   {"score": name})
+               ])
+        family("scores_component_met_total", "counter", "Calls in which a component was met.", [
+            f"scores_component_met_total{_labels({'score': name, 'component': label})} {count}"
+            for name, stats in scores
+            for label, count in zip(stats.components, stats.met)
+        ])
+        family("scores_risk_level_total", "counter", "Results by risk level.", [
+            f"scores_risk_level_total{_labels({'score': name, 'level': level})} {count}"
+            for name, stats in scores
+            for level, count in stats.risk.items()
+        ])
+        family("scores_ui_submit_seconds", "histogram",
+               "Streamlit submit-to-rendered time in seconds.", [
+                   line for name, histogram in _submits.items()
+                   for line in histogram.lines("scores_ui_submit_seconds", {"score": name})
+               ])
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    """Write ``render()`` to ``path`` atomically."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.partition("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=9464, host="127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="scores-metrics", daemon=True).start()
+    return server
+
+
+if os.environ.get("SCORES_METRICS", "").lower() in ("1", "true", "yes"):
+    enable()
+    if os.environ.get("SCORES_METRICS_PORT"):
+        serve(int(os.environ["SCORES_METRICS_PORT"]))
+    if os.environ.get("SCORES_METRICS_FILE"):
+        atexit.register(dump, os.environ["SCORES_METRICS_FILE"])
@@ -0,0 +1,79 @@
+"""
+Score panel: compute every score for a patient, or a batch, in one pass.
+
+Shared fields (age, GCS, SBP, HR, RR, height, weight, ...) are parsed once,
+BMI is derived once, and identical threshold checks are tested once, then
+each score's own result is built from its component bitmask.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+from typing import TYPE_CHECKING
+
+from scores import available_scores
+from scores.core import ScorePanel
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@functools.lru_cache(maxsize=None)
+def _load(names):
+    """Import the engines for ``names`` and compile their shared panel once."""
+    engines = [importlib.import_module(f"scores.{name}.prediction") for name in names]
+    return engines, ScorePanel([engine.MODEL for engine in engines])
+
+
+def _names(names):
+    return tuple(available_scores() if names is None else names)
+
+
+def compute_panel(inputs: dict, names=None, explain: bool = True) -> dict:
+    """
+    Compute several scores for one patient.
+
+    Args:
+        inputs: dict mapping variable name to its raw value; each score reads
+            the variables it declares.
+        names: score names to compute (default: all discovered scores).
+        explain: passed through to each engine's result (see
+            compute_prediction).
+
+    Returns:
+        dict mapping score name to that engine's compute_prediction result.
+    """
+    names = _names(names)
+    engines, panel = _load(names)
+    masks = panel.masks(inputs)
+    return {
+        name: engine.result_from_mask(mask, explain)
+        for name, engine, mask in zip(names, engines, masks)
+    }
+
+
+def compute_panel_batch(df: pd.DataFrame, names=None) -> pd.DataFrame:
+    """
+    Compute several scores for every row of a DataFrame.
+
+    Args:
+        df: DataFrame with one column per variable name.
+        names: score names to compute (default: all discovered scores).
+
+    Returns:
+        DataFrame indexed like ``df`` with two-level columns: the score name,
+        then that engine's compute_batch columns (``out["rams"]["score"]``).
+    """
+    import pandas as pd
+
+    names = _names(names)
+    engines, panel = _load(names)
+    masks = panel.masks_batch(df)
+    return pd.concat(
+        {
+            name: engine.frame_from_mask(mask, df.index)
+            for name, engine, mask in zip(names, engines, masks)
+        },
+        axis=1,
+    )
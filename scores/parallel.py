@@ -0,0 +1,85 @@
+"""
+Process-pool sharded batch scoring.
+
+Splits an input into shards, scores them with the engine's compute_batch in
+a ``concurrent.futures.ProcessPoolExecutor`` and reassembles the results in
+their original order, recording how long each shard took.
+"""
+
+import collections
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+def score_shard(name, shard_index, shard):
+    """Score one shard with compute_batch and time it (also the worker entry point)."""
+    start = time.perf_counter()
+    prediction = importlib.import_module(f"scores.{name}.prediction")
+    scored = prediction.compute_batch(shard)
+    timing = {
+        "shard": shard_index,
+        "rows": len(shard),
+        "seconds": time.perf_counter() - start,
+        "pid": os.getpid(),
+    }
+    return scored, timing
+
+
+def iter_scored_shards(name, shards, workers=None, max_pending=None):
+    """
+    Score an iterable of input DataFrames across a pool of processes.
+
+    Shards are submitted as they are drawn from ``shards`` and at most
+    ``max_pending`` are in flight at once, so a streamed input stays bounded
+    in memory.
+
+    Args:
+        name: score package name (``ford``, ``rams``, ``prime_icu``).
+        shards: iterable of DataFrames with one column per variable name.
+        workers: number of worker processes (default: ``os.cpu_count()``).
+        max_pending: shards in flight at once (default: twice ``workers``).
+
+    Yields:
+        ``(scored, timing)`` per shard, in input order. ``timing`` is a dict
+        with the shard index, its row count, the seconds spent scoring it
+        and the worker's pid.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for shard_index, shard in enumerate(shards):
+            pending.append(pool.submit(score_shard, name, shard_index, shard))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_parallel(name, df, workers=None, shards=None):
+    """
+    Score a DataFrame in shards across a pool of processes.
+
+    Args:
+        name: score package name.
+        df: DataFrame with one column per variable name.
+        workers: number of worker processes (default: ``os.cpu_count()``).
+        shards: number of shards (default: four per worker, so faster
+            workers pick up the slack of slower ones).
+
+    Returns:
+        ``(scored, timings)``: the compute_batch result for all rows in
+        their original order, and the per-shard timing dicts.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = max(1, min(len(df), shards or 4 * workers))
+    step = -(-len(df) // shards) if len(df) else 1
+    parts = (df.iloc[start:start + step] for start in range(0, max(len(df), 1), step))
+
+    results = list(iter_scored_shards(name, parts, workers))
+    scored = pd.concat([frame for frame, _ in results])
+    return scored, [timing for _, timing in results]
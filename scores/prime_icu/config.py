@@ -28,6 +28,7 @@ VARIABLES = [
         "label": "Sex",
         "type": "categorical",
         "options": ["Male", "Female"],
+        "default": "Male",
         "group": "Demographics",
     },
     {
@@ -117,6 +118,7 @@ VARIABLES = [
         "label": "Transport Mode",
         "type": "categorical",
         "options": ["Ambulance", "Auto/Cab", "Police", "Air Helicopter", "Walked", "Other"],
+        "default": "Other",
         "group": "Transport",
     },
     {
@@ -124,6 +126,7 @@ VARIABLES = [
         "label": "Transferred from Another Facility",
         "type": "categorical",
         "options": {"No": 0, "Yes": 1},
+        "default": 0,
         "group": "Transport",
     },
     {
@@ -162,6 +165,7 @@ VARIABLES = [
         "label": "Mechanism of Injury",
         "type": "categorical",
         "options": ["Penetrating", "Blunt", "Not Available", "Other"],
+        "default": "Other",
         "group": "Mechanism",
     },
     {
@@ -169,10 +173,229 @@ VARIABLES = [
         "label": "Industrial Accident",
         "type": "categorical",
         "options": {"No": 0, "Yes": 1},
+        "default": 0,
         "group": "Mechanism",
     },
 ]
 
+# Each component is met when all of its "when" clauses hold (or any of its
+# "when_any" clauses). Clauses are (variable, operator, value); "bmi" is
+# derived from height_in and weight_lb.
+COMPONENTS = [
+    # Age
+    {
+        "label": "Age 45-64",
+        "condition": "45 \u2264 Age \u2264 64",
+        "when": [("age", ">=", 45), ("age", "<=", 64)],
+        "raw_points": 28,
+    },
+    {
+        "label": "Age \u2265 65",
+        "condition": "Age \u2265 65",
+        "when": [("age", ">=", 65)],
+        "raw_points": 72,
+    },
+    # Sex
+    {
+        "label": "Male",
+        "condition": "Sex = Male",
+        "when": [("sex", "==", "Male")],
+        "raw_points": 24,
+    },
+    # GCS
+    {
+        "label": "GCS Severe (\u2264 8)",
+        "condition": "GCS \u2264 8",
+        "when": [("gcs", "<=", 8)],
+        "raw_points": 805,
+    },
+    {
+        "label": "GCS Moderate (9-12)",
+        "condition": "9 \u2264 GCS \u2264 12",
+        "when": [("gcs", ">=", 9), ("gcs", "<=", 12)],
+        "raw_points": 347,
+    },
+    # BMI
+    {
+        "label": "Class III Obesity (BMI \u2265 40)",
+        "condition": "BMI \u2265 40",
+        "when": [("bmi", ">=", 40)],
+        "raw_points": -84,
+    },
+    # SBP
+    {
+        "label": "Hypotensive (SBP < 90)",
+        "condition": "SBP < 90",
+        "when": [("sbp", "<", 90)],
+        "raw_points": 80,
+    },
+    {
+        "label": "Elevated BP (SBP 120-129)",
+        "condition": "120 \u2264 SBP \u2264 129",
+        "when": [("sbp", ">=", 120), ("sbp", "<=", 129)],
+        "raw_points": -34,
+    },
+    {
+        "label": "Stage 1 HTN (SBP 130-139)",
+        "condition": "130 \u2264 SBP \u2264 139",
+        "when": [("sbp", ">=", 130), ("sbp", "<=", 139)],
+        "raw_points": -37,
+    },
+    {
+        "label": "Stage 2 HTN (SBP \u2265 140)",
+        "condition": "SBP \u2265 140",
+        "when": [("sbp", ">=", 140)],
+        "raw_points": -39,
+    },
+    # Heart Rate
+    {
+        "label": "Tachycardic (HR \u2265 100)",
+        "condition": "HR \u2265 100",
+        "when": [("hr", ">=", 100)],
+        "raw_points": 38,
+    },
+    # Respiratory Rate
+    {
+        "label": "Low RR (< 12)",
+        "condition": "RR < 12",
+        "when": [("rr", "<", 12)],
+        "raw_points": -49,
+    },
+    {
+        "label": "High RR (> 20)",
+        "condition": "RR > 20",
+        "when": [("rr", ">", 20)],
+        "raw_points": 93,
+    },
+    # O2 Sat
+    {
+        "label": "Hypoxic (O\u2082 Sat \u2264 92%)",
+        "condition": "O\u2082 Sat \u2264 92%",
+        "when": [("o2_sat", "<=", 92)],
+        "raw_points": 70,
+    },
+    # Temperature
+    {
+        "label": "Hypothermia (< 95\u00b0F)",
+        "condition": "Temp < 95\u00b0F",
+        "when": [("temp_f", "<", 95)],
+        "raw_points": 104,
+    },
+    {
+        "label": "Low Grade Fever (99.1-100.4\u00b0F)",
+        "condition": "99.1 \u2264 Temp \u2264 100.4\u00b0F",
+        "when": [("temp_f", ">=", 99.1), ("temp_f", "<=", 100.4)],
+        "raw_points": -19,
+    },
+    {
+        "label": "High Grade Fever (> 102.2\u00b0F)",
+        "condition": "Temp > 102.2\u00b0F",
+        "when": [("temp_f", ">", 102.2)],
+        "raw_points": 40,
+    },
+    # Transport Mode
+    {
+        "label": "Ambulance Transport",
+        "condition": "Transport = Ambulance",
+        "when": [("transport_mode", "==", "Ambulance")],
+        "raw_points": 208,
+    },
+    {
+        "label": "Auto/Cab Transport",
+        "condition": "Transport = Auto/Cab",
+        "when": [("transport_mode", "==", "Auto/Cab")],
+        "raw_points": -27,
+    },
+    {
+        "label": "Police Transport",
+        "condition": "Transport = Police",
+        "when": [("transport_mode", "==", "Police")],
+        "raw_points": -39,
+    },
+    {
+        "label": "Air Helicopter Transport",
+        "condition": "Transport = Air Helicopter",
+        "when": [("transport_mode", "==", "Air Helicopter")],
+        "raw_points": 154,
+    },
+    {
+        "label": "Walked In",
+        "condition": "Transport = Walked",
+        "when": [("transport_mode", "==", "Walked")],
+        "raw_points": -47,
+    },
+    # Transfer
+    {
+        "label": "Transferred",
+        "condition": "Transferred = Yes",
+        "when": [("transferred", "==", 1)],
+        "raw_points": 81,
+    },
+    # Industrial
+    {
+        "label": "Industrial Accident",
+        "condition": "Industrial = Yes",
+        "when": [("industrial", "==", 1)],
+        "raw_points": -17,
+    },
+    # Mechanism
+    {
+        "label": "Penetrating Mechanism",
+        "condition": "Mechanism = Penetrating",
+        "when": [("mechanism", "==", "Penetrating")],
+        "raw_points": 33,
+    },
+    {
+        "label": "Blunt Mechanism",
+        "condition": "Mechanism = Blunt",
+        "when": [("mechanism", "==", "Blunt")],
+        "raw_points": 65,
+    },
+    {
+        "label": "Mechanism Not Available",
+        "condition": "Mechanism = Not Available",
+        "when": [("mechanism", "==", "Not Available")],
+        "raw_points": 49,
+    },
+    # Departure to Hospital
+    {
+        "label": "Departure-to-Hospital \u2264 10 min",
+        "condition": "DTH \u2264 10 min",
+        "when": [("departure_to_hospital_min", "<=", 10)],
+        "raw_points": 27,
+    },
+    # Time on Scene
+    {
+        "label": "Time on Scene 20-30 min",
+        "condition": "20 \u2264 TOS \u2264 30",
+        "when": [("time_on_scene_min", ">=", 20), ("time_on_scene_min", "<=", 30)],
+        "raw_points": -25,
+    },
+    # Total Time
+    {
+        "label": "Total Time 20-30 min",
+        "condition": "20 \u2264 TOT \u2264 30",
+        "when": [("total_time_min", ">=", 20), ("total_time_min", "<=", 30)],
+        "raw_points": 24,
+    },
+    {
+        "label": "Total Time > 80 min",
+        "condition": "TOT > 80 min",
+        "when": [("total_time_min", ">", 80)],
+        "raw_points": -30,
+    },
+]
+
+# Score = round(sum of log(1 + raw_points/100) over met components + offset),
+# clipped to [min_score, max_score].
+SCORING = {
+    "method": "log",
+    "points_key": "raw_points",
+    "offset": 3,
+    "min_score": 1,
+    "max_score": 10,
+}
+
 SCORE_META = {
     "name": "PRIME-ICU Score",
     "tagline": "Presentation Risk Index for Monitoring and Escalation to ICU",
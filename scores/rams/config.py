@@ -121,6 +121,7 @@ VARIABLES = [
         "label": "Transport by Automobile",
         "type": "categorical",
         "options": {"No": 0, "Yes": 1},
+        "default": 0,
         "group": "Transport",
     },
     # --- Mechanism of Injury ---
@@ -129,10 +130,111 @@ VARIABLES = [
         "label": "Mechanism of Injury: Fall",
         "type": "categorical",
         "options": {"No": 0, "Yes": 1},
+        "default": 0,
         "group": "Mechanism of Injury",
     },
 ]
 
+# Each component is met when all of its "when" clauses hold (or any of its
+# "when_any" clauses). Clauses are (variable, operator, value); "bmi" is
+# derived from height_in and weight_lb.
+COMPONENTS = [
+    {
+        "label": "A: Age \u2265 65",
+        "condition": "Age \u2265 65",
+        "when": [("age", ">=", 65)],
+        "raw_points": 382,
+    },
+    {
+        "label": "B: Transport Time 20-30 min",
+        "condition": "20 \u2264 Time \u2264 30",
+        "when": [("total_time_to_hospital_min", ">=", 20), ("total_time_to_hospital_min", "<=", 30)],
+        "raw_points": 67,
+    },
+    {
+        "label": "C: Auto Transport",
+        "condition": "Auto = Yes",
+        "when": [("auto_transport", "==", 1)],
+        "raw_points": -57,
+    },
+    {
+        "label": "D: SBP < 90 or HR < 60",
+        "condition": "SBP < 90 or HR < 60",
+        "when_any": [("sbp", "<", 90), ("hr", "<", 60)],
+        "raw_points": 76,
+    },
+    {
+        "label": "E: GCS \u2264 8 (Severe)",
+        "condition": "GCS \u2264 8",
+        "when": [("gcs", "<=", 8)],
+        "raw_points": 1315,
+    },
+    {
+        "label": "F: GCS 9-12 (Moderate)",
+        "condition": "9 \u2264 GCS \u2264 12",
+        "when": [("gcs", ">", 8), ("gcs", "<", 13)],
+        "raw_points": 248,
+    },
+    {
+        "label": "G: Underweight (BMI < 18.5)",
+        "condition": "BMI < 18.5",
+        "when": [("bmi", "<", 18.5)],
+        "raw_points": 71,
+    },
+    {
+        "label": "H: Class III Obesity (BMI \u2265 40)",
+        "condition": "BMI \u2265 40",
+        "when": [("bmi", ">=", 40)],
+        "raw_points": 248,
+    },
+    {
+        "label": "I: Resp Rate < 12",
+        "condition": "RR < 12",
+        "when": [("rr", "<", 12)],
+        "raw_points": 73,
+    },
+    {
+        "label": "J: Resp Rate > 20",
+        "condition": "RR > 20",
+        "when": [("rr", ">", 20)],
+        "raw_points": 55,
+    },
+    {
+        "label": "K: Hypoxic (O\u2082 Sat \u2264 92%)",
+        "condition": "O\u2082 Sat \u2264 92%",
+        "when": [("o2_sat", "<=", 92)],
+        "raw_points": 95,
+    },
+    {
+        "label": "L: Mechanism of Injury: Fall",
+        "condition": "Fall = Yes",
+        "when": [("fall", "==", 1)],
+        "raw_points": 79,
+    },
+    {
+        "label": "M: SBP \u2265 130 or HR > 80",
+        "condition": "SBP \u2265 130 or HR > 80",
+        "when_any": [("sbp", ">=", 130), ("hr", ">", 80)],
+        "raw_points": -45,
+    },
+    {
+        "label": "N: High Grade Temp (> 102.2\u00b0F)",
+        "condition": "Temp > 102.2\u00b0F",
+        "when": [("temp_f", ">", 102.2)],
+        "raw_points": 61,
+    },
+]
+
+# Score = round(sum of log(1 + raw_points/100) over met components + offset),
+# clipped to [min_score, max_score].
+SCORING = {
+    "method": "log",
+    "points_key": "raw_points",
+    "offset": 2,
+    "min_score": 1,
+    "max_score": 10,
+}
+
 SCORE_META = {
     "name": "RAMS Score",
     "tagline": "Rapid Acuity and Mortality Score",
@@ -2,16 +2,28 @@
 RAMS Score prediction engine.
 """
 
-import math
-from scores.rams.config import RISK_LEVELS
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
 
-def compute_prediction(inputs: dict) -> dict:
+from scores.core import CompactResult, ScoreModel, round_half_even
+from scores.rams import config
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+MODEL = ScoreModel(config)
+
+
+def compute_prediction(inputs: dict, explain: bool = True) -> dict:
     """
     Compute the RAMS score (1-10 scale) from raw input values.
 
     Args:
         inputs: dict mapping variable name to its raw value.
+        explain: when False, skip building the component breakdown; it is
+            built on first ``result["components"]`` access instead.
 
     Returns:
         dict with keys:
@@ -22,130 +34,98 @@ def compute_prediction(inputs: dict) -> dict:
             - survival_24h: 24-hour survival percentage
             - components: list of per-component contribution dicts
     """
-    age = float(inputs.get("age", 50))
-    total_time = float(inputs.get("total_time_to_hospital_min", 15))
-    auto_transport = int(inputs.get("auto_transport", 0))
-    sbp = float(inputs.get("sbp", 120))
-    hr = float(inputs.get("hr", 75))
-    gcs = float(inputs.get("gcs", 15))
-    height_in = float(inputs.get("height_in", 68))
-    weight_lb = float(inputs.get("weight_lb", 170))
-    bmi = (weight_lb / (height_in ** 2)) * 703
-    rr = float(inputs.get("rr", 16))
-    o2_sat = float(inputs.get("o2_sat", 98))
-    fall = int(inputs.get("fall", 0))
-    temp_f = float(inputs.get("temp_f", 98.6))
-
-    components = [
-        {
-            "label": "A: Age \u2265 65",
-            "condition": "Age \u2265 65",
-            "met": age >= 65,
-            "raw_points": 382,
-        },
-        {
-            "label": "B: Transport Time 20-30 min",
-            "condition": "20 \u2264 Time \u2264 30",
-            "met": 20 <= total_time <= 30,
-            "raw_points": 67,
-        },
-        {
-            "label": "C: Auto Transport",
-            "condition": "Auto = Yes",
-            "met": auto_transport == 1,
-            "raw_points": -57,
-        },
-        {
-            "label": "D: SBP < 90 or HR < 60",
-            "condition": "SBP < 90 or HR < 60",
-            "met": sbp < 90 or hr < 60,
-            "raw_points": 76,
-        },
-        {
-            "label": "E: GCS \u2264 8 (Severe)",
-            "condition": "GCS \u2264 8",
-            "met": gcs <= 8,
-            "raw_points": 1315,
-        },
-        {
-            "label": "F: GCS 9-12 (Moderate)",
-            "condition": "9 \u2264 GCS \u2264 12",
-            "met": gcs > 8 and gcs < 13,
-            "raw_points": 248,
-        },
-        {
-            "label": "G: Underweight (BMI < 18.5)",
-            "condition": "BMI < 18.5",
-            "met": bmi < 18.5,
-            "raw_points": 71,
-        },
-        {
-            "label": "H: Class III Obesity (BMI \u2265 40)",
-            "condition": "BMI \u2265 40",
-            "met": bmi >= 40,
-            "raw_points": 248,
-        },
-        {
-            "label": "I: Resp Rate < 12",
-            "condition": "RR < 12",
-            "met": rr < 12,
-            "raw_points": 73,
-        },
-        {
-            "label": "J: Resp Rate > 20",
-            "condition": "RR > 20",
-            "met": rr > 20,
-            "raw_points": 55,
-        },
-        {
-            "label": "K: Hypoxic (O\u2082 Sat \u2264 92%)",
-            "condition": "O\u2082 Sat \u2264 92%",
-            "met": o2_sat <= 92,
-            "raw_points": 95,
-        },
-        {
-            "label": "L: Mechanism of Injury: Fall",
-            "condition": "Fall = Yes",
-            "met": fall == 1,
-            "raw_points": 79,
-        },
-        {
-            "label": "M: SBP \u2265 130 or HR > 80",
-            "condition": "SBP \u2265 130 or HR > 80",
-            "met": sbp >= 130 or hr > 80,
-            "raw_points": -45,
-        },
-        {
-            "label": "N: High Grade Temp (> 102.2\u00b0F)",
-            "condition": "Temp > 102.2\u00b0F",
-            "met": temp_f > 102.2,
-            "raw_points": 61,
-        },
-    ]
-
-    for comp in components:
-        comp["value"] = comp["raw_points"] if comp["met"] else 0
-        comp["log_contribution"] = math.log(1 + (comp["value"] / 100))
-
-    raw_value = sum(c["log_contribution"] for c in components) + 2
-    score = max(1, min(10, round(raw_value)))
-
-    # Determine risk level and 24-hour survival
-    risk_label = ""
-    risk_color = "green"
-    survival_24h = 0.0
-    for level in RISK_LEVELS:
-        if score <= level["max_score"]:
-            risk_label = level["label"]
-            risk_color = level["color"]
-            survival_24h = level["survival_24h"]
-            break
-
-    return {
+    return result_from_mask(MODEL.mask(MODEL.parse(inputs)), explain)
+
+
+def result_from_mask(mask: int, explain: bool = True) -> dict:
+    """Build the compute_prediction result for a bitmask of met components."""
+    raw_value, score = MODEL.resolve(mask)
+    level = MODEL.risk_level(score)
+
+    result = {
         "score": score,
         "raw_value": round(raw_value, 4),
-        "risk_label": risk_label,
-        "risk_color": risk_color,
-        "survival_24h": survival_24h,
-        "components": components,
+        "risk_label": level["label"],
+        "risk_color": level["color"],
+        "survival_24h": level["survival_24h"],
     }
+    return MODEL.with_components(result, mask, explain)
+
+
+def compute_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute RAMS scores for every row of a DataFrame.
+
+    Each compared variable is cut into threshold bands with one vectorized
+    search, and the band codes are mapped to component bitmasks by table
+    lookup; the score is then summed from per-chunk partial-sum tables over
+    the mask, the same tables compute_prediction resolves through, so the
+    results match the scalar path exactly. Missing columns and empty cells
+    fall back to the same defaults as compute_prediction.
+
+    Args:
+        df: DataFrame (or core.Columns) with one column per variable name.
+
+    Returns:
+        DataFrame indexed like ``df`` with the scalar result keys as columns
+        (score, raw_value, risk_label, risk_color, survival_24h); the
+        per-component breakdown is omitted.
+    """
+    return frame_from_mask(MODEL.mask_batch(MODEL.parse_batch(df)), df.index)
+
+
+def frame_from_mask(mask: np.ndarray, index=None) -> pd.DataFrame:
+    """Build the compute_batch result for an array of component bitmasks."""
+    import pandas as pd
+
+    raw_value, score = MODEL.resolve_batch(mask)
+    level = MODEL.level_batch(score)
+
+    return pd.DataFrame(
+        {
+            "score": score,
+            "raw_value": round_half_even(raw_value, 4),
+            "risk_label": MODEL.risk_column(level, "label"),
+            "risk_color": MODEL.risk_column(level, "color"),
+            "survival_24h": MODEL.risk_column(level, "survival_24h"),
+        },
+        index=index,
+    )
+
+
+class RamsResult(CompactResult):
+    """
+    Compact RAMS result: the component bitmask and score, in two slots.
+
+    ``to_dict()`` returns the same dict as compute_prediction.
+    """
+
+    __slots__ = ()
+
+    model = MODEL
+
+    def to_dict(self, explain=True):
+        return result_from_mask(self.mask, explain)
+
+    @property
+    def survival_24h(self):
+        """24-hour survival percentage."""
+        return self.level["survival_24h"]
+
+
+# The compact result type of this engine
+COMPACT_RESULT = RamsResult
+
+
+def compute_compact(inputs: dict) -> RamsResult:
+    """Compute the RAMS score as a compact RamsResult (see core.CompactResult)."""
+    mask = MODEL.mask(MODEL.parse(inputs))
+    return RamsResult(mask, MODEL.resolve(mask)[1])
+
+
+def compact_batch(df: pd.DataFrame) -> list[RamsResult]:
+    """Compute a RamsResult for every row of a DataFrame, in row order."""
+    mask = MODEL.mask_batch(MODEL.parse_batch(df))
+    _, score = MODEL.resolve_batch(mask)
+    return list(map(RamsResult, mask.tolist(), score.tolist()))
+
@@ -0,0 +1,64 @@
+"""
+Process-wide registry of the available clinical scores.
+
+Built once on first use from the score packages under ``scores/``. Each
+entry exposes the score's config metadata right away and imports its
+prediction engine only the first time it is needed.
+"""
+
+import functools
+import importlib
+
+from scores import available_scores
+
+
+class ScoreEntry:
+    """
+    One registered score.
+
+    Attributes:
+        key: package name (``ford``, ``rams``, ``prime_icu``), also used as
+            the score page's URL path.
+        config: the score's config module.
+        meta: the config's SCORE_META dict.
+    """
+
+    __slots__ = ("key", "config", "meta", "_prediction")
+
+    def __init__(self, key, config):
+        self.key = key
+        self.config = config
+        self.meta = config.SCORE_META
+        self._prediction = None
+
+    @property
+    def prediction(self):
+        """The score's prediction engine module, imported on first access."""
+        if self._prediction is None:
+            self._prediction = importlib.import_module(f"scores.{self.key}.prediction")
+        return self._prediction
+
+    def __repr__(self):
+        return f"ScoreEntry({self.key!r})"
+
+
+@functools.lru_cache(maxsize=None)
+def registry():
+    """Return a dict of ScoreEntry by key, in discovery order, built once."""
+    entries = {}
+    for key in available_scores():
+        try:
+            config = importlib.import_module(f"scores.{key}.config")
+        except ImportError:
+            continue
+        if getattr(config, "SCORE_META", None):
+            entries[key] = ScoreEntry(key, config)
+    return entries
+
+
+def get_score(key):
+    """Return the ScoreEntry for ``key``, raising KeyError if it is unknown."""
+    try:
+        return registry()[key]
+    except KeyError:
+        raise KeyError(f"Unknown score: {key!r}") from None
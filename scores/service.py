@@ -0,0 +1,284 @@
+"""
+Standalone JSON scoring service on the standard library HTTP server.
+
+Endpoints:
+
+    GET  /scores                  names of the available scores
+    GET  /metrics                 Prometheus metrics, when scores.metrics is enabled
+    POST /score/{name}            one patient: a JSON object of inputs
+    POST /score/{name}/batch      many patients: {"rows": [{...}, ...]}
+
+Payloads are validated against the score's VARIABLES; a bad request gets a
+400 with one message per offending field (and its row, for batches).
+Append ``?explain=1`` to include the per-component breakdown.
+
+Connections are kept alive (HTTP/1.1), each handled on its own thread, and
+``--workers`` pre-forks that many processes sharing the listening socket.
+
+Usage::
+
+    python -m scores.service --port 8080 --workers 4
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from scores import metrics
+from scores.registry import registry
+from scores.validation import ValidationError, validate
+
+DEFAULT_PORT = 8080
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH_ROWS = 100_000
+
+_TRUE = ("1", "true", "yes")
+
+
+class HTTPError(Exception):
+    """An error response: status code plus JSON body."""
+
+    def __init__(self, status, message, errors=None):
+        super().__init__(message)
+        self.status = status
+        self.body = {"error": message}
+        if errors:
+            self.body["errors"] = errors
+
+
+def _engine(name):
+    entry = registry().get(name)
+    if entry is None:
+        raise HTTPError(404, f"Unknown score: {name!r}")
+    return entry
+
+
+def score_one(name, payload, explain=False):
+    """Validate one payload and score it (the ``POST /score/{name}`` handler)."""
+    entry = _engine(name)
+    try:
+        inputs = validate(entry.config.VARIABLES, payload)
+    except ValidationError as exc:
+        raise HTTPError(400, "Invalid input", exc.errors) from None
+    return entry.prediction.compute_prediction(inputs, explain)
+
+
+def score_many(name, payload, explain=False):
+    """Validate and score ``{"rows": [...]}`` (the ``/batch`` handler)."""
+    entry = _engine(name)
+    rows = payload.get("rows") if isinstance(payload, dict) else None
+    if not isinstance(rows, list):
+        raise HTTPError(400, 'Batch payload must be {"rows": [...]}')
+    if len(rows) > MAX_BATCH_ROWS:
+        raise HTTPError(413, f"At most {MAX_BATCH_ROWS} rows per batch")
+
+    variables = entry.config.VARIABLES
+    batch = []
+    errors = []
+    for i, row in enumerate(rows):
+        try:
+            batch.append(validate(variables, row))
+        except ValidationError as exc:
+            errors += [dict(error, row=i) for error in exc.errors]
+    if errors:
+        raise HTTPError(400, "Invalid input", errors)
+
+    compute = entry.prediction.compute_prediction
+    return {"results": [compute(inputs, explain) for inputs in batch]}
+
+
+class ScoreHandler(BaseHTTPRequestHandler):
+    """Request handler for the scoring endpoints."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "ScoreService/1.0"
+    # Small responses on kept-alive connections: send them without delay
+    disable_nagle_algorithm = True
+    access_log = False
+
+    def _send(self, status, body):
+        self._write(status, json.dumps(body, separators=(",", ":")).encode(), "application/json")
+
+    def _write(self, status, data, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self):
+        path, _, query = self.path.partition("?")
+        parts = [part for part in path.split("/") if part]
+        explain = parse_qs(query).get("explain", ["0"])[-1].lower() in _TRUE
+        return parts, explain
+
+    def _content_length(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body's end is unknown: the connection cannot be reused
+            self.close_connection = True
+            raise HTTPError(400, "Invalid Content-Length")
+        return length
+
+    def _read_json(self):
+        length = self._content_length()
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise HTTPError(413, f"Request body over {MAX_BODY_BYTES} bytes")
+        self._body_read = True
+        body = self.rfile.read(length)
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON") from None
+
+    def _discard_body(self):
+        """Consume an unread request body, so the next request starts clean."""
+        if self._body_read or self.close_connection:
+            return
+        try:
+            length = self._content_length()
+        except HTTPError:
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+        elif length:
+            self.rfile.read(length)
+
+    def _handle(self, method):
+        self._body_read = False
+        try:
+            parts, explain = self._route()
+            if parts == ["scores"]:
+                if method != "GET":
+                    raise HTTPError(405, "Use GET")
+                status, body = 200, {"scores": list(registry())}
+            elif parts == ["metrics"] and metrics.enabled():
+                if method != "GET":
+                    raise HTTPError(405, "Use GET")
+                self._write(200, metrics.render().encode(), metrics.CONTENT_TYPE)
+                return
+            elif len(parts) in (2, 3) and parts[0] == "score" and parts[2:] in ([], ["batch"]):
+                if method != "POST":
+                    raise HTTPError(405, "Use POST")
+                payload = self._read_json()
+                score = score_many if parts[2:] else score_one
+                status, body = 200, score(parts[1], payload, explain)
+            else:
+                raise HTTPError(404, f"No route for {self.path}")
+        except HTTPError as exc:
+            status, body = exc.status, exc.body
+        except Exception as exc:  # keep the worker alive; report the failure
+            self.log_error("error scoring %s: %r", self.path, exc)
+            status, body = 500, {"error": "Internal error"}
+        if status != 200:
+            self._discard_body()
+        self._send(status, body)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        if self.access_log:
+            super().log_message(format, *args)
+
+
+class ScoreServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, access_log=False):
+    """Create a bound ScoreServer with every score engine already imported."""
+    for entry in registry().values():
+        entry.prediction
+    handler = type("Handler", (ScoreHandler,), {"access_log": access_log})
+    return ScoreServer((host, port), handler)
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, workers=1, access_log=False):
+    """
+    Serve until interrupted.
+
+    With ``workers`` > 1 the bound server is forked into that many
+    processes, all accepting on the same socket; the engines are imported
+    before the fork so the children share them.
+    """
+    server = make_server(host, port, access_log)
+    if workers <= 1 or not hasattr(os, "fork"):
+        with server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+    server.socket.close()
+    # Take the workers down with the parent, however it is stopped
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m scores.service",
+        description="Serve the clinical scores as a JSON HTTP API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes sharing the socket (default: 1)")
+    parser.add_argument("--access-log", action="store_true",
+                        help="log every request to stderr")
+    parser.add_argument("--metrics", action="store_true",
+                        help="collect scoring metrics and serve them at GET /metrics "
+                             "(counted per worker process)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+    print(f"Serving {', '.join(registry())} on http://{args.host}:{args.port} "
+          f"({args.workers} worker{'s' if args.workers != 1 else ''})", file=sys.stderr)
+    serve(args.host, args.port, args.workers, args.access_log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
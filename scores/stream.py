@@ -0,0 +1,458 @@
+"""
+Streaming per-patient scoring over a time-ordered vitals event log.
+
+Events are ``(patient_id, timestamp, variable, value)`` readings. A
+VitalsStream keeps each patient's latest value of every variable, as one
+IncrementalScorer per score that declares it, and emits a ScoreChange only
+when an event moves a score (the risk level is a function of the score, so
+this covers every risk-level change too). A reading that leaves every band
+in place costs a few dict lookups.
+
+Patients are evicted once no event has arrived for them for ``ttl``
+seconds of stream time (the latest timestamp seen), and the least recently
+seen ones beyond ``max_patients``, so memory stays bounded however long the
+stream runs. Readings older than the patient's latest one for the same
+variable are stale and skipped, as are invalid values (checked against the
+score's VARIABLES, as the service checks them).
+
+Timestamps are epoch seconds, datetimes or ISO 8601 strings (naive ones
+read as UTC). Events come from any iterable, a newline-delimited JSON file
+(``read_ndjson``) or a local socket (``read_socket``), one JSON event per
+line: ``{"patient_id": "A17", "timestamp": "2026-03-01T10:04:00Z",
+"variable": "hr", "value": 128}`` or ``["A17", 1772359440, "hr", 128]``.
+
+Usage::
+
+    python -m scores.stream vitals.ndjson -o changes.ndjson
+    python -m scores.stream --socket /tmp/vitals.sock --scores prime_icu --ttl 43200
+"""
+
+import argparse
+import importlib
+import json
+import os
+import selectors
+import socket
+import stat
+import sys
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from scores import available_scores
+from scores.core import CompactResult
+from scores.incremental import IncrementalScorer
+from scores.validation import check_value
+
+# A day: discharged patients stop sending vitals
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_PATIENTS = 10_000
+# Longest event line a socket producer may send
+MAX_LINE_BYTES = 1 << 20
+
+
+class ScoreChange(NamedTuple):
+    """
+    One patient's score after an event that changed it.
+
+    ``previous`` is None for the patient's first result on that score.
+    """
+
+    patient_id: object
+    timestamp: object
+    name: str
+    result: CompactResult
+    previous: CompactResult
+
+    def to_dict(self):
+        """JSON-serializable form, as written by the command line."""
+        previous = self.previous
+        return {
+            "patient_id": self.patient_id,
+            "timestamp": self.timestamp,
+            "name": self.name,
+            "score": self.result.score,
+            "risk_label": self.result.risk_label,
+            "risk_color": self.result.risk_color,
+            "previous_score": None if previous is None else previous.score,
+            "previous_risk_label": None if previous is None else previous.risk_label,
+        }
+
+
+class _Patient:
+    """Stream state for one patient."""
+
+    __slots__ = ("last_seen", "times", "scorers")
+
+    def __init__(self, count):
+        self.last_seen = None
+        self.times = {}
+        self.scorers = [None] * count
+
+
+def _seconds(timestamp):
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            raise ValueError(f"Invalid timestamp {timestamp!r}") from None
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    raise ValueError(f"Invalid timestamp {timestamp!r}")
+
+
+class VitalsStream:
+    """
+    Per-patient scores maintained from a stream of single readings.
+
+    Args:
+        names: scores to maintain (default: every score).
+        ttl: seconds of stream time without an event after which a patient
+            is evicted.
+        max_patients: patients kept at most; beyond it the least recently
+            seen is evicted.
+
+    Attributes:
+        counts: running totals: ``events`` pushed, ``ignored`` (variable no
+            score declares), ``rejected`` (invalid value, per score),
+            ``stale`` (older than the latest reading), ``emitted`` and
+            ``evicted``.
+    """
+
+    def __init__(self, names=None, ttl=DEFAULT_TTL, max_patients=DEFAULT_MAX_PATIENTS):
+        self.names = tuple(names or available_scores())
+        unknown = set(self.names) - set(available_scores())
+        if unknown:
+            raise ValueError(f"Unknown score(s): {', '.join(sorted(unknown))}")
+        if ttl <= 0 or max_patients < 1:
+            raise ValueError("ttl and max_patients must be positive")
+        self.ttl = ttl
+        self.max_patients = max_patients
+        # Per variable: (score slot, VARIABLES entry) for each score declaring it
+        self.routes = {}
+        for slot, name in enumerate(self.names):
+            config = importlib.import_module(f"scores.{name}.config")
+            for var in config.VARIABLES:
+                self.routes.setdefault(var["name"], []).append((slot, var))
+        self.patients = OrderedDict()
+        self.clock = None
+        self.counts = dict.fromkeys(
+            ("events", "ignored", "rejected", "stale", "emitted", "evicted"), 0
+        )
+
+    def __len__(self):
+        return len(self.patients)
+
+    def push(self, patient_id, timestamp, variable, value):
+        """
+        Apply one reading.
+
+        Returns:
+            list of ScoreChange, one per score the reading changed (empty
+            when it changed none).
+
+        Raises:
+            ValueError: for a timestamp that cannot be read.
+        """
+        counts = self.counts
+        counts["events"] += 1
+        seconds = _seconds(timestamp)
+        routes = self.routes.get(variable)
+        if routes is None:
+            counts["ignored"] += 1
+            return []
+        if self.clock is None or seconds > self.clock:
+            self.clock = seconds
+            self.expire()
+        elif seconds <= self.clock - self.ttl:
+            counts["stale"] += 1
+            return []
+
+        patients = self.patients
+        patient = patients.get(patient_id)
+        if patient is None:
+            patient = patients[patient_id] = _Patient(len(self.names))
+            if len(patients) > self.max_patients:
+                patients.popitem(last=False)
+                counts["evicted"] += 1
+        else:
+            patients.move_to_end(patient_id)
+            latest = patient.times.get(variable)
+            if latest is not None and seconds < latest:
+                counts["stale"] += 1
+                return []
+        if patient.last_seen is None or seconds > patient.last_seen:
+            patient.last_seen = seconds
+
+        changes = []
+        for slot, var in routes:
+            value_in, message = check_value(var, value)
+            if message:
+                counts["rejected"] += 1
+                continue
+            # Only an accepted reading makes older ones stale
+            patient.times[variable] = seconds
+            scorer = patient.scorers[slot]
+            if scorer is None:
+                scorer = patient.scorers[slot] = IncrementalScorer(self.names[slot])
+                result = scorer.update({variable: value_in})
+                previous = None
+            else:
+                mask, score = scorer.mask, scorer.score
+                result = scorer.update({variable: value_in})
+                if result.score == score:
+                    continue
+                previous = type(result)(mask, score)
+            changes.append(ScoreChange(patient_id, timestamp, self.names[slot], result, previous))
+        counts["emitted"] += len(changes)
+        return changes
+
+    def expire(self):
+        """Evict the patients not seen within ``ttl`` of the stream clock."""
+        patients = self.patients
+        cutoff = self.clock - self.ttl
+        # Patients are kept in order of their latest event; with time-ordered
+        # events the oldest is first
+        while patients:
+            patient_id = next(iter(patients))
+            if patients[patient_id].last_seen > cutoff:
+                break
+            del patients[patient_id]
+            self.counts["evicted"] += 1
+
+    def run(self, events, on_error=None):
+        """
+        Push every event from an iterable, yielding the ScoreChanges.
+
+        ``on_error`` is called with the message of an event ``push``
+        rejects (an unreadable timestamp), which is then skipped; by default
+        the ValueError propagates.
+        """
+        push = self.push
+        for patient_id, timestamp, variable, value in events:
+            try:
+                changes = push(patient_id, timestamp, variable, value)
+            except ValueError as exc:
+                if on_error is None:
+                    raise
+                on_error(f"patient {patient_id!r}: {exc}")
+                continue
+            yield from changes
+
+    def scores(self, patient_id):
+        """Current results of one patient, by score name (scores it has data for)."""
+        patient = self.patients.get(patient_id)
+        if patient is None:
+            return {}
+        return {
+            name: scorer.result
+            for name, scorer in zip(self.names, patient.scorers) if scorer is not None
+        }
+
+
+# --- Event sources ---
+
+def parse_event(obj):
+    """Return the ``(patient_id, timestamp, variable, value)`` of a decoded JSON event."""
+    if isinstance(obj, dict):
+        try:
+            event = (obj["patient_id"], obj["timestamp"], obj["variable"], obj["value"])
+        except KeyError as exc:
+            raise ValueError(f"event is missing {exc.args[0]!r}") from None
+    elif isinstance(obj, list) and len(obj) == 4:
+        event = tuple(obj)
+    else:
+        raise ValueError("expected an event object or a 4-item array")
+    if not isinstance(event[0], (str, int)) or isinstance(event[0], bool):
+        raise ValueError(f"invalid patient_id {event[0]!r}")
+    return event
+
+
+def _events(lines, where, on_error):
+    for number, line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield parse_event(json.loads(line))
+        except ValueError as exc:
+            message = f"{where} line {number}: {exc}"
+            if on_error is None:
+                raise ValueError(message) from None
+            on_error(message)
+
+
+def read_ndjson(source, on_error=None):
+    """
+    Yield the events of a newline-delimited JSON file.
+
+    Args:
+        source: a path, ``-`` for stdin, or a text file object.
+        on_error: called with a message for each malformed line, which is
+            then skipped; by default the first one raises ValueError.
+    """
+    if isinstance(source, str):
+        f = sys.stdin if source == "-" else open(source)
+        name = "stdin" if source == "-" else source
+    else:
+        f, name = source, getattr(source, "name", "input")
+    try:
+        yield from _events(enumerate(f, 1), name, on_error)
+    finally:
+        if f is not source and f is not sys.stdin:
+            f.close()
+
+
+def _listen(address):
+    if isinstance(address, str):
+        # Replace a socket left behind by an earlier run, but nothing else
+        try:
+            if stat.S_ISSOCK(os.stat(address).st_mode):
+                os.unlink(address)
+        except FileNotFoundError:
+            pass
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(address)
+    server.listen()
+    server.setblocking(False)
+    return server
+
+
+def read_socket(address, on_error=None, once=False):
+    """
+    Yield events sent as JSON lines to a local socket.
+
+    Any number of producers may connect at once; their connections are
+    multiplexed on this thread.
+
+    Args:
+        address: a filesystem path for a Unix domain socket, or a
+            ``(host, port)`` pair for TCP.
+        on_error: as for ``read_ndjson``; a line longer than
+            MAX_LINE_BYTES is reported the same way and its connection
+            closed.
+        once: stop when every producer has disconnected, instead of
+            waiting for more.
+    """
+    server = _listen(address)
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ)
+    # Per connection: [peer name, unfinished line, lines read]
+    pending = {}
+    try:
+        while True:
+            for key, _ in selector.select():
+                sock = key.fileobj
+                if sock is server:
+                    conn, peer = server.accept()
+                    conn.setblocking(False)
+                    selector.register(conn, selectors.EVENT_READ)
+                    pending[conn] = [peer or str(address), b"", 0]
+                    continue
+                state = pending[sock]
+                try:
+                    data = sock.recv(1 << 16)
+                except ConnectionError:
+                    data = b""
+                lines = (state[1] + data).split(b"\n")
+                state[1] = b"" if not data else lines.pop()
+                first = state[2] + 1
+                state[2] += len(lines)
+                yield from _events(enumerate(lines, first), state[0], on_error)
+                if len(state[1]) > MAX_LINE_BYTES:
+                    message = f"{state[0]} line {state[2] + 1}: line too long"
+                    if on_error is None:
+                        raise ValueError(message)
+                    on_error(message)
+                    data = b""
+                if not data:
+                    selector.unregister(sock)
+                    sock.close()
+                    del pending[sock]
+            if once and not pending:
+                return
+    finally:
+        for sock in pending:
+            sock.close()
+        selector.close()
+        server.close()
+        if isinstance(address, str):
+            os.unlink(address)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m scores.stream",
+        description="Maintain per-patient scores from a stream of vitals events.",
+    )
+    parser.add_argument("input", nargs="?", default="-",
+                        help="NDJSON event file, or - for stdin (default)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--socket", metavar="PATH", help="read events from a Unix socket")
+    source.add_argument("--port", type=int, help="read events from TCP on 127.0.0.1:PORT")
+    parser.add_argument("--once", action="store_true",
+                        help="with --socket/--port, stop when every producer disconnects")
+    parser.add_argument("--scores", nargs="+", choices=available_scores(),
+                        help="scores to maintain (default: all)")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL,
+                        help=f"evict patients silent for this many seconds (default: {DEFAULT_TTL})")
+    parser.add_argument("--max-patients", type=int, default=DEFAULT_MAX_PATIENTS,
+                        help=f"patients kept at most (default: {DEFAULT_MAX_PATIENTS})")
+    parser.add_argument("-o", "--output", default="-",
+                        help="write score changes as NDJSON here (default: stdout)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    def warn(message):
+        print(f"warning: {message}", file=sys.stderr)
+
+    try:
+        stream = VitalsStream(args.scores, args.ttl, args.max_patients)
+    except ValueError as exc:
+        parser.error(str(exc))
+    # Socket input is open-ended: pass each change on as it happens
+    live = bool(args.socket or args.port)
+    try:
+        if live:
+            events = read_socket(args.socket or ("127.0.0.1", args.port), warn, args.once)
+        else:
+            events = read_ndjson(args.input, warn)
+        output = sys.stdout if args.output == "-" else open(args.output, "w")
+        try:
+            for change in stream.run(events, warn):
+                output.write(json.dumps(change.to_dict()) + "\n")
+                if live:
+                    output.flush()
+        finally:
+            if output is not sys.stdout:
+                output.close()
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (ImportError, OSError, ValueError) as exc:
+        parser.exit(1, f"{parser.prog}: error: {exc}\n")
+
+    counts = stream.counts
+    print(
+        f"{counts['events']} events, {counts['emitted']} score changes "
+        f"({counts['ignored']} ignored, {counts['rejected']} rejected, "
+        f"{counts['stale']} stale, {counts['evicted']} patients evicted)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""
+Payload validation against a score's VARIABLES.
+
+``validate`` checks one payload; the HTTP service uses it to reject
+malformed requests with a message per field instead of letting the engine
+coerce (or choke on) them. ``BatchValidator`` applies the same rules column
+by column to whole batches, for file and cohort scoring. Omitted variables
+are valid: the engine fills in their defaults.
+"""
+
+import functools
+import importlib
+import math
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a payload does not match a score's VARIABLES.
+
+    Attributes:
+        errors: list of ``{"field": name, "message": text}`` dicts, one per
+            offending field (``field`` is None for payload-level problems),
+            with a ``row`` number too when they come from a batch.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(
+            ("row {}: ".format(e["row"]) if "row" in e else "")
+            + (f"{e['field']}: {e['message']}" if e["field"] else e["message"])
+            for e in errors
+        ))
+
+
+def _check_continuous(var, value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value, "must be a number"
+    if not math.isfinite(value):
+        return value, "must be finite"
+    if not var["min"] <= value <= var["max"]:
+        return value, f"must be between {var['min']} and {var['max']}"
+    return value, None
+
+
+def _check_categorical(var, value):
+    options = var["options"]
+    if isinstance(options, dict):
+        # Accept the display label ("Yes") or the mapped value (1)
+        if isinstance(value, str) and value in options:
+            return options[value], None
+        if not isinstance(value, bool) and value in options.values():
+            return value, None
+        choices = list(options) + list(options.values())
+    else:
+        if isinstance(value, str) and value in options:
+            return value, None
+        choices = options
+    return value, f"must be one of {', '.join(map(repr, choices))}"
+
+
+def check_value(var, value):
+    """
+    Check one value against its VARIABLES entry.
+
+    Returns:
+        ``(value, message)``: the engine-ready value (a mapped option's
+        label replaced by its value) and None, or the value and the reason
+        it is invalid.
+    """
+    if var["type"] == "continuous":
+        return _check_continuous(var, value)
+    return _check_categorical(var, value)
+
+
+def validate(variables, payload):
+    """
+    Check a single-patient payload and return the engine inputs.
+
+    Args:
+        variables: the score's ``config.VARIABLES`` list.
+        payload: dict mapping variable name to raw value.
+
+    Returns:
+        dict of the supplied variables, with categorical labels of mapped
+        options replaced by their values.
+
+    Raises:
+        ValidationError: listing every unknown, mistyped or out-of-range field.
+    """
+    if not isinstance(payload, dict):
+        raise ValidationError([{"field": None, "message": "payload must be a JSON object"}])
+
+    by_name = {var["name"]: var for var in variables}
+    inputs = {}
+    errors = []
+    for name, value in payload.items():
+        var = by_name.get(name)
+        if var is None:
+            errors.append({"field": name, "message": "unknown variable"})
+            continue
+        value, message = check_value(var, value)
+        if message:
+            errors.append({"field": name, "message": message})
+        else:
+            inputs[name] = value
+    if errors:
+        raise ValidationError(errors)
+    return inputs
+
+
+# --- Column-wise validation of whole batches ---
+
+# Per-cell reason codes; 0 means the cell is valid (or missing)
+NOT_A_NUMBER = 1
+NOT_FINITE = 2
+OUT_OF_RANGE = 3
+NOT_AN_OPTION = 4
+
+
+def _choices(var):
+    options = var["options"]
+    return list(options) + list(options.values()) if isinstance(options, dict) else options
+
+
+def reason_message(var, code):
+    """The message for a reason code, worded as ``validate`` words it."""
+    if code == NOT_A_NUMBER:
+        return "must be a number"
+    if code == NOT_FINITE:
+        return "must be finite"
+    if code == OUT_OF_RANGE:
+        return f"must be between {var['min']} and {var['max']}"
+    return f"must be one of {', '.join(map(repr, _choices(var)))}"
+
+
+def _flags(series):
+    """Boolean array: cells of an object column holding True or False."""
+    from pandas.api.types import infer_dtype
+
+    # A cheap per-column scan rules bools out for the usual columns
+    if infer_dtype(series, skipna=True) not in ("boolean", "mixed-integer", "mixed"):
+        return None
+    return (series.map(type) == bool).to_numpy()
+
+
+class BatchValidation:
+    """
+    Outcome of validating a batch with ``BatchValidator``.
+
+    Attributes:
+        clean: DataFrame of engine-ready columns for the variables present
+            in the batch: continuous values and mapped categoricals as
+            float64, other categoricals as pandas Categoricals of their
+            options. Missing cells stay
+            missing (the engine fills in defaults); invalid cells are
+            blanked too, so drop or fix flagged rows before scoring.
+        errors: per-row bitmask of invalid variables (bit i = VARIABLES[i]).
+        reasons: dict mapping each variable with an invalid cell to its
+            per-row uint8 reason codes (0 where the cell is valid).
+    """
+
+    __slots__ = ("variables", "clean", "errors", "reasons")
+
+    def __init__(self, variables, clean, errors, reasons):
+        self.variables = variables
+        self.clean = clean
+        self.errors = errors
+        self.reasons = reasons
+
+    @property
+    def valid(self):
+        """Boolean array: rows without any invalid cell."""
+        return self.errors == 0
+
+    def messages(self, row):
+        """``validate``-style ``{"field", "message"}`` dicts for row position ``row``."""
+        by_name = {var["name"]: var for var in self.variables}
+        return [
+            {"field": name, "message": reason_message(by_name[name], int(codes[row]))}
+            for name, codes in self.reasons.items() if codes[row]
+        ]
+
+    def summary(self):
+        """Count of invalid cells by variable and message."""
+        import numpy as np
+
+        by_name = {var["name"]: var for var in self.variables}
+        summary = {}
+        for name, codes in self.reasons.items():
+            counts = np.bincount(codes, minlength=NOT_AN_OPTION + 1)
+            summary[name] = {
+                reason_message(by_name[name], code): int(counts[code])
+                for code in range(1, len(counts)) if counts[code]
+            }
+        return summary
+
+
+class BatchValidator:
+    """
+    Column-wise validator compiled from a score's VARIABLES.
+
+    Each variable's check is a few vectorized operations over its column,
+    with no Python work per cell. The rules are those of ``validate``:
+    continuous values must be finite numbers within ``min``/``max``, and
+    categoricals one of their options, where mapped options accept the label
+    or the value. Numeric text is accepted in continuous columns, as CSV
+    readers leave a column with any bad cell as text. Missing columns and
+    cells are valid; columns that are not variables are ignored.
+
+    Args:
+        variables: the score's ``config.VARIABLES`` list.
+    """
+
+    def __init__(self, variables):
+        import numpy as np
+
+        if len(variables) > 64:
+            raise ValueError("At most 64 variables fit the per-row error bitmask")
+        self.variables = variables
+        self.mask_dtype = next(
+            dtype for dtype in (np.uint8, np.uint16, np.uint32, np.uint64)
+            if len(variables) <= np.iinfo(dtype).bits
+        )
+        # Mapped categoricals: labels and values, both to the value
+        self.lookups = {
+            var["name"]: dict(
+                {value: value for value in var["options"].values()}, **var["options"]
+            )
+            for var in variables
+            if var["type"] == "categorical" and isinstance(var["options"], dict)
+        }
+
+    def _continuous(self, var, series):
+        import numpy as np
+        import pandas as pd
+
+        missing = series.isna().to_numpy()
+        kind = series.dtype.kind
+        codes = np.zeros(len(series), dtype=np.uint8)
+        if kind == "b":
+            codes[~missing] = NOT_A_NUMBER
+            return np.full(len(series), np.nan), codes
+        if kind in "iuf":
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            if series.dtype == object:
+                flags = _flags(series)
+                if flags is not None:
+                    values = np.where(flags, np.nan, values)
+            codes[np.isnan(values) & ~missing] = NOT_A_NUMBER
+        # NaN (missing) fails both comparisons
+        codes[(values < var["min"]) | (values > var["max"])] = OUT_OF_RANGE
+        codes[np.isinf(values)] = NOT_FINITE
+        bad = codes != 0
+        if bad.any():
+            values = np.where(bad, np.nan, values)
+        return values, codes
+
+    def _categorical(self, var, series):
+        """
+        Check a categorical column on its distinct values only.
+
+        Each distinct value is checked once and the outcome spread back to
+        the rows through the factorized codes, where -1 (missing) picks the
+        trailing "valid, no value" entry of each table.
+        """
+        import numpy as np
+        import pandas as pd
+
+        lookup = self.lookups.get(var["name"])
+        flags = None
+        if lookup is not None and series.dtype == object:
+            # Factorizing would merge True with 1: blank the bools first
+            flags = _flags(series)
+            if flags is not None:
+                series = series.mask(flags)
+        positions, uniques = pd.factorize(series)
+        uniques = uniques.tolist()
+        if lookup is None:
+            options = var["options"]
+            index = {option: i for i, option in enumerate(options)}
+            option_codes = np.array(
+                [index.get(u, -1) if isinstance(u, str) else -1 for u in uniques] + [-1]
+            )[positions]
+            ok = np.array([isinstance(u, str) and u in index for u in uniques] + [True])[positions]
+            values = pd.Categorical.from_codes(option_codes, categories=options)
+        else:
+            table = [
+                np.nan if isinstance(u, (bool, np.bool_)) else lookup.get(u, np.nan)
+                for u in uniques
+            ]
+            values = np.array(table + [np.nan], dtype=float)[positions]
+            ok = ~np.isnan(values) | (positions < 0)
+            if flags is not None:
+                ok &= ~flags
+        codes = np.zeros(len(series), dtype=np.uint8)
+        codes[~ok] = NOT_AN_OPTION
+        return values, codes
+
+    def validate(self, df):
+        """
+        Validate a DataFrame (or core.Columns) of raw inputs.
+
+        Returns:
+            BatchValidation with the clean frame, the per-row error bitmask
+            and the reason codes of each variable with an invalid cell.
+        """
+        import numpy as np
+        import pandas as pd
+
+        n = len(df)
+        index = getattr(df, "index", None)
+        clean = {}
+        errors = np.zeros(n, dtype=self.mask_dtype)
+        reasons = {}
+        for bit, var in enumerate(self.variables):
+            name = var["name"]
+            if name not in df:
+                continue
+            series = df[name]
+            if not isinstance(series, pd.Series):
+                series = pd.Series(series)
+            check = self._continuous if var["type"] == "continuous" else self._categorical
+            values, codes = check(var, series)
+            clean[name] = values
+            bad = codes != 0
+            if bad.any():
+                reasons[name] = codes
+                errors[bad] |= self.mask_dtype(1 << bit)
+        return BatchValidation(self.variables, pd.DataFrame(clean, index=index), errors, reasons)
+
+
+@functools.lru_cache(maxsize=None)
+def batch_validator(name):
+    """Return the (cached) BatchValidator for score package ``name``."""
+    config = importlib.import_module(f"scores.{name}.config")
+    return BatchValidator(config.VARIABLES)
@@ -0,0 +1,189 @@
+"""
+What-if sweeps: how a score changes as one or two inputs vary.
+
+A score is piecewise constant in each input, changing only where the input
+crosses a threshold one of its components tests. A sweep therefore
+evaluates the engine once per band between thresholds (read from the
+model's BandIndex), not once per step value, in a single batch, and
+returns the curve as segments of constant score and risk level.
+
+Inputs that only reach the score through a derived variable (height and
+weight, through BMI) have no thresholds of their own; they are evaluated
+over their ``step`` grid and compressed into runs instead.
+"""
+
+import importlib
+import math
+
+import numpy as np
+
+from scores.core import Columns, step_grid
+
+
+def _engine(name):
+    return importlib.import_module(f"scores.{name}.prediction")
+
+
+def _variable(model, name):
+    for var in model.variables:
+        if var["name"] == name:
+            return var
+    raise ValueError(f"Unknown variable {name!r}")
+
+
+def _feeds_derived(model, name):
+    return any(name in args for _, args, _ in model.derived)
+
+
+def axis(model, name, low=None, high=None, on_grid=True):
+    """
+    Return the points at which to evaluate ``name`` and the segment for each.
+
+    With ``on_grid``, bands that hold no value on the variable's ``step``
+    grid (GCS strictly between 8 and 9) are left out.
+
+    Returns:
+        ``(points, segments)``: one representative value per band (or per
+        grid step), and for each a dict with ``from``/``to`` and whether
+        each end is inclusive (categoricals: ``value``).
+    """
+    var = _variable(model, name)
+    if var["type"] != "continuous":
+        options = var["options"]
+        values = list(options.values()) if isinstance(options, dict) else list(options)
+        labels = list(options) if isinstance(options, dict) else values
+        return values, [{"value": label} for label in labels]
+
+    low = var["min"] if low is None else max(low, var["min"])
+    high = var["max"] if high is None else min(high, var["max"])
+    if low > high:
+        raise ValueError(f"Empty range for {name!r}: {low} > {high}")
+
+    if _feeds_derived(model, name) or name not in model.bands:
+        points = step_grid(low, high, var.get("step", 1)).tolist()
+        return points, [
+            {"from": p, "to": p, "from_inclusive": True, "to_inclusive": True} for p in points
+        ]
+
+    # Cuts inside (low, high]: the band above an inclusive cut starts at the
+    # value itself, above an exclusive one just after it
+    cuts = [(value, inclusive) for value, inclusive in model.bands[name].bounds
+            if low < value < high or (value == low and not inclusive)
+            or (value == high and inclusive)]
+    points = [low]
+    segments = [{"from": low, "from_inclusive": True}]
+    for value, inclusive in cuts:
+        segments[-1].update({"to": value, "to_inclusive": not inclusive})
+        points.append(value if inclusive else math.nextafter(value, math.inf))
+        segments.append({"from": value, "from_inclusive": inclusive})
+    segments[-1].update({"to": high, "to_inclusive": True})
+    if on_grid:
+        keep = [i for i, segment in enumerate(segments) if _reachable(segment, var, low)]
+        points = [points[i] for i in keep]
+        segments = [segments[i] for i in keep]
+    return points, segments
+
+
+def _reachable(segment, var, low):
+    """Whether a segment holds a value on the ``low + k * step`` input grid."""
+    step = var.get("step", 1)
+    k = math.ceil((segment["from"] - low) / step - 1e-9)
+    value = low + k * step
+    if not segment["from_inclusive"] and math.isclose(value, segment["from"]):
+        value += step
+    if math.isclose(value, segment["to"]):
+        return segment["to_inclusive"]
+    return value < segment["to"]
+
+
+def _evaluate(model, inputs, columns, n):
+    """Score ``n`` rows: ``inputs`` everywhere except the swept ``columns``."""
+    parsed = model.parse(inputs)
+    arrays = {}
+    for name, _, coerce in model.inputs:
+        if name in columns:
+            arrays[name] = np.asarray(columns[name], dtype=object if coerce is None else float)
+        else:
+            arrays[name] = np.full(n, parsed[name], dtype=object if coerce is None else float)
+    mask = model.mask_batch(model.parse_batch(Columns(arrays, n)))
+    _, score = model.resolve_batch(mask)
+    level = model.level_batch(score)
+    return score.tolist(), [model.risk_levels[i] for i in level.tolist()]
+
+
+def _merge(segments, scores, levels):
+    """Join neighbouring segments with the same score and risk level."""
+    curve = []
+    for segment, score, level in zip(segments, scores, levels):
+        point = dict(segment, score=score, risk_label=level["label"], risk_color=level["color"])
+        last = curve[-1] if curve else None
+        if (last is not None and "to" in last and last["score"] == score
+                and last["risk_label"] == level["label"]):
+            last["to"], last["to_inclusive"] = point["to"], point["to_inclusive"]
+        else:
+            curve.append(point)
+    return curve
+
+
+def sweep(name, inputs, variable, low=None, high=None, on_grid=True):
+    """
+    Sweep one variable across its range with every other input fixed.
+
+    Args:
+        name: score package name.
+        inputs: the fixed inputs (as for compute_prediction).
+        variable: the variable to sweep.
+        low, high: optional sub-range (default: the variable's min/max).
+        on_grid: leave out bands no ``step`` value falls in (see ``axis``).
+
+    Returns:
+        list of segments in order, each a dict with ``from``, ``to``,
+        ``from_inclusive``, ``to_inclusive`` (categoricals: ``value``),
+        ``score``, ``risk_label`` and ``risk_color``. Neighbouring segments
+        with the same score and risk level are merged.
+    """
+    model = _engine(name).MODEL
+    points, segments = axis(model, variable, low, high, on_grid)
+    scores, levels = _evaluate(model, inputs, {variable: points}, len(points))
+    return _merge(segments, scores, levels)
+
+
+def sweep_grid(name, inputs, x, y, x_range=(None, None), y_range=(None, None)):
+    """
+    Evaluate a 2D grid of two variables with every other input fixed.
+
+    Returns:
+        dict with ``x`` and ``y`` (the segments along each axis, as from
+        ``axis``), and ``score`` and ``risk_label`` as lists of rows, one
+        row per ``y`` segment and one column per ``x`` segment.
+    """
+    if x == y:
+        raise ValueError("Sweep two different variables")
+    model = _engine(name).MODEL
+    x_points, x_segments = axis(model, x, *x_range)
+    y_points, y_segments = axis(model, y, *y_range)
+    nx, ny = len(x_points), len(y_points)
+    columns = {
+        x: [p for _ in range(ny) for p in x_points],
+        y: [p for p in y_points for _ in range(nx)],
+    }
+    scores, levels = _evaluate(model, inputs, columns, nx * ny)
+    return {
+        "x": x_segments,
+        "y": y_segments,
+        "score": [scores[r * nx:(r + 1) * nx] for r in range(ny)],
+        "risk_label": [[level["label"] for level in levels[r * nx:(r + 1) * nx]]
+                       for r in range(ny)],
+    }
+
+
+def segment_label(segment):
+    """Short text for a segment: ``[90, 120)``, ``(8, 12]``, ``Male``."""
+    if "value" in segment:
+        return str(segment["value"])
+    lo, hi = segment["from"], segment["to"]
+    if lo == hi:
+        return f"{lo:g}"
+    left = "[" if segment["from_inclusive"] else "("
+    right = "]" if segment["to_inclusive"] else ")"
+    return f"{left}{lo:g}, {hi:g}{right}"
@@ -2,16 +2,65 @@
 Shared UI renderer for all clinical scoring tools.
 """
 
+import importlib
+import time
+
 import streamlit as st
-import pandas as pd
 from collections import OrderedDict
 
+from scores import metrics
+
+
+@st.cache_resource
+def _page_artifacts(config_name):
+    """
+    Build the patient-independent parts of a score page once per process.
+
+    Keyed on the config module name and shared across reruns and sessions,
+    so the returned objects must not be mutated.
+
+    Returns:
+        (groups, ref_df): VARIABLES grouped into an OrderedDict by form
+        section, and the unstyled risk-level reference table.
+    """
+    import pandas as pd
+
+    config_module = importlib.import_module(config_name)
+    meta = config_module.SCORE_META
+
+    # --- Build grouped variable structure ---
+    groups = OrderedDict()
+    for var in config_module.VARIABLES:
+        group = var.get("group", "General")
+        groups.setdefault(group, []).append(var)
+
+    # --- Risk level reference table ---
+    ref_rows = []
+    prev_max = -1
+    for level in config_module.RISK_LEVELS:
+        low = prev_max + 1
+        high = level["max_score"]
+        if low == high:
+            score_range = str(low)
+        else:
+            score_range = f"{low}\u2013{high}"
+        ref_rows.append(
+            {
+                meta["risk_table_score_label"]: score_range,
+                "Risk Level": level["label"],
+                meta["risk_table_outcome_label"]: f"{level[meta['risk_table_outcome_key']]}%",
+            }
+        )
+        prev_max = high
+
+    return groups, pd.DataFrame(ref_rows)
+
 
 def render_score_page(config_module, prediction_module):
     """Render a complete score page from config metadata and prediction engine."""
     meta = config_module.SCORE_META
-    variables = config_module.VARIABLES
     risk_levels = config_module.RISK_LEVELS
+    groups, ref_df = _page_artifacts(config_module.__name__)
 
     st.set_page_config(page_title=meta["name"], layout="wide")
     st.title(meta["name"])
@@ -19,12 +68,6 @@ def render_score_page(config_module, prediction_module):
     with st.expander(f"About the {meta['name']}", expanded=False):
         st.markdown(meta["description"])
 
-    # --- Build grouped variable structure ---
-    groups = OrderedDict()
-    for var in variables:
-        group = var.get("group", "General")
-        groups.setdefault(group, []).append(var)
-
     # --- Input Form ---
     inputs = {}
 
@@ -68,106 +111,159 @@ def render_score_page(config_module, prediction_module):
         )
 
     # --- Results ---
+    # The last result is kept across reruns (e.g. what-if selections), which
+    # happen with ``submitted`` False
+    state_key = f"last_result_{config_module.__name__}"
     if submitted:
+        submit_started = time.perf_counter()
         result = prediction_module.compute_prediction(inputs)
-        score = result["score"]
+        st.session_state[state_key] = (dict(inputs), result)
+        _render_result(meta, risk_levels, ref_df, result)
+        metrics.observe_submit(
+            config_module.__name__.split(".")[-2], time.perf_counter() - submit_started
+        )
+    elif state_key in st.session_state:
+        _render_result(meta, risk_levels, ref_df, st.session_state[state_key][1])
 
-        st.divider()
-        st.subheader("Result")
+    # --- What-if sweeps over the last submitted inputs ---
+    if state_key in st.session_state:
+        _render_whatif(config_module, st.session_state[state_key][0])
 
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric(
-                label=f"{meta['name']} ({meta['score_range']})",
-                value=f"{score}",
-            )
-        with col2:
-            st.markdown(
-                f"### :{result['risk_color']}[{result['risk_label']}]"
-            )
-        with col3:
-            outcome_val = result[meta["outcome_key"]]
-            st.metric(label=meta["outcome_label"], value=f"{outcome_val}%")
-
-        # --- Risk level reference table ---
-        st.subheader("Risk Level Reference")
-        ref_rows = []
-        prev_max = -1
-        for level in risk_levels:
-            low = prev_max + 1
-            high = level["max_score"]
-            if low == high:
-                score_range = str(low)
-            else:
-                score_range = f"{low}\u2013{high}"
-            ref_rows.append(
-                {
-                    meta["risk_table_score_label"]: score_range,
-                    "Risk Level": level["label"],
-                    meta["risk_table_outcome_label"]: f"{level[meta['risk_table_outcome_key']]}%",
-                }
-            )
-            prev_max = high
-        ref_df = pd.DataFrame(ref_rows)
-
-        hl_color = meta["highlight_color"]
-        hl_text = meta["highlight_text_color"]
-
-        def highlight_current(row):
-            if row["Risk Level"] == result["risk_label"]:
-                return [
-                    f"background-color: {hl_color}; color: {hl_text}"
-                ] * len(row)
-            return [""] * len(row)
-
-        st.dataframe(
-            ref_df.style.apply(highlight_current, axis=1),
-            use_container_width=True,
-            hide_index=True,
+
+def _render_result(meta, risk_levels, ref_df, result):
+    """Show the score, the risk level reference and the component breakdown."""
+    # Imported here rather than at module load so that importing this module
+    # (and the score packages behind it) stays cheap for headless callers.
+    import pandas as pd
+
+    score = result["score"]
+
+    st.divider()
+    st.subheader("Result")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(
+            label=f"{meta['name']} ({meta['score_range']})",
+            value=f"{score}",
+        )
+    with col2:
+        st.markdown(
+            f"### :{result['risk_color']}[{result['risk_label']}]"
         )
+    with col3:
+        outcome_val = result[meta["outcome_key"]]
+        st.metric(label=meta["outcome_label"], value=f"{outcome_val}%")
 
-        # --- Component Breakdown ---
-        st.subheader("Component Breakdown")
-
-        components = result["components"]
-        rows = []
-        for c in components:
-            row = {
-                "Predictor": c["label"],
-                "Condition": c["condition"],
-                "Met?": "Yes" if c["met"] else "No",
-                meta["component_points_label"]: c[meta["component_points_key"]]
-                if c["met"]
-                else 0,
-            }
-            if meta["component_extra_key"]:
-                row[meta["component_extra_label"]] = round(
-                    c[meta["component_extra_key"]], 4
-                )
-            rows.append(row)
-
-        df = pd.DataFrame(rows)
-        st.dataframe(df, use_container_width=True, hide_index=True)
-
-        # --- Bar chart of active components ---
-        st.subheader("Active Components")
-        active = [c for c in components if c["met"]]
-        if active:
-            chart_df = pd.DataFrame(
-                {
-                    "Component": [c["label"] for c in active],
-                    meta["chart_label"]: [
-                        round(c[meta["chart_key"]], 4)
-                        if isinstance(c[meta["chart_key"]], float)
-                        else c[meta["chart_key"]]
-                        for c in active
-                    ],
-                }
+    # --- Risk level reference table ---
+    st.subheader("Risk Level Reference")
+    hl_color = meta["highlight_color"]
+    hl_text = meta["highlight_text_color"]
+    current = [
+        i for i, level in enumerate(risk_levels)
+        if level["label"] == result["risk_label"]
+    ]
+
+    st.dataframe(
+        ref_df.style.set_properties(
+            subset=pd.IndexSlice[current, :],
+            **{"background-color": hl_color, "color": hl_text},
+        ),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    # --- Component Breakdown ---
+    st.subheader("Component Breakdown")
+
+    components = result["components"]
+    rows = []
+    for c in components:
+        row = {
+            "Predictor": c["label"],
+            "Condition": c["condition"],
+            "Met?": "Yes" if c["met"] else "No",
+            meta["component_points_label"]: c[meta["component_points_key"]]
+            if c["met"]
+            else 0,
+        }
+        if meta["component_extra_key"]:
+            row[meta["component_extra_label"]] = round(
+                c[meta["component_extra_key"]], 4
             )
-            chart_df = chart_df.sort_values(
-                meta["chart_label"], key=abs, ascending=True
+        rows.append(row)
+
+    df = pd.DataFrame(rows)
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    # --- Bar chart of active components ---
+    st.subheader("Active Components")
+    active = [c for c in components if c["met"]]
+    if active:
+        chart_df = pd.DataFrame(
+            {
+                "Component": [c["label"] for c in active],
+                meta["chart_label"]: [
+                    round(c[meta["chart_key"]], 4)
+                    if isinstance(c[meta["chart_key"]], float)
+                    else c[meta["chart_key"]]
+                    for c in active
+                ],
+            }
+        )
+        chart_df = chart_df.sort_values(
+            meta["chart_label"], key=abs, ascending=True
+        )
+        chart_df = chart_df.set_index("Component")
+        st.bar_chart(chart_df, horizontal=True)
+    else:
+        st.info("No risk factors are present with the current inputs.")
+
+
+def _render_whatif(config_module, inputs):
+    """Show how the score moves as one or two inputs vary from ``inputs``."""
+    import pandas as pd
+
+    from scores import whatif
+
+    name = config_module.__name__.split(".")[-2]
+    labels = {var["name"]: var["label"] for var in config_module.VARIABLES}
+    names = list(labels)
+
+    with st.expander("What-if", expanded=False):
+        st.caption("How the score changes as inputs vary, with the others held "
+                   "at the last calculated values.")
+        cols = st.columns(2)
+        with cols[0]:
+            x = st.selectbox("Vary", names, format_func=labels.get,
+                             key=f"whatif_x_{name}")
+        with cols[1]:
+            y = st.selectbox("Against", [""] + [n for n in names if n != x],
+                             format_func=lambda n: labels.get(n, "\u2014"),
+                             key=f"whatif_y_{name}")
+
+        if not y:
+            curve = whatif.sweep(name, inputs, x)
+            st.dataframe(
+                pd.DataFrame({
+                    labels[x]: [whatif.segment_label(s) for s in curve],
+                    "Score": [s["score"] for s in curve],
+                    "Risk Level": [s["risk_label"] for s in curve],
+                }),
+                use_container_width=True,
+                hide_index=True,
             )
-            chart_df = chart_df.set_index("Component")
-            st.bar_chart(chart_df, horizontal=True)
+            if "value" not in curve[0]:
+                # Step chart: each segment drawn flat from its start to its end
+                points = [(end, s["score"]) for s in curve for end in (s["from"], s["to"])]
+                chart = pd.DataFrame(points, columns=[labels[x], "Score"])
+                st.line_chart(chart, x=labels[x], y="Score")
         else:
-            st.info("No risk factors are present with the current inputs.")
+            grid = whatif.sweep_grid(name, inputs, x, y)
+            table = pd.DataFrame(
+                grid["score"],
+                index=pd.Index([whatif.segment_label(s) for s in grid["y"]], name=labels[y]),
+                columns=[whatif.segment_label(s) for s in grid["x"]],
+            )
+            st.caption(f"Score by {labels[y]} (rows) and {labels[x]} (columns)")
+            st.dataframe(table, use_container_width=True)
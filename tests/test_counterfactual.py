@@ -0,0 +1,91 @@
+"""Counterfactual search against the engines' own scoring."""
+
+import importlib
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from scores.counterfactual import CounterfactualSearch
+
+SCORES = ["ford", "rams", "prime_icu"]
+NAN = float("nan")
+
+
+def _rows(name, count=150, seed=0):
+    """Patients at and around every band edge, with NaN and missing inputs."""
+    config = importlib.import_module(f"scores.{name}.config")
+    model = importlib.import_module(f"scores.{name}.prediction").MODEL
+    rng = random.Random(seed)
+    choices = {}
+    for var in config.VARIABLES:
+        index = model.bands.get(var["name"])
+        if var["type"] != "continuous":
+            choices[var["name"]] = list(var["options"].values()) if isinstance(
+                var["options"], dict) else list(var["options"])
+        elif index is not None:
+            step = var.get("step", 1)
+            choices[var["name"]] = [
+                v + d for v, _ in index.bounds for d in (-step, 0, step)
+                if var["min"] <= v + d <= var["max"]
+            ]
+        else:
+            choices[var["name"]] = [var["min"], var["default"], var["max"]]
+    continuous = [v["name"] for v in config.VARIABLES if v["type"] == "continuous"]
+    rows = [{}] + [{v: NAN} for v in continuous]
+    for _ in range(count):
+        row = {}
+        for v, values in choices.items():
+            draw = rng.random()
+            if draw < 0.1:
+                continue
+            row[v] = NAN if draw < 0.2 and v in continuous else rng.choice(values)
+        rows.append(row)
+    return config, rows
+
+
+def _check_change(engine, row, result, levels):
+    """The reported change, applied to ``row``, gives the reported score."""
+    changed = dict(row)
+    for change in result["changes"]:
+        changed[change["variable"]] = change["to"]
+    after = engine.compute_prediction(changed, explain=False)
+    assert after["score"] == result["new_score"], (row, result)
+    assert levels.index(after["risk_label"]) <= levels.index(result["target_label"])
+
+
+@pytest.mark.parametrize("name", SCORES)
+def test_solve_matches_engine_and_batch(name):
+    config, rows = _rows(name)
+    engine = importlib.import_module(f"scores.{name}.prediction")
+    modifiable = [v["name"] for v in config.VARIABLES if v["type"] == "continuous"]
+    search = CounterfactualSearch(name, modifiable)
+    levels = [level["label"] for level in config.RISK_LEVELS]
+    frame = pd.DataFrame(rows)
+    batch = search.solve_batch(frame)
+    scores = engine.compute_batch(frame)["score"].tolist()
+    for row, from_batch, score in zip(rows, batch, scores):
+        result = search.solve(row)
+        expected = engine.compute_prediction(row, explain=False)
+        assert (result["score"], result["risk_label"]) == \
+            (expected["score"], expected["risk_label"]), row
+        if result["changes"]:
+            _check_change(engine, row, result, levels)
+        # A NaN cell in a frame is a missing input, as in compute_batch
+        present = {k: v for k, v in row.items() if not _missing(v)}
+        assert from_batch["score"] == score, row
+        assert from_batch == search.solve(present), row
+
+
+def _missing(value):
+    return isinstance(value, float) and math.isnan(value)
+
+
+def test_nan_input_is_not_banded():
+    search = CounterfactualSearch("rams", ["sbp", "rr"])
+    engine = importlib.import_module("scores.rams.prediction")
+    row = {"sbp": NAN}
+    result = search.solve(row)
+    assert result["score"] == engine.compute_prediction(row)["score"]
+    assert search.solve_batch(pd.DataFrame([row]))[0] == result
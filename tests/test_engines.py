@@ -0,0 +1,545 @@
+"""
+Pinned results for the score engines.
+
+Each case is ``(inputs, score, risk_label, met component labels)``, taken
+from the original hand-written engines: inputs on both sides of every
+threshold, NaN values, numeric strings, unknown and omitted categoricals,
+and a few patients with many inputs set at once.
+"""
+
+import importlib
+import math
+
+import pandas as pd
+import pytest
+
+NAN = float("nan")
+
+CASES = {
+    "ford": [
+        ({}, 0, "Low", []),
+        ({"gcs": 7}, 6, "Moderate-High", ["GCS Severe (≤ 8)"]),
+        ({"gcs": 8}, 6, "Moderate-High", ["GCS Severe (≤ 8)"]),
+        ({"gcs": 9}, 3, "Low-Moderate", ["GCS Moderate (9-12)"]),
+        ({"gcs": 10}, 3, "Low-Moderate", ["GCS Moderate (9-12)"]),
+        ({"gcs": 11}, 3, "Low-Moderate", ["GCS Moderate (9-12)"]),
+        ({"gcs": 12}, 3, "Low-Moderate", ["GCS Moderate (9-12)"]),
+        ({"gcs": 13}, 0, "Low", []),
+        ({"gcs": NAN}, 0, "Low", []),
+        ({"gcs": "8"}, 6, "Moderate-High", ["GCS Severe (≤ 8)"]),
+        ({"fracture_site": "Hip/Femur"}, 5, "Moderate-High", ["Hip/Femur Fracture"]),
+        (
+            {"fracture_site": "Axial (Spine/Rib/Pelvis)"},
+            3, "Low-Moderate",
+            ["Axial Fracture (Spine/Rib/Pelvis)"],
+        ),
+        (
+            {"fracture_site": "Both"},
+            8, "High",
+            ["Hip/Femur Fracture", "Axial Fracture (Spine/Rib/Pelvis)"],
+        ),
+        ({"fracture_site": "Unknown"}, 0, "Low", []),
+        ({"rr": 11}, 5, "Moderate-High", ["Resp Rate Low (< 12)"]),
+        ({"rr": 12}, 0, "Low", []),
+        ({"rr": 13}, 0, "Low", []),
+        ({"rr": 19}, 0, "Low", []),
+        ({"rr": 20}, 0, "Low", []),
+        ({"rr": 21}, 1, "Low", ["Resp Rate High (> 20)"]),
+        ({"rr": NAN}, 0, "Low", []),
+        ({"rr": "12"}, 0, "Low", []),
+        ({"insurance": "Medicare"}, 4, "Moderate-High", ["Insurance: Medicare"]),
+        ({"insurance": "Medicaid"}, 0, "Low", []),
+        ({"insurance": "Private"}, 3, "Low-Moderate", ["Insurance: Private"]),
+        ({"insurance": "Charity"}, 3, "Low-Moderate", ["Insurance: Charity"]),
+        ({"insurance": "Other"}, 4, "Moderate-High", ["Insurance: Other"]),
+        ({"insurance": "Unknown"}, 0, "Low", []),
+        ({"sbp": 89}, 4, "Moderate-High", ["SBP Hypotensive (< 90)"]),
+        ({"sbp": 90}, 0, "Low", []),
+        ({"sbp": 91}, 0, "Low", []),
+        ({"sbp": NAN}, 0, "Low", []),
+        ({"sbp": "90"}, 0, "Low", []),
+        ({"age": 64}, 0, "Low", []),
+        ({"age": 65}, 1, "Low", ["Age 65-74"]),
+        ({"age": 66}, 1, "Low", ["Age 65-74"]),
+        ({"age": 73}, 1, "Low", ["Age 65-74"]),
+        ({"age": 74}, 1, "Low", ["Age 65-74"]),
+        ({"age": 75}, 3, "Low-Moderate", ["Age ≥ 75"]),
+        ({"age": 76}, 3, "Low-Moderate", ["Age ≥ 75"]),
+        ({"age": NAN}, 0, "Low", []),
+        ({"age": "65"}, 1, "Low", ["Age 65-74"]),
+        ({"sex": "Female"}, 1, "Low", ["Female"]),
+        ({"sex": "Unknown"}, 0, "Low", []),
+        ({"hr": 99}, 0, "Low", []),
+        ({"hr": 100}, 1, "Low", ["Heart Rate Tachycardic (≥ 100)"]),
+        ({"hr": 101}, 1, "Low", ["Heart Rate Tachycardic (≥ 100)"]),
+        ({"hr": NAN}, 0, "Low", []),
+        ({"hr": "100"}, 1, "Low", ["Heart Rate Tachycardic (≥ 100)"]),
+        ({"transport": "Private Vehicle"}, 0, "Low", ["Transport: Private Vehicle"]),
+        ({"transport": "Walk-in"}, 0, "Low", ["Transport: Walk-in"]),
+        ({"transport": "Other"}, 0, "Low", []),
+        ({"transport": "Unknown"}, 0, "Low", []),
+        ({"mechanism": "MVC"}, 0, "Low", []),
+        ({"mechanism": "Assault"}, 0, "Low", ["Mechanism: Assault"]),
+        ({"mechanism": "Other"}, 0, "Low", []),
+        ({"mechanism": "Unknown"}, 0, "Low", []),
+        ({"weight_lb": 121}, 0, "Low", []),
+        ({"weight_lb": 122}, 0, "Low", []),
+        ({"weight_lb": 263}, 0, "Low", []),
+        ({"weight_lb": 264}, 2, "Low-Moderate", ["BMI ≥ 40 (Class III Obesity)"]),
+        ({"height_in": NAN}, 0, "Low", []),
+    ],
+    "rams": [
+        ({}, 2, "Low Risk", []),
+        ({"age": 64}, 2, "Low Risk", []),
+        ({"age": 65}, 4, "Low Risk", ["A: Age ≥ 65"]),
+        ({"age": 66}, 4, "Low Risk", ["A: Age ≥ 65"]),
+        ({"age": NAN}, 2, "Low Risk", []),
+        ({"age": "65"}, 4, "Low Risk", ["A: Age ≥ 65"]),
+        ({"total_time_to_hospital_min": 19}, 2, "Low Risk", []),
+        ({"total_time_to_hospital_min": 20}, 3, "Low Risk", ["B: Transport Time 20-30 min"]),
+        ({"total_time_to_hospital_min": 21}, 3, "Low Risk", ["B: Transport Time 20-30 min"]),
+        ({"total_time_to_hospital_min": 29}, 3, "Low Risk", ["B: Transport Time 20-30 min"]),
+        ({"total_time_to_hospital_min": 30}, 3, "Low Risk", ["B: Transport Time 20-30 min"]),
+        ({"total_time_to_hospital_min": 31}, 2, "Low Risk", []),
+        ({"total_time_to_hospital_min": NAN}, 2, "Low Risk", []),
+        ({"total_time_to_hospital_min": "20"}, 3, "Low Risk", ["B: Transport Time 20-30 min"]),
+        ({"auto_transport": 1}, 1, "Low Risk", ["C: Auto Transport"]),
+        ({"auto_transport": "1"}, 1, "Low Risk", ["C: Auto Transport"]),
+        ({"sbp": 89}, 3, "Low Risk", ["D: SBP < 90 or HR < 60"]),
+        ({"sbp": 90}, 2, "Low Risk", []),
+        ({"sbp": 91}, 2, "Low Risk", []),
+        ({"sbp": 129}, 2, "Low Risk", []),
+        ({"sbp": 130}, 1, "Low Risk", ["M: SBP ≥ 130 or HR > 80"]),
+        ({"sbp": 131}, 1, "Low Risk", ["M: SBP ≥ 130 or HR > 80"]),
+        ({"sbp": NAN}, 2, "Low Risk", []),
+        ({"sbp": "90"}, 2, "Low Risk", []),
+        ({"hr": 59}, 3, "Low Risk", ["D: SBP < 90 or HR < 60"]),
+        ({"hr": 60}, 2, "Low Risk", []),
+        ({"hr": 61}, 2, "Low Risk", []),
+        ({"hr": 79}, 2, "Low Risk", []),
+        ({"hr": 80}, 2, "Low Risk", []),
+        ({"hr": 81}, 1, "Low Risk", ["M: SBP ≥ 130 or HR > 80"]),
+        ({"hr": NAN}, 2, "Low Risk", []),
+        ({"hr": "60"}, 2, "Low Risk", []),
+        ({"gcs": 7}, 5, "Moderate Risk", ["E: GCS ≤ 8 (Severe)"]),
+        ({"gcs": 8}, 5, "Moderate Risk", ["E: GCS ≤ 8 (Severe)"]),
+        ({"gcs": 9}, 3, "Low Risk", ["F: GCS 9-12 (Moderate)"]),
+        ({"gcs": 12}, 3, "Low Risk", ["F: GCS 9-12 (Moderate)"]),
+        ({"gcs": 13}, 2, "Low Risk", []),
+        ({"gcs": 14}, 2, "Low Risk", []),
+        ({"gcs": NAN}, 2, "Low Risk", []),
+        ({"gcs": "8"}, 5, "Moderate Risk", ["E: GCS ≤ 8 (Severe)"]),
+        ({"rr": 11}, 3, "Low Risk", ["I: Resp Rate < 12"]),
+        ({"rr": 12}, 2, "Low Risk", []),
+        ({"rr": 13}, 2, "Low Risk", []),
+        ({"rr": 19}, 2, "Low Risk", []),
+        ({"rr": 20}, 2, "Low Risk", []),
+        ({"rr": 21}, 2, "Low Risk", ["J: Resp Rate > 20"]),
+        ({"rr": NAN}, 2, "Low Risk", []),
+        ({"rr": "12"}, 2, "Low Risk", []),
+        ({"o2_sat": 91.0}, 3, "Low Risk", ["K: Hypoxic (O₂ Sat ≤ 92%)"]),
+        ({"o2_sat": 92.0}, 3, "Low Risk", ["K: Hypoxic (O₂ Sat ≤ 92%)"]),
+        ({"o2_sat": 93.0}, 2, "Low Risk", []),
+        ({"o2_sat": NAN}, 2, "Low Risk", []),
+        ({"o2_sat": "92"}, 3, "Low Risk", ["K: Hypoxic (O₂ Sat ≤ 92%)"]),
+        ({"fall": 1}, 3, "Low Risk", ["L: Mechanism of Injury: Fall"]),
+        ({"fall": "1"}, 3, "Low Risk", ["L: Mechanism of Injury: Fall"]),
+        ({"temp_f": 102.1}, 2, "Low Risk", []),
+        ({"temp_f": 102.2}, 2, "Low Risk", []),
+        ({"temp_f": 102.3}, 2, "Low Risk", ["N: High Grade Temp (> 102.2°F)"]),
+        ({"temp_f": NAN}, 2, "Low Risk", []),
+        ({"temp_f": "102.2"}, 2, "Low Risk", []),
+        ({"weight_lb": 121}, 3, "Low Risk", ["G: Underweight (BMI < 18.5)"]),
+        ({"weight_lb": 122}, 2, "Low Risk", []),
+        ({"weight_lb": 263}, 2, "Low Risk", []),
+        ({"weight_lb": 264}, 3, "Low Risk", ["H: Class III Obesity (BMI ≥ 40)"]),
+        ({"height_in": NAN}, 2, "Low Risk", []),
+    ],
+    "prime_icu": [
+        ({}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": 44}, 3, "Low Risk", ["Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": 45}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": 46}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": 63}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": 64}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": 65}, 3, "Low Risk", ["Age ≥ 65", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": 66}, 3, "Low Risk", ["Age ≥ 65", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": NAN}, 3, "Low Risk", ["Male", "Elevated BP (SBP 120-129)"]),
+        ({"age": "45"}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"sex": "Female"}, 3, "Low Risk", ["Age 45-64", "Elevated BP (SBP 120-129)"]),
+        ({"sex": "Unknown"}, 3, "Low Risk", ["Age 45-64", "Elevated BP (SBP 120-129)"]),
+        (
+            {"gcs": 7},
+            5, "Moderate Risk",
+            ["Age 45-64", "Male", "GCS Severe (≤ 8)", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"gcs": 8},
+            5, "Moderate Risk",
+            ["Age 45-64", "Male", "GCS Severe (≤ 8)", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"gcs": 9},
+            5, "Moderate Risk",
+            ["Age 45-64", "Male", "GCS Moderate (9-12)", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"gcs": 10},
+            5, "Moderate Risk",
+            ["Age 45-64", "Male", "GCS Moderate (9-12)", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"gcs": 11},
+            5, "Moderate Risk",
+            ["Age 45-64", "Male", "GCS Moderate (9-12)", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"gcs": 12},
+            5, "Moderate Risk",
+            ["Age 45-64", "Male", "GCS Moderate (9-12)", "Elevated BP (SBP 120-129)"],
+        ),
+        ({"gcs": 13}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"gcs": NAN}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"gcs": "8"},
+            5, "Moderate Risk",
+            ["Age 45-64", "Male", "GCS Severe (≤ 8)", "Elevated BP (SBP 120-129)"],
+        ),
+        ({"sbp": 89}, 4, "Moderate Risk", ["Age 45-64", "Male", "Hypotensive (SBP < 90)"]),
+        ({"sbp": 90}, 3, "Low Risk", ["Age 45-64", "Male"]),
+        ({"sbp": 91}, 3, "Low Risk", ["Age 45-64", "Male"]),
+        ({"sbp": 119}, 3, "Low Risk", ["Age 45-64", "Male"]),
+        ({"sbp": 120}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"sbp": 121}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"sbp": 128}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"sbp": 129}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"sbp": 130}, 3, "Low Risk", ["Age 45-64", "Male", "Stage 1 HTN (SBP 130-139)"]),
+        ({"sbp": 131}, 3, "Low Risk", ["Age 45-64", "Male", "Stage 1 HTN (SBP 130-139)"]),
+        ({"sbp": 138}, 3, "Low Risk", ["Age 45-64", "Male", "Stage 1 HTN (SBP 130-139)"]),
+        ({"sbp": 139}, 3, "Low Risk", ["Age 45-64", "Male", "Stage 1 HTN (SBP 130-139)"]),
+        ({"sbp": 140}, 3, "Low Risk", ["Age 45-64", "Male", "Stage 2 HTN (SBP ≥ 140)"]),
+        ({"sbp": 141}, 3, "Low Risk", ["Age 45-64", "Male", "Stage 2 HTN (SBP ≥ 140)"]),
+        ({"sbp": NAN}, 3, "Low Risk", ["Age 45-64", "Male"]),
+        ({"sbp": "90"}, 3, "Low Risk", ["Age 45-64", "Male"]),
+        ({"hr": 99}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"hr": 100},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Tachycardic (HR ≥ 100)"],
+        ),
+        (
+            {"hr": 101},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Tachycardic (HR ≥ 100)"],
+        ),
+        ({"hr": NAN}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"hr": "100"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Tachycardic (HR ≥ 100)"],
+        ),
+        (
+            {"rr": 11},
+            2, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Low RR (< 12)"],
+        ),
+        ({"rr": 12}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"rr": 13}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"rr": 19}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"rr": 20}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"rr": 21},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "High RR (> 20)"],
+        ),
+        ({"rr": NAN}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"rr": "12"}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"o2_sat": 91.0},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Hypoxic (O₂ Sat ≤ 92%)"],
+        ),
+        (
+            {"o2_sat": 92.0},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Hypoxic (O₂ Sat ≤ 92%)"],
+        ),
+        ({"o2_sat": 93.0}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"o2_sat": NAN}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"o2_sat": "92"},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Hypoxic (O₂ Sat ≤ 92%)"],
+        ),
+        (
+            {"temp_f": 94.9},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Hypothermia (< 95°F)"],
+        ),
+        ({"temp_f": 95.0}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"temp_f": 95.1}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"temp_f": 99.0}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"temp_f": 99.1},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Low Grade Fever (99.1-100.4°F)"],
+        ),
+        (
+            {"temp_f": 99.2},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Low Grade Fever (99.1-100.4°F)"],
+        ),
+        (
+            {"temp_f": 100.3},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Low Grade Fever (99.1-100.4°F)"],
+        ),
+        (
+            {"temp_f": 100.4},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Low Grade Fever (99.1-100.4°F)"],
+        ),
+        ({"temp_f": 100.5}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"temp_f": 102.1}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"temp_f": 102.2}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"temp_f": 102.3},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "High Grade Fever (> 102.2°F)"],
+        ),
+        ({"temp_f": NAN}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"temp_f": "95"}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"transport_mode": "Ambulance"},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Ambulance Transport"],
+        ),
+        (
+            {"transport_mode": "Auto/Cab"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Auto/Cab Transport"],
+        ),
+        (
+            {"transport_mode": "Police"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Police Transport"],
+        ),
+        (
+            {"transport_mode": "Air Helicopter"},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Air Helicopter Transport"],
+        ),
+        (
+            {"transport_mode": "Walked"},
+            2, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Walked In"],
+        ),
+        (
+            {"transport_mode": "Unknown"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"transferred": 1},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Transferred"],
+        ),
+        (
+            {"transferred": "1"},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Transferred"],
+        ),
+        (
+            {"industrial": 1},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Industrial Accident"],
+        ),
+        (
+            {"industrial": "1"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Industrial Accident"],
+        ),
+        (
+            {"mechanism": "Penetrating"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Penetrating Mechanism"],
+        ),
+        (
+            {"mechanism": "Blunt"},
+            4, "Moderate Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Blunt Mechanism"],
+        ),
+        (
+            {"mechanism": "Not Available"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Mechanism Not Available"],
+        ),
+        (
+            {"mechanism": "Unknown"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"departure_to_hospital_min": 9},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Departure-to-Hospital ≤ 10 min"],
+        ),
+        (
+            {"departure_to_hospital_min": 10},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Departure-to-Hospital ≤ 10 min"],
+        ),
+        (
+            {"departure_to_hospital_min": 11},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"departure_to_hospital_min": NAN},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"departure_to_hospital_min": "10"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Departure-to-Hospital ≤ 10 min"],
+        ),
+        (
+            {"time_on_scene_min": 19},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"time_on_scene_min": 20},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Time on Scene 20-30 min"],
+        ),
+        (
+            {"time_on_scene_min": 21},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Time on Scene 20-30 min"],
+        ),
+        (
+            {"time_on_scene_min": 29},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Time on Scene 20-30 min"],
+        ),
+        (
+            {"time_on_scene_min": 30},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Time on Scene 20-30 min"],
+        ),
+        (
+            {"time_on_scene_min": 31},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"time_on_scene_min": NAN},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"time_on_scene_min": "20"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Time on Scene 20-30 min"],
+        ),
+        (
+            {"total_time_min": 19},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"total_time_min": 20},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Total Time 20-30 min"],
+        ),
+        (
+            {"total_time_min": 21},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Total Time 20-30 min"],
+        ),
+        (
+            {"total_time_min": 29},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Total Time 20-30 min"],
+        ),
+        (
+            {"total_time_min": 30},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Total Time 20-30 min"],
+        ),
+        (
+            {"total_time_min": 31},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"total_time_min": 79},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"total_time_min": 80},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"total_time_min": 81},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Total Time > 80 min"],
+        ),
+        (
+            {"total_time_min": NAN},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"],
+        ),
+        (
+            {"total_time_min": "20"},
+            3, "Low Risk",
+            ["Age 45-64", "Male", "Elevated BP (SBP 120-129)", "Total Time 20-30 min"],
+        ),
+        ({"weight_lb": 121}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"weight_lb": 122}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        ({"weight_lb": 263}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+        (
+            {"weight_lb": 264},
+            1, "Low Risk",
+            ["Age 45-64", "Male", "Class III Obesity (BMI ≥ 40)", "Elevated BP (SBP 120-129)"],
+        ),
+        ({"height_in": NAN}, 3, "Low Risk", ["Age 45-64", "Male", "Elevated BP (SBP 120-129)"]),
+    ],
+}
+
+
+def _engine(name):
+    return importlib.import_module(f"scores.{name}.prediction")
+
+
+@pytest.mark.parametrize(
+    "name, inputs, score, label, met",
+    [(name, *case) for name, cases in CASES.items() for case in cases],
+)
+def test_compute_prediction(name, inputs, score, label, met):
+    engine = _engine(name)
+    result = engine.compute_prediction(inputs)
+    assert (result["score"], result["risk_label"]) == (score, label)
+    assert [c["label"] for c in result["components"] if c["met"]] == met
+    brief = engine.compute_prediction(inputs, explain=False)
+    assert brief == {k: result[k] for k in brief}
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_compute_batch_matches_scalar(name):
+    engine = _engine(name)
+    rows = [inputs for inputs, _, _, _ in CASES[name]]
+    batch = engine.compute_batch(pd.DataFrame(rows))
+    for (inputs, score, label, _), (_, scored) in zip(CASES[name], batch.iterrows()):
+        # A NaN cell in a frame is a missing input, which takes its default
+        present = {
+            k: v for k, v in inputs.items() if not (isinstance(v, float) and math.isnan(v))
+        }
+        if present == inputs:
+            assert (scored["score"], scored["risk_label"]) == (score, label), inputs
+        expected = engine.compute_prediction(present, explain=False)
+        assert scored.to_dict() == expected, inputs